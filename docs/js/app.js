@@ -47,6 +47,84 @@ function timeAgo(dateStr) {
     return dateStr;
 }
 
+// ---- Asset manifest (asset-manifest.json) ----
+// The Pages deploy step records a content hash for every data file; using it
+// as a ?v= cache key lets the browser keep unchanged data between deploys.
+
+let assetManifestPromise = null;
+
+function fetchAssetManifest() {
+    if (!assetManifestPromise) {
+        assetManifestPromise = fetch('asset-manifest.json', { cache: 'no-cache' })
+            .then(resp => resp.ok ? resp.json() : {})
+            .catch(() => ({}));
+    }
+    return assetManifestPromise;
+}
+
+async function fetchData(path) {
+    const manifest = await fetchAssetManifest();
+    const version = (manifest.data || {})[path];
+    return fetch(version ? `${path}?v=${version}` : path);
+}
+
+// ---- Posts index (data/index/) ----
+// The builder writes latest.json, fixed-size page shards and a manifest,
+// so pages only fetch the slices of the archive they actually show.
+
+let postsManifestPromise = null;
+
+function fetchPostsManifest() {
+    if (!postsManifestPromise) {
+        postsManifestPromise = fetchData('data/index/manifest.json').then(resp => {
+            if (!resp.ok) throw new Error(`manifest: HTTP ${resp.status}`);
+            return resp.json();
+        }).catch(async () => {
+            // Older builds only have the monolithic index: treat it as a single page
+            const posts = await (await fetchData('data/posts.json')).json();
+            return {
+                total_posts: posts.length,
+                page_size: posts.length,
+                pages: posts.length ? [{
+                    file: '../posts.json',
+                    count: posts.length,
+                    newest: posts[0].date,
+                    oldest: posts[posts.length - 1].date,
+                }] : [],
+            };
+        });
+    }
+    return postsManifestPromise;
+}
+
+async function fetchPostsPage(file) {
+    const resp = await fetchData(`data/index/${file}`);
+    if (!resp.ok) throw new Error(`${file}: HTTP ${resp.status}`);
+    return resp.json();
+}
+
+async function fetchLatestPosts() {
+    try {
+        return await fetchPostsPage('latest.json');
+    } catch (e) {
+        // Older builds only have the monolithic index
+        const resp = await fetchData('data/posts.json');
+        return (await resp.json()).slice(0, 8);
+    }
+}
+
+async function findPostMeta(filename) {
+    // Filenames start with the post date, which the manifest's page ranges cover
+    const date = filename.slice(0, 10);
+    const manifest = await fetchPostsManifest();
+    const candidates = manifest.pages.filter(p => p.oldest <= date && date <= p.newest);
+    for (const page of candidates) {
+        const match = (await fetchPostsPage(page.file)).find(p => p.filename === filename);
+        if (match) return match;
+    }
+    return null;
+}
+
 // ---- Dashboard (index.html) ----
 
 async function loadDashboard() {
@@ -55,7 +133,7 @@ async function loadDashboard() {
 
     // Load stats
     try {
-        const statsResp = await fetch('data/stats.json');
+        const statsResp = await fetchData('data/stats.json');
         const stats = await statsResp.json();
 
         document.getElementById('total-posts').textContent = stats.total_posts || 0;
@@ -68,8 +146,7 @@ async function loadDashboard() {
 
     // Load posts
     try {
-        const postsResp = await fetch('data/posts.json');
-        const posts = await postsResp.json();
+        const posts = await fetchLatestPosts();
 
         // Today's draft
         const todayEl = document.getElementById('today-draft');
@@ -118,5 +195,100 @@ async function loadDashboard() {
     }
 }
 
+// ---- Run performance (data/metrics.json) ----
+// One entry per pipeline run, folded from logs/trace_*.jsonl by build_dashboard.py.
+
+const PERF_CHART_RUNS = 30;
+const PERF_BASELINE_RUNS = 14;
+const PERF_TOP_SPANS = 12;
+
+function formatMs(ms) {
+    if (ms === null || ms === undefined) return '-';
+    return ms >= 1000 ? `${(ms / 1000).toFixed(1)}s` : `${Math.round(ms)}ms`;
+}
+
+function median(values) {
+    if (!values.length) return null;
+    const sorted = [...values].sort((a, b) => a - b);
+    const mid = Math.floor(sorted.length / 2);
+    return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+}
+
+function spanCounters(span) {
+    const parts = [];
+    if (span.prompt_tokens || span.completion_tokens) {
+        parts.push(`${((span.prompt_tokens || 0) + (span.completion_tokens || 0)).toLocaleString()} tok`);
+    }
+    if (span.bytes) parts.push(`${(span.bytes / 1024).toFixed(0)} KB`);
+    if (span.items) parts.push(`${span.items.toLocaleString()} items`);
+    if (span.cache_hits) {
+        const total = span.cache_hits + (span.cache_misses || 0);
+        parts.push(`${Math.round(100 * span.cache_hits / total)}% cached`);
+    }
+    return parts.join(' &middot; ');
+}
+
+async function loadMetrics() {
+    const chartEl = document.getElementById('perf-chart');
+    const spansEl = document.getElementById('perf-spans');
+    if (!chartEl) return;
+
+    let runs;
+    try {
+        const resp = await fetchData('data/metrics.json');
+        if (!resp.ok) throw new Error(`metrics: HTTP ${resp.status}`);
+        runs = (await resp.json()).runs || [];
+    } catch (e) {
+        runs = [];
+    }
+    if (!runs.length) {
+        spansEl.innerHTML = '<p class="muted">No run traces yet.</p>';
+        return;
+    }
+
+    // Total run time per run, newest on the right
+    const recent = runs.slice(-PERF_CHART_RUNS);
+    const longest = Math.max(...recent.map(r => r.total_ms || 0), 1);
+    chartEl.innerHTML = recent.map(r => {
+        const height = r.total_ms ? Math.max(4, Math.round(100 * r.total_ms / longest)) : 100;
+        const label = `${(r.started || r.run).slice(0, 16)} · ${formatMs(r.total_ms)} · ${r.status}`;
+        return `<div class="perf-bar perf-${r.status}" style="height: ${height}%" title="${escapeHtml(label)}"></div>`;
+    }).join('');
+
+    // Latest run's spans against the median of the runs before it
+    const latest = runs[runs.length - 1];
+    const baseline = runs.slice(-PERF_BASELINE_RUNS - 1, -1);
+    const rows = Object.entries(latest.spans || {})
+        .sort((a, b) => b[1].ms - a[1].ms)
+        .slice(0, PERF_TOP_SPANS)
+        .map(([name, span]) => {
+            const previous = median(baseline.map(r => (r.spans || {})[name]).filter(Boolean).map(s => s.ms));
+            let change = '-';
+            let changeClass = '';
+            if (previous) {
+                const pct = Math.round(100 * (span.ms - previous) / previous);
+                change = `${pct > 0 ? '+' : ''}${pct}%`;
+                changeClass = pct >= 25 ? 'perf-worse' : pct <= -25 ? 'perf-better' : '';
+            }
+            return `
+                <tr>
+                    <td>${escapeHtml(name)}${span.count > 1 ? ` <span class="muted">&times;${span.count}</span>` : ''}</td>
+                    <td>${formatMs(span.ms)}</td>
+                    <td>${formatMs(previous)}</td>
+                    <td class="${changeClass}">${change}</td>
+                    <td class="muted">${spanCounters(span)}${span.errors ? ` <span class="perf-worse">${span.errors} failed</span>` : ''}</td>
+                </tr>`;
+        }).join('');
+
+    spansEl.innerHTML = `
+        <p class="actions-note">Latest run ${escapeHtml(latest.run)}: ${formatMs(latest.total_ms)} (${escapeHtml(latest.status)})</p>
+        <table class="archive-table">
+            <thead><tr><th>Span</th><th>Time</th><th>Median (${baseline.length} runs)</th><th>Change</th><th>Counters</th></tr></thead>
+            <tbody>${rows}</tbody>
+        </table>
+    `;
+}
+
 // Auto-load dashboard on page load
 document.addEventListener('DOMContentLoaded', loadDashboard);
+document.addEventListener('DOMContentLoaded', loadMetrics);
@@ -0,0 +1,122 @@
+// AI News Blog - Client-side full-text search over data/search/
+// The builder writes a prefix-sharded inverted index (see
+// DashboardBuilder._write_search_index), so a query only fetches the
+// manifest, the doc table and the one or two shards its terms live in.
+
+const SEARCH_STOPWORDS = new Set((
+    'a an and are as at be but by can do for from has have how if in into is it its ' +
+    'more not of on or our so than that the their them then there these they this to ' +
+    'was we were what when where which while who why will with you your'
+).split(' '));
+
+const searchCache = { manifest: null, docs: null, shards: new Map() };
+
+// Mirrors search_tokens() in scripts/post_text.py; keep the two in sync
+function searchTokens(text) {
+    const tokens = [];
+    for (let token of text.toLowerCase().match(/[a-z0-9]+/g) || []) {
+        if (token.length < 2 || /^\d+$/.test(token) || SEARCH_STOPWORDS.has(token)) continue;
+        if (token.length > 3) {
+            if (token.endsWith('ies')) {
+                token = token.slice(0, -3) + 'y';
+            } else if (token.endsWith('s') && !/(ss|us|is)$/.test(token)) {
+                token = token.slice(0, -1);
+            }
+        }
+        tokens.push(token);
+    }
+    return tokens;
+}
+
+function fetchSearchFile(file) {
+    return fetchData(`data/search/${file}`).then(resp => {
+        if (!resp.ok) throw new Error(`${file}: HTTP ${resp.status}`);
+        return resp.json();
+    });
+}
+
+function loadSearchShard(prefix) {
+    if (!searchCache.shards.has(prefix)) {
+        const known = prefix in searchCache.manifest.shards;
+        searchCache.shards.set(prefix, known ? fetchSearchFile(`shard-${prefix}.json`) : Promise.resolve(null));
+    }
+    return searchCache.shards.get(prefix);
+}
+
+function lowerBound(terms, term) {
+    let lo = 0, hi = terms.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (terms[mid] < term) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+// Accumulate a term's postings into docId -> weight
+function addPostings(scores, postings) {
+    let docId = 0;
+    for (let i = 0; i < postings.length; i += 2) {
+        docId += postings[i];
+        scores.set(docId, (scores.get(docId) || 0) + postings[i + 1]);
+    }
+}
+
+async function termScores(token, isPrefix) {
+    const manifest = searchCache.manifest;
+    const scores = new Map();
+    const shard = await loadSearchShard(token.slice(0, manifest.prefix_length));
+    if (!shard) return scores;
+
+    let i = lowerBound(shard.terms, token);
+    if (!isPrefix) {
+        if (shard.terms[i] === token) addPostings(scores, shard.postings[i]);
+        return scores;
+    }
+    // The word being typed matches every term it prefixes
+    for (; i < shard.terms.length && shard.terms[i].startsWith(token); i++) {
+        addPostings(scores, shard.postings[i]);
+    }
+    return scores;
+}
+
+/**
+ * Search the archive. Every query term must match (AND); the last term is
+ * treated as a prefix while it is still being typed. Resolves to post
+ * objects shaped like the posts index, best match first, or null when no
+ * search index has been built.
+ */
+async function searchPosts(query) {
+    try {
+        if (!searchCache.manifest) {
+            [searchCache.manifest, searchCache.docs] = await Promise.all([
+                fetchSearchFile('manifest.json'), fetchSearchFile('docs.json'),
+            ]);
+        }
+    } catch (e) {
+        return null;
+    }
+
+    const tokens = [...new Set(searchTokens(query))];
+    if (tokens.length === 0) return [];
+    const typingLast = !/\s$/.test(query);
+    const perTerm = await Promise.all(tokens.map((token, i) =>
+        termScores(token, typingLast && i === tokens.length - 1 && token.length >= searchCache.manifest.prefix_length)
+    ));
+
+    // Intersect, starting from the rarest term
+    perTerm.sort((a, b) => a.size - b.size);
+    const results = [];
+    for (const [docId, weight] of perTerm[0]) {
+        let score = weight;
+        if (perTerm.every(scores => {
+            const w = scores.get(docId);
+            if (w === undefined) return false;
+            if (scores !== perTerm[0]) score += w;
+            return true;
+        })) {
+            const [filename, title, date, word_count, seo_score, status] = searchCache.docs[docId];
+            results.push({ filename, title, date, word_count, seo_score, status, score });
+        }
+    }
+    return results.sort((a, b) => b.score - a.score || b.date.localeCompare(a.date));
+}
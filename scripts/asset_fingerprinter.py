@@ -0,0 +1,140 @@
+"""
+Asset Fingerprinter - Content-hashed static assets for the GitHub Pages dashboard.
+
+Writes fingerprinted copies of docs/js/*.js and docs/css/*.css (for example
+js/app.3f9a1c04be.js), points the <script>/<link> tags in docs/*.html at
+them and records everything in docs/asset-manifest.json, together with
+content hashes for the JSON files under docs/data/ that app.js uses as
+cache keys. Running it twice without asset changes rewrites nothing.
+
+Runs in the Pages deploy workflow on the checked-out docs/ right before
+upload, so the repository keeps plain asset names and hand-editable pages.
+
+Usage:
+    python scripts/asset_fingerprinter.py [--docs-dir docs/]
+"""
+
+import re
+import json
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+DOCS_DIR = ROOT_DIR / "docs"
+
+MANIFEST_NAME = "asset-manifest.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+ASSET_DIRS = {"js": ".js", "css": ".css"}
+
+FINGERPRINTED_RE = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}$")
+# src="js/app.js" or href="css/style.3f9a1c04be.css" (already fingerprinted)
+ASSET_REF_RE = re.compile(
+    rf"""(?P<attr>(?:src|href)=["'])(?P<name>(?:js|css)/[\w-]+)(?:\.[0-9a-f]{{{HASH_LENGTH}}})?(?P<ext>\.(?:js|css))(?=["'])"""
+)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+class AssetFingerprinter:
+    """Fingerprint docs/ assets, rewrite HTML references and write the asset manifest."""
+
+    def __init__(self, docs_dir: Optional[Path] = None):
+        self.docs_dir = Path(docs_dir) if docs_dir else DOCS_DIR
+        self.data_dir = self.docs_dir / "data"
+        self.written = 0
+
+    def run(self) -> Dict:
+        """Fingerprint assets and return the manifest that was written."""
+        assets = self._fingerprint_assets()
+        pages = self._rewrite_pages(assets)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "assets": assets,
+            "data": self._hash_data(),
+        }
+        self._write_if_changed(self.docs_dir / MANIFEST_NAME, json.dumps(manifest, indent=2))
+        logger.info(
+            f"Assets fingerprinted: {len(assets)} assets, {len(manifest['data'])} data files, "
+            f"{pages} pages rewritten, {self.written} files written"
+        )
+        return manifest
+
+    def _fingerprint_assets(self) -> Dict[str, str]:
+        """Write name.<hash>.ext copies; return {"js/app.js": "js/app.<hash>.js"}."""
+        assets = {}
+        for subdir, ext in ASSET_DIRS.items():
+            directory = self.docs_dir / subdir
+            if not directory.is_dir():
+                continue
+            sources = [p for p in sorted(directory.glob(f"*{ext}")) if not FINGERPRINTED_RE.search(p.stem)]
+            for source in sources:
+                data = source.read_bytes()
+                target = source.with_name(f"{source.stem}.{content_hash(data)}{ext}")
+                if not target.exists():
+                    target.write_bytes(data)
+                    self.written += 1
+                assets[f"{subdir}/{source.name}"] = f"{subdir}/{target.name}"
+
+                # Drop copies from earlier versions of this asset
+                for old in directory.glob(f"{source.stem}.*{ext}"):
+                    if old != target and FINGERPRINTED_RE.search(old.stem) and old.stem.rsplit(".", 1)[0] == source.stem:
+                        old.unlink()
+                        logger.debug(f"Removed stale asset: {old.name}")
+        return assets
+
+    def _rewrite_pages(self, assets: Dict[str, str]) -> int:
+        """Point asset references in docs/*.html at the fingerprinted copies."""
+
+        def replace(match: re.Match) -> str:
+            logical = match.group("name") + match.group("ext")
+            return match.group("attr") + assets.get(logical, logical)
+
+        rewritten = 0
+        for page in sorted(self.docs_dir.glob("*.html")):
+            html = page.read_text(encoding="utf-8")
+            if self._write_if_changed(page, ASSET_REF_RE.sub(replace, html)):
+                rewritten += 1
+        return rewritten
+
+    def _hash_data(self) -> Dict[str, str]:
+        """Content hashes of the JSON data files fetched by the frontend.
+
+        Post bodies under data/posts/ are left out: they are addressed by
+        filename, rarely change once published, and would make the manifest
+        grow with the archive.
+        """
+        hashes = {}
+        if not self.data_dir.is_dir():
+            return hashes
+        files: List[Path] = [
+            p for p in self.data_dir.rglob("*.json")
+            if not p.name.startswith(".") and p.parent.name != "posts"
+        ]
+        for path in sorted(files):
+            key = path.relative_to(self.docs_dir).as_posix()
+            hashes[key] = content_hash(path.read_bytes())
+        return hashes
+
+    def _write_if_changed(self, path: Path, text: str) -> bool:
+        if path.exists() and path.read_text(encoding="utf-8") == text:
+            return False
+        path.write_text(text, encoding="utf-8")
+        self.written += 1
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fingerprint dashboard assets")
+    parser.add_argument("--docs-dir", type=Path, default=DOCS_DIR, help="Site directory (default: docs/)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    AssetFingerprinter(args.docs_dir).run()
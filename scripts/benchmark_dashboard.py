@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Dashboard build benchmark - Times DashboardBuilder on large synthetic archives.
+
+Generates N synthetic drafts (front matter + Markdown body) in a scratch
+directory, then runs each build in a fresh subprocess so peak RSS is
+measured per build: a full build into an empty data directory followed by
+an incremental no-op rebuild. Child-process RSS covers the parsing pool.
+
+Usage:
+    python scripts/benchmark_dashboard.py                          # 10k and 100k drafts
+    python scripts/benchmark_dashboard.py --sizes 10000 --workers 1 4
+"""
+
+import sys
+import json
+import shutil
+import argparse
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_seo import VOCAB, make_document
+
+DEFAULT_SIZES = [10000, 100000]
+START_DATE = date(2020, 1, 1)
+
+
+def make_archive(drafts_dir: Path, count: int, words: int) -> None:
+    """Write ``count`` drafts, several per day, in the generator's front matter format."""
+    drafts_dir.mkdir(parents=True, exist_ok=True)
+    # A handful of distinct bodies keeps generation fast; front matter stays unique
+    bodies = [make_document(words, seed=seed) for seed in range(16)]
+    for i in range(count):
+        day = (START_DATE + timedelta(days=i // 5)).isoformat()
+        title = f"{VOCAB[i % len(VOCAB)].title()} {VOCAB[(i * 7) % len(VOCAB)]} report {i}"
+        keywords = "\n".join(f"  - {VOCAB[(i + k) % len(VOCAB)]}" for k in range(5))
+        (drafts_dir / f"{day}-synthetic-post-{i:06d}.md").write_text(
+            f"---\ntitle: \"{title}\"\ndate: {day}\nslug: synthetic-post-{i:06d}\n"
+            f"word_count: {words}\nseo_score: {50 + i % 50}\nstatus: draft\n"
+            f"keywords:\n{keywords}\nmeta_description: \"Synthetic post {i} for build benchmarks.\"\n---\n\n"
+            + bodies[i % len(bodies)],
+            encoding="utf-8",
+        )
+
+
+def run_build(drafts_dir: Path, data_dir: Path, workers: int) -> Dict:
+    """Run one build in a subprocess; return wall time and peak RSS."""
+    cmd = [sys.executable, __file__, "--build-once", str(drafts_dir), str(data_dir), "--workers", str(workers)]
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def build_once(drafts_dir: Path, data_dir: Path, workers: int) -> None:
+    """Subprocess entry point: build and print timing/RSS as JSON."""
+    import logging
+    from build_dashboard import DashboardBuilder
+
+    logging.disable(logging.INFO)
+    start = time.perf_counter()
+    builder = DashboardBuilder(drafts_dir=drafts_dir, data_dir=data_dir, workers=workers)
+    builder.build()
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KiB on Linux
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(json.dumps({
+        "seconds": round(elapsed, 2),
+        "peak_rss_mb": round(self_rss, 1),
+        "worker_peak_rss_mb": round(child_rss, 1),
+        "parsed": builder._counts["parsed"],
+    }))
+
+
+def print_table(rows: List[Dict]) -> None:
+    header = f"{'drafts':>8} {'workers':>8} {'build':<12} {'seconds':>9} {'peak RSS MB':>12} {'worker RSS MB':>14} {'parsed':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['drafts']:>8} {r['workers']:>8} {r['build']:<12} {r['seconds']:>9.2f} "
+            f"{r['peak_rss_mb']:>12.1f} {r['worker_peak_rss_mb']:>14.1f} {r['parsed']:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DashboardBuilder on synthetic archives")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Archive sizes in drafts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 0], help="Worker counts to compare (0 = CPU count)")
+    parser.add_argument("--words", type=int, default=400, help="Words per synthetic post")
+    parser.add_argument("--scratch", type=Path, default=None, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--report", type=Path, default=None, help="Also write results as JSON")
+    parser.add_argument("--build-once", nargs=2, type=Path, metavar=("DRAFTS", "DATA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.build_once:
+        build_once(*args.build_once, workers=args.workers[0])
+        return 0
+
+    scratch = args.scratch or Path(tempfile.mkdtemp(prefix="dashboard-bench-"))
+    rows = []
+    try:
+        for size in args.sizes:
+            drafts_dir = scratch / f"drafts-{size}"
+            start = time.perf_counter()
+            make_archive(drafts_dir, size, args.words)
+            print(f"Generated {size} drafts in {time.perf_counter() - start:.1f}s", flush=True)
+
+            for workers in args.workers:
+                data_dir = scratch / f"data-{size}-{workers}"
+                shutil.rmtree(data_dir, ignore_errors=True)
+                for build in ("full", "incremental"):
+                    result = run_build(drafts_dir, data_dir, workers)
+                    rows.append({"drafts": size, "workers": workers or "auto", "build": build, **result})
+                    print(f"  {size} drafts, workers={workers or 'auto'}, {build}: {result['seconds']:.2f}s", flush=True)
+                shutil.rmtree(data_dir, ignore_errors=True)
+            shutil.rmtree(drafts_dir, ignore_errors=True)
+    finally:
+        if args.scratch is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    print()
+    print_table(rows)
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
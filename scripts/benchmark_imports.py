@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark - Cold-start cost of the pipeline entry points.
+
+Runs each target's imports in a fresh interpreter under ``-X importtime``
+and sums the cumulative time of the modules imported after startup (site
+and .pth hooks are excluded). Each target is measured several times and the
+median is compared against a budget, so a module that starts importing
+openai, numpy or requests at import time again shows up as a failure.
+
+Targets:
+    main       what every main.py run pays before its first phase
+    dry-run    main plus the aggregation/dedup modules a --dry-run loads
+    dashboard  build_dashboard.py (plain dashboard rebuilds)
+
+Usage:
+    python scripts/benchmark_imports.py                       # print timings
+    python scripts/benchmark_imports.py --check               # exit 1 if over budget
+    python scripts/benchmark_imports.py --check --budget main=100
+"""
+
+import sys
+import argparse
+import logging
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCRIPTS_DIR = Path(__file__).parent
+MARKER = "#benchmark-imports"
+
+TARGETS = {
+    "main": ["main"],
+    "dry-run": ["main", "news_aggregator", "deduplicator"],
+    "dashboard": ["build_dashboard"],
+}
+
+# Milliseconds; roughly 3x a local measurement, to absorb slower CI runners
+DEFAULT_BUDGETS_MS = {
+    "main": 150,
+    "dry-run": 600,
+    "dashboard": 120,
+}
+
+
+def measure(modules: List[str]) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Import ``modules`` in a fresh interpreter.
+
+    Returns (total ms, [(ms, module)]) where the list holds what the
+    targets import directly, heaviest first.
+    """
+    code = (
+        f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); "
+        f"sys.stderr.write({MARKER + chr(10)!r}); import {', '.join(modules)}"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=SCRIPTS_DIR.parent,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {', '.join(modules)} failed:\n{result.stderr.strip()[-2000:]}")
+
+    lines = result.stderr.split(MARKER + "\n", 1)[-1].splitlines()
+    total, children = 0.0, []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2  # importtime indents nested imports by two
+        if depth == 0:
+            total += int(cumulative) / 1000
+        elif depth == 1:
+            children.append((int(cumulative) / 1000, name.strip()))
+    return total, sorted(children, reverse=True)
+
+
+def run(runs: int, budgets: Dict[str, float]) -> List[Dict]:
+    results = []
+    for target, modules in TARGETS.items():
+        samples = [measure(modules) for _ in range(runs)]
+        totals = [total for total, _ in samples]
+        median = statistics.median(totals)
+        heaviest = min(samples, key=lambda s: abs(s[0] - median))[1][:5]
+        results.append({
+            "target": target,
+            "median_ms": median,
+            "min_ms": min(totals),
+            "budget_ms": budgets.get(target),
+            "heaviest": heaviest,
+        })
+    return results
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for value in values:
+        target, _, ms = value.partition("=")
+        if target not in TARGETS or not ms:
+            raise argparse.ArgumentTypeError(f"--budget expects TARGET=MS with TARGET in {sorted(TARGETS)}")
+        budgets[target] = float(ms)
+    return budgets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the pipeline entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (median is used)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any target exceeds its budget")
+    parser.add_argument("--budget", action="append", default=[], metavar="TARGET=MS",
+                        help="Override a budget, e.g. main=100 (repeatable)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        budgets = parse_budgets(args.budget)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    # Warm the bytecode cache so the first sample isn't a compile
+    measure(sorted({m for modules in TARGETS.values() for m in modules}))
+
+    over = []
+    for r in run(args.runs, budgets):
+        status = "ok"
+        if r["budget_ms"] is not None and r["median_ms"] > r["budget_ms"]:
+            status = "OVER BUDGET"
+            over.append(r["target"])
+        logger.info(
+            f"{r['target']:<10} median {r['median_ms']:7.1f} ms  min {r['min_ms']:7.1f} ms  "
+            f"budget {r['budget_ms']:.0f} ms  {status}"
+        )
+        for ms, module in r["heaviest"]:
+            logger.info(f"    {ms:7.1f} ms  {module}")
+
+    if args.check and over:
+        logger.error(f"Import time over budget: {', '.join(over)}")
+        sys.exit(1)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+SEO Analyzer benchmark - Times SEOAnalyzer on synthetic and real posts.
+
+Generates deterministic Markdown posts (1k-100k words, with the heading /
+list / code-block mix our prompts produce) plus the real drafts in drafts/,
+then times parse(), analyze() and every _score_* method separately. Every
+round starts with cold syllable/token caches; analyze_warm repeats analyze()
+on warm caches, as a long-running process would see it.
+
+Results can be saved as a baseline JSON (benchmarks/seo_baseline.json is
+committed and checked in CI); later runs fail when any timing regresses
+beyond a configurable percentage. Baselines carry a calibration timing of
+a fixed pure-Python workload, and checks scale the baseline by the ratio,
+so a baseline recorded on one machine is usable on another. --compare REV times analyze()
+of seo_analyzer.py as it was at a git revision against the working tree,
+with a fresh analyzer (cold caches) for every round.
+
+Usage:
+    python scripts/benchmark_seo.py                               # print timings
+    python scripts/benchmark_seo.py --save-baseline               # record baseline
+    python scripts/benchmark_seo.py --check --max-regression 25   # fail on regressions
+    python scripts/benchmark_seo.py --compare 2bfef4e^            # before the shared parse
+"""
+
+import gc
+import sys
+import json
+import random
+import argparse
+import logging
+import platform
+import subprocess
+import time
+import types
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from post_text import parse_front_matter, strip_front_matter
+from seo_analyzer import SEOAnalyzer, normalize_token
+
+ROOT_DIR = Path(__file__).parent.parent
+DRAFTS_DIR = ROOT_DIR / "drafts"
+DEFAULT_BASELINE = ROOT_DIR / "benchmarks" / "seo_baseline.json"
+DEFAULT_SIZES = [1000, 5000, 20000, 50000, 100000]
+
+VOCAB = (
+    "model models training inference agent agents language large data system systems "
+    "engineers developers research benchmark performance latency memory compute token "
+    "tokens context window reasoning open source weights fine-tuning retrieval pipeline "
+    "deployment production evaluation accuracy the a of to and in for with on is are "
+    "that this we can will how what why when new better faster cheaper local cloud"
+).split()
+
+KEYWORDS = ["large language models", "inference", "open source"]
+
+SCORERS = [
+    "_score_word_count",
+    "_score_readability",
+    "_score_keywords",
+    "_score_structure",
+    "_score_meta_quality",
+    "_score_content_depth",
+]
+
+
+def make_document(words: int, seed: int = 42) -> str:
+    """Build a deterministic Markdown post of roughly ``words`` words."""
+    rng = random.Random(seed)
+    parts = ["# Synthetic Benchmark Post\n\n**TL;DR**\n"]
+    parts += [f"- {' '.join(rng.choices(VOCAB, k=10))}\n" for _ in range(4)]
+    written = 50
+    section = 0
+    while written < words:
+        section += 1
+        parts.append(f"\n## Section {section}: {' '.join(rng.choices(VOCAB, k=4))}\n")
+        for sub in range(2):
+            parts.append(f"\n### Subsection {section}.{sub + 1}\n")
+            for _ in range(3):
+                sentences = []
+                for _ in range(rng.randint(3, 6)):
+                    n = rng.randint(8, 20)
+                    sentences.append(" ".join(rng.choices(VOCAB, k=n)).capitalize() + rng.choice(".?."))
+                    written += n
+                parts.append("\n" + " ".join(sentences) + f" See [source {section}](https://example.com/{section}).\n")
+                if written >= words:
+                    break
+            if written >= words:
+                break
+        parts.append("\n" + "".join(f"{i}. **{rng.choice(VOCAB)}** {' '.join(rng.choices(VOCAB, k=8))}\n" for i in range(1, 4)))
+        parts.append("\n" + "".join(f"- {' '.join(rng.choices(VOCAB, k=6))}\n" for _ in range(3)))
+        written += 60
+        if section % 3 == 0:
+            parts.append("\n```python\nresult = model.generate(prompt, max_tokens=512)\n```\n")
+    parts.append("\n## Conclusion\n\nThe 3 key results improved 42% and 17.5% over 2025.\n")
+    return "".join(parts)
+
+
+def build_corpora(sizes: List[int], include_drafts: bool = True) -> List[Tuple[str, List[Tuple[str, List[str]]]]]:
+    """Return (case name, [(content, keywords), ...]) pairs."""
+    corpora = [(f"synthetic-{size // 1000}k", [(make_document(size), KEYWORDS)]) for size in sizes]
+
+    if include_drafts and DRAFTS_DIR.is_dir():
+        docs = []
+        for path in sorted(DRAFTS_DIR.glob("*.md")):
+            content = path.read_text(encoding="utf-8")
+            keywords = parse_front_matter(content).get("keywords", [])
+            docs.append((strip_front_matter(content), keywords if isinstance(keywords, list) else []))
+        if docs:
+            corpora.append(("drafts", docs))
+    return corpora
+
+
+def clear_caches(analyzer: SEOAnalyzer) -> None:
+    """Drop memoized syllable counts and keyword tokens so the next round runs cold."""
+    analyzer.syllables.cache_clear()
+    normalize_token.cache_clear()
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Best-of-N milliseconds of a fixed tokenizing workload; scales baselines across machines."""
+    text = make_document(20000, seed=7)
+
+    def workload():
+        counts: Dict[str, int] = {}
+        for word in text.lower().split():
+            word = word.strip(".,?")
+            counts[word] = counts.get(word, 0) + len(word)
+
+    return round(time_call(workload, repeat) * 1000, 3)
+
+
+@contextmanager
+def gc_paused():
+    """Collect first, then keep the cyclic GC off: a collection landing in one round would dominate it."""
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def time_call(func: Callable, repeat: int, setup: Callable = None) -> float:
+    """Best-of-N wall time in seconds; ``setup`` runs untimed before each round."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with gc_paused():
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+METRICS = ["parse", "analyze", "analyze_warm", *SCORERS]
+
+
+def bench_case(analyzer: SEOAnalyzer, docs: List[Tuple[str, List[str]]], repeat: int) -> Dict[str, float]:
+    """Best-of-N milliseconds per metric, summed over the documents in a case."""
+    results = {name: 0.0 for name in METRICS}
+
+    for content, keywords in docs:
+        def run():
+            analyzer.analyze(content, keywords)
+
+        results["analyze"] += time_call(run, repeat, setup=lambda: clear_caches(analyzer))
+        run()  # Warm-up
+        results["analyze_warm"] += time_call(run, repeat)
+
+        best = {name: float("inf") for name in ["parse", *SCORERS]}
+        for _ in range(repeat):
+            # Fresh document and cold caches each round so lazily cached state is not reused
+            clear_caches(analyzer)
+            with gc_paused():
+                start = time.perf_counter()
+                doc = analyzer.parse(content)
+                best["parse"] = min(best["parse"], time.perf_counter() - start)
+
+                for name in SCORERS:
+                    method = getattr(analyzer, name)
+                    args = (doc, keywords) if name == "_score_keywords" else (doc,)
+                    start = time.perf_counter()
+                    method(*args)
+                    best[name] = min(best[name], time.perf_counter() - start)
+
+        for name, seconds in best.items():
+            results[name] += seconds
+
+    results = {name: round(seconds * 1000, 3) for name, seconds in results.items()}
+    results["words"] = sum(len(content.split()) for content, _ in docs)
+    return results
+
+
+def load_analyzer_at(rev: str) -> types.ModuleType:
+    """Import scripts/seo_analyzer.py as it was at git revision ``rev``."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:scripts/seo_analyzer.py"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    module = types.ModuleType(f"seo_analyzer_at_{rev}")
+    # Its CONFIG_DIR (and any sibling imports) resolve against this checkout
+    module.__file__ = str(Path(__file__).parent / "seo_analyzer.py")
+    sys.modules[module.__name__] = module  # dataclasses look their module up here
+    exec(compile(source, f"{rev}:scripts/seo_analyzer.py", "exec"), module.__dict__)
+    return module
+
+
+def time_cold_analyze(make_analyzer: Callable, content: str, keywords: List[str], repeat: int) -> float:
+    """Best-of-N analyze() time, with a fresh analyzer (built outside the timing) each round."""
+    best = float("inf")
+    for _ in range(repeat):
+        analyzer = make_analyzer()
+        with gc_paused():
+            start = time.perf_counter()
+            analyzer.analyze(content, keywords)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare_revision(rev: str, corpora: List, repeat: int) -> Dict[str, Dict]:
+    """analyze() milliseconds at ``rev`` vs the working tree, per case."""
+    old_module = load_analyzer_at(rev)
+    results = {}
+    for case, docs in corpora:
+        old = sum(time_cold_analyze(old_module.SEOAnalyzer, c, k, repeat) for c, k in docs) * 1000
+        new = sum(time_cold_analyze(SEOAnalyzer, c, k, repeat) for c, k in docs) * 1000
+        results[case] = {
+            "words": sum(len(content.split()) for content, _ in docs),
+            "old": round(old, 3),
+            "new": round(new, 3),
+            "speedup": round(old / new, 2) if new else 0.0,
+        }
+    return results
+
+
+def find_regressions(
+    results: Dict, baseline: Dict, max_regression: float, min_ms: float, scale: float = 1.0
+) -> List[str]:
+    """List metrics slower than baseline (times ``scale``) by more than ``max_regression`` percent."""
+    regressions = []
+    for case, metrics in results.items():
+        base_metrics = baseline.get(case)
+        if not base_metrics:
+            continue
+        for name, ms in metrics.items():
+            base_ms = base_metrics.get(name)
+            if name == "words" or base_ms is None:
+                continue
+            base_ms *= scale
+            if max(ms, base_ms) < min_ms:
+                continue
+            change = (ms - base_ms) / base_ms * 100 if base_ms else 0.0
+            if change > max_regression:
+                regressions.append(f"{case}.{name}: {base_ms:.2f}ms -> {ms:.2f}ms (+{change:.0f}%)")
+    return regressions
+
+
+def print_table(results: Dict) -> None:
+    columns = METRICS
+    header = f"{'case':<15} {'words':>8} " + " ".join(f"{c.replace('_score_', ''):>13}" for c in columns)
+    print(header)
+    print("-" * len(header))
+    for case, metrics in results.items():
+        print(f"{case:<15} {metrics['words']:>8} " + " ".join(f"{metrics[c]:>13.3f}" for c in columns))
+    print("(milliseconds, best of N; analyze_warm reuses caches, everything else starts cold)")
+
+
+def print_comparison(rev: str, results: Dict) -> None:
+    header = f"{'case':<15} {'words':>8} {rev[:13]:>13} {'working tree':>13} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for case, m in results.items():
+        print(f"{case:<15} {m['words']:>8} {m['old']:>13.3f} {m['new']:>13.3f} {m['speedup']:>7.2f}x")
+    print("(analyze() milliseconds, best of N, cold caches)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SEOAnalyzer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Synthetic post sizes in words")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per metric (best is kept)")
+    parser.add_argument("--no-drafts", action="store_true", help="Skip the real drafts corpus")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Compare against the baseline and fail on regressions")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed slowdown in percent")
+    parser.add_argument("--min-ms", type=float, default=0.5, help="Ignore metrics faster than this (noise floor)")
+    parser.add_argument("--compare", metavar="REV", help="Compare analyze() against seo_analyzer.py at a git revision")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if args.compare:
+        corpora = build_corpora(args.sizes, include_drafts=not args.no_drafts)
+        print_comparison(args.compare, compare_revision(args.compare, corpora, args.repeat))
+        return 0
+
+    analyzer = SEOAnalyzer()
+
+    results = {}
+    for case, docs in build_corpora(args.sizes, include_drafts=not args.no_drafts):
+        results[case] = bench_case(analyzer, docs, args.repeat)
+    print_table(results)
+    calibration_ms = calibrate(args.repeat)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "calibration_ms": calibration_ms,
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"\nBaseline saved: {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+            return 2
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        base_calibration = baseline.get("calibration_ms")
+        scale = calibration_ms / base_calibration if base_calibration else 1.0
+        print(f"\nCalibration {calibration_ms:.2f}ms vs {base_calibration or 0:.2f}ms in the baseline "
+              f"(baseline scaled x{scale:.2f})")
+        regressions = find_regressions(results, baseline["results"], args.max_regression, args.min_ms, scale)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.max_regression:.0f}%:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.max_regression:.0f}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,25 @@ Scans drafts and logs to build JSON data consumed by the frontend.
 
 import os
 import re
+import gzip
+import filecmp
 import json
+import hashlib
 import logging
+import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from markdown_renderer import render_markdown
+from post_catalog import CATALOG_NAME, PostCatalog
+from post_text import SEARCH_STRIP_RE, parse_front_matter, search_tokens, strip_front_matter
+from tracing import TRACE_GLOB, span, summarize
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,124 +35,447 @@ DATA_DIR = DOCS_DIR / "data"
 POSTS_DIR = DATA_DIR / "posts"
 WORKFLOWS_DIR = ROOT_DIR / ".github" / "workflows"
 
+# Per-run performance time series folded from logs/trace_*.jsonl
+METRICS_NAME = "metrics.json"
+METRICS_VERSION = 1
+METRICS_MAX_RUNS = 180
+
+# Per-draft hash + cached post metadata for incremental builds (committed).
+# Bump the version whenever per-post outputs change so every draft is rebuilt.
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 2
+# Per-draft [mtime, size, hash] of this checkout (gitignored): lets unchanged
+# drafts skip hashing without the committed manifest changing on every checkout
+STAT_CACHE_NAME = ".build-stat-cache.json"
+
+# Pre-rendered post HTML (data/posts/<name>.html) and precompressed siblings
+RENDERED_SUFFIX = ".html"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Below this many drafts to (re)parse, a process pool costs more than it saves
+PARALLEL_MIN_DRAFTS = 32
+
+# Sharded posts index consumed by the frontend (data/index/)
+INDEX_DIR_NAME = "index"
+PAGE_SIZE = 50
+LATEST_COUNT = 8
+
+# Full-text search index (data/search/)
+SEARCH_DIR_NAME = "search"
+SEARCH_VERSION = 1
+SEARCH_FIELD_WEIGHTS = {"title": 5, "keywords": 3, "meta_description": 2, "body": 1}
+SEARCH_MAX_BODY_TERMS = 100  # Most frequent body terms kept per post
+SEARCH_PREFIX_LENGTH = 2
+
+
+def build_post(filepath: Path, content: str) -> Tuple[Dict, str]:
+    """Parse one draft into (post metadata, markdown body)."""
+    metadata = parse_front_matter(content)
+    body = strip_front_matter(content)
+
+    # Extract date from filename
+    parts = filepath.stem.split("-")
+    date_str = "-".join(parts[:3]) if len(parts) >= 3 else ""
+
+    post = {
+        "filename": filepath.name,
+        "date": metadata.get("date", date_str),
+        "title": metadata.get("title", filepath.stem),
+        "slug": metadata.get("slug", filepath.stem),
+        "word_count": int(metadata.get("word_count", len(body.split()))),
+        "seo_score": int(metadata.get("seo_score", 0)),
+        "status": metadata.get("status", "draft"),
+        "keywords": metadata.get("keywords", []),
+        "meta_description": metadata.get("meta_description", ""),
+    }
+    return post, body
+
+
+def render_post(body: str) -> Tuple[str, Dict[str, bytes]]:
+    """Render a post body to its HTML page (TOC nav first) and compressed variants."""
+    rendered = render_markdown(body)
+    page = rendered.toc_html() + "\n" + rendered.html + "\n"
+    data = page.encode("utf-8")
+    # mtime=0 keeps the gzip bytes reproducible across builds
+    compressed = {".gz": gzip.compress(data, GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        compressed[".br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return page, compressed
+
+
+def process_draft(path: str, known_sha256: Optional[str]) -> Dict:
+    """
+    Read, hash, parse and render one draft (runs in pool workers).
+
+    Returns {"sha256"} alone when the content matches ``known_sha256``,
+    otherwise also "post", "body", "page" and "compressed".
+    """
+    filepath = Path(path)
+    content = filepath.read_text(encoding="utf-8")
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    if digest == known_sha256:
+        return {"sha256": digest}
+
+    post, body = build_post(filepath, content)
+    page, compressed = render_post(body)
+    return {"sha256": digest, "post": post, "body": body, "page": page, "compressed": compressed}
+
 
 class DashboardBuilder:
     """Build static dashboard data from drafts and logs."""
 
-    def __init__(self):
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        POSTS_DIR.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        incremental: bool = True,
+        drafts_dir: Optional[Path] = None,
+        data_dir: Optional[Path] = None,
+        workers: Optional[int] = None,
+        catalog_path: Optional[Path] = None,
+        logs_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            incremental: Reuse the build manifest so only new or changed drafts
+                are parsed and only changed outputs are written.
+            drafts_dir: Source drafts (defaults to drafts/).
+            data_dir: Output data directory (defaults to docs/data/).
+            workers: Processes for parsing/rendering drafts (default: CPU count;
+                1 keeps everything in-process).
+            catalog_path: Post catalog database (defaults to <drafts_dir>/catalog.sqlite3).
+            logs_dir: Run logs and traces (defaults to logs/).
+        """
+        self.incremental = incremental
+        self.workers = workers or os.cpu_count() or 1
+        self.drafts_dir = Path(drafts_dir) if drafts_dir else DRAFTS_DIR
+        self.data_dir = Path(data_dir) if data_dir else DATA_DIR
+        self.posts_dir = self.data_dir / "posts"
+        self.manifest_path = self.data_dir / MANIFEST_NAME
+        self.stat_cache_path = self.data_dir / STAT_CACHE_NAME
+        self.catalog_path = Path(catalog_path) if catalog_path else self.drafts_dir / CATALOG_NAME
+        self.logs_dir = Path(logs_dir) if logs_dir else LOGS_DIR
+        self._manifest: Dict[str, Dict] = {}
+        self._stat_cache: Dict[str, List] = {}
+        self._counts = {"parsed": 0, "written": 0, "removed": 0}
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.posts_dir.mkdir(parents=True, exist_ok=True)
 
     def build(self):
-        """Run the full dashboard build."""
-        posts = self._scan_drafts()
-        stats = self._compute_stats(posts)
+        """Run the dashboard build (incremental unless constructed with incremental=False)."""
+        with span("dashboard.build") as s:
+            self._build()
+            s.set(
+                items=len(self._manifest),
+                cache_hits=len(self._manifest) - self._counts["parsed"],  # Drafts reused from the manifest
+                cache_misses=self._counts["parsed"],
+                written=self._counts["written"],
+            )
+
+    def _build(self) -> None:
+        self._scan_drafts()
+        with PostCatalog(self.catalog_path) as catalog:
+            # The scan only detects changes; listings and stats come from the catalog
+            catalog.sync({name: (entry["post"], entry["sha256"]) for name, entry in self._manifest.items()})
+            posts = catalog.list_posts()
+            stats = self._compute_stats(catalog)
         config = self._get_config()
 
         # Write data files
-        self._write_json(DATA_DIR / "posts.json", posts)
-        self._write_json(DATA_DIR / "stats.json", stats)
-        self._write_json(DATA_DIR / "config.json", config)
-
-        logger.info(f"Dashboard built: {len(posts)} posts indexed")
-
-    def _scan_drafts(self) -> List[Dict]:
-        """Scan drafts directory and extract metadata."""
-        posts = []
-
-        if not DRAFTS_DIR.is_dir():
-            return posts
+        self._write_json_lines(self.data_dir / "posts.json", "[", posts, "]")
+        self._write_json(self.data_dir / "stats.json", stats)
+        self._write_json(self.data_dir / "config.json", config)
+        self._write_index(posts)
+        self._write_search_index(posts)
+        self.write_metrics()
+        self._write_json_lines(
+            self.manifest_path,
+            f'{{"version": {MANIFEST_VERSION}, "files": {{',
+            (f"{json.dumps(name)}: {json.dumps(entry)}" for name, entry in self._manifest.items()),
+            "}}",
+        )
+        self._write_stat_cache()
+
+        logger.info(
+            f"Dashboard built: {len(posts)} posts indexed "
+            f"({self._counts['parsed']} parsed, {self._counts['written']} written, "
+            f"{self._counts['removed']} removed)"
+        )
+
+    def _scan_drafts(self) -> None:
+        """Scan drafts directory into self._manifest, reusing cached metadata for unchanged drafts."""
+        previous = self._load_manifest()
+        stat_cache = self._load_stat_cache()
+        manifest: Dict[str, Dict] = {}
+        fresh_stats: Dict[str, List] = {}
+        pending = []  # (filepath, stat, known sha256) for drafts that need reading
+
+        if self.drafts_dir.is_dir():
+            # One directory listing each instead of a stat per output file
+            existing = set(os.listdir(self.posts_dir))
+            with os.scandir(self.drafts_dir) as scan:
+                drafts = sorted((e for e in scan if e.name.endswith(".md")), key=lambda e: e.name, reverse=True)
+
+            for dir_entry in drafts:
+                filepath = Path(dir_entry.path)
+                stat = dir_entry.stat()
+                entry = previous.get(dir_entry.name) if self.incremental else None
+                if entry and not existing.issuperset(self._post_output_names(dir_entry.name)):
+                    entry = None
+
+                # Fast path: same mtime and size as when this checkout last hashed it
+                cached = [stat.st_mtime, stat.st_size, entry["sha256"]] if entry else None
+                if cached and stat_cache.get(dir_entry.name) == cached:
+                    manifest[dir_entry.name] = entry
+                    fresh_stats[dir_entry.name] = cached
+                    continue
+                pending.append((filepath, stat, entry["sha256"] if entry else None))
 
-        for filepath in sorted(DRAFTS_DIR.glob("*.md"), reverse=True):
-            if filepath.name == ".gitkeep":
+        for (filepath, stat, known), result in zip(pending, self._process_drafts(pending)):
+            if "post" not in result:
+                # Touched but identical (e.g. fresh CI checkout): only the local stat cache changes
+                manifest[filepath.name] = previous[filepath.name]
+                fresh_stats[filepath.name] = [stat.st_mtime, stat.st_size, result["sha256"]]
                 continue
 
-            content = filepath.read_text(encoding="utf-8")
-            metadata = self._parse_front_matter(content)
-            body = self._strip_front_matter(content)
-
-            # Extract date from filename
-            parts = filepath.stem.split("-")
-            date_str = "-".join(parts[:3]) if len(parts) >= 3 else ""
-
-            post = {
-                "filename": filepath.name,
-                "date": metadata.get("date", date_str),
-                "title": metadata.get("title", filepath.stem),
-                "slug": metadata.get("slug", filepath.stem),
-                "word_count": int(metadata.get("word_count", len(body.split()))),
-                "seo_score": int(metadata.get("seo_score", 0)),
-                "status": metadata.get("status", "draft"),
-                "keywords": metadata.get("keywords", []),
-                "meta_description": metadata.get("meta_description", ""),
-            }
-            posts.append(post)
-
-            # Copy markdown body to posts dir for client-side rendering
-            post_file = POSTS_DIR / filepath.name
-            post_file.write_text(body, encoding="utf-8")
-
-        return posts
-
-    def _parse_front_matter(self, content: str) -> Dict:
-        """Parse YAML-like front matter from markdown."""
-        metadata = {}
-        match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-        if not match:
-            return metadata
-
-        for line in match.group(1).split("\n"):
-            line = line.strip()
-            if ":" in line and not line.startswith("-"):
-                key, _, value = line.partition(":")
-                key = key.strip()
-                value = value.strip().strip('"').strip("'")
-
-                # Handle lists (simple single-level)
-                if key in metadata and isinstance(metadata[key], list):
-                    continue
-                metadata[key] = value
-            elif line.startswith("- ") and metadata:
-                # Append to last key as list
-                last_key = list(metadata.keys())[-1]
-                if not isinstance(metadata[last_key], list):
-                    metadata[last_key] = []
-                metadata[last_key].append(line[2:].strip())
-
-        return metadata
-
-    def _strip_front_matter(self, content: str) -> str:
-        """Remove YAML front matter from content."""
-        return re.sub(r"^---\n.*?\n---\n*", "", content, count=1, flags=re.DOTALL)
-
-    def _compute_stats(self, posts: List[Dict]) -> Dict:
-        """Compute aggregate statistics."""
-        if not posts:
-            return {
-                "total_posts": 0,
-                "avg_word_count": 0,
-                "avg_seo_score": 0,
-                "last_generated": None,
-                "posts_this_week": 0,
-                "posts_this_month": 0,
-            }
-
-        now = datetime.now()
-        week_ago = now.strftime("%Y-%m-%d")  # Simplified
-        word_counts = [p["word_count"] for p in posts]
-        seo_scores = [p["seo_score"] for p in posts if p["seo_score"] > 0]
-
-        return {
+            self._counts["parsed"] += 1
+            # Markdown body (Copy MD, search index) plus pre-rendered HTML for post.html
+            self._write_if_changed(self.posts_dir / filepath.name, result["body"])
+            self._write_rendered(filepath.name, result["page"], result["compressed"])
+            manifest[filepath.name] = {"sha256": result["sha256"], "post": result["post"]}
+            fresh_stats[filepath.name] = [stat.st_mtime, stat.st_size, result["sha256"]]
+
+        # Remove outputs we generated earlier whose draft is gone
+        for name in previous.keys() - manifest.keys():
+            for output in self._post_outputs(name):
+                if output.exists():
+                    output.unlink()
+                    self._counts["removed"] += 1
+                    logger.info(f"Removed stale post output: {output.name}")
+
+        self._manifest = manifest
+        self._stat_cache = fresh_stats
+
+    def _process_drafts(self, pending: List[Tuple[Path, os.stat_result, Optional[str]]]):
+        """Yield process_draft() results in order, across a process pool for large batches."""
+        paths = [str(filepath) for filepath, _, _ in pending]
+        known = [sha for _, _, sha in pending]
+        if self.workers <= 1 or len(pending) < PARALLEL_MIN_DRAFTS:
+            yield from map(process_draft, paths, known)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor  # Only large batches need multiprocessing
+
+        chunksize = max(1, min(64, len(pending) // (self.workers * 4)))
+        logger.info(f"Processing {len(pending)} drafts across {self.workers} workers")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(process_draft, paths, known, chunksize=chunksize)
+
+    def _post_output_names(self, name: str) -> List[str]:
+        """Names of the files generated in posts_dir for the draft ``name``."""
+        html_name = name[:-len(".md")] + RENDERED_SUFFIX
+        outputs = [name, html_name, html_name + ".gz"]
+        if brotli is not None:
+            outputs.append(html_name + ".br")
+        return outputs
+
+    def _post_outputs(self, name: str) -> List[Path]:
+        """Files generated in posts_dir for the draft ``name``."""
+        return [self.posts_dir / output for output in self._post_output_names(name)]
+
+    def _write_rendered(self, name: str, page: str, compressed: Dict[str, bytes]) -> None:
+        """
+        Write a rendered post page and its .gz/.br siblings.
+
+        Only called for drafts whose source hash changed, so unchanged posts
+        are never re-rendered or recompressed.
+        """
+        html_path = self.posts_dir / (Path(name).stem + RENDERED_SUFFIX)
+        changed = self._write_if_changed(html_path, page)
+        for suffix, data in compressed.items():
+            sibling = html_path.with_name(html_path.name + suffix)
+            if changed or not sibling.exists():
+                self._write_bytes(sibling, data)
+
+    def _write_index(self, posts: List[Dict]) -> None:
+        """
+        Write the paginated posts index: latest.json, page shards and manifest.json.
+
+        Pages are numbered from the oldest post, so a new post only changes the
+        newest page (plus latest/manifest) and older shards stay byte-identical.
+        """
+        index_dir = self.data_dir / INDEX_DIR_NAME
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        # posts are newest first; shard oldest-first so page numbers are stable
+        oldest_first = posts[::-1]
+        pages = []
+        for number, start in enumerate(range(0, len(oldest_first), PAGE_SIZE), 1):
+            chunk = oldest_first[start:start + PAGE_SIZE][::-1]
+            filename = f"page-{number:04d}.json"
+            self._write_json(index_dir / filename, chunk)
+            pages.append({
+                "file": filename,
+                "count": len(chunk),
+                "newest": chunk[0]["date"],
+                "oldest": chunk[-1]["date"],
+            })
+
+        # Drop shards left over from a larger archive
+        for stale in index_dir.glob("page-*.json"):
+            if stale.name not in {p["file"] for p in pages}:
+                stale.unlink()
+
+        self._write_json(index_dir / "latest.json", posts[:LATEST_COUNT])
+        self._write_json(index_dir / "manifest.json", {
             "total_posts": len(posts),
-            "avg_word_count": round(sum(word_counts) / len(word_counts)) if word_counts else 0,
-            "avg_seo_score": round(sum(seo_scores) / len(seo_scores)) if seo_scores else 0,
-            "last_generated": posts[0]["date"] if posts else None,
-            "posts_this_week": sum(1 for p in posts if p["date"] >= (now.strftime("%Y-%m-%d"))),
-            "posts_this_month": sum(
-                1 for p in posts if p["date"][:7] == now.strftime("%Y-%m")
-            ),
-            "updated_at": now.isoformat(),
-        }
+            "page_size": PAGE_SIZE,
+            "latest": "latest.json",
+            # Newest page first, the order the archive loads them in
+            "pages": pages[::-1],
+        })
+
+    def _write_search_index(self, posts: List[Dict]) -> None:
+        """
+        Write a compact, prefix-sharded inverted index for client-side search.
+
+        Layout of data/search/:
+          manifest.json      doc count, shard list, field weights
+          docs.json          [filename, title, date, word_count, seo_score, status] per doc id
+          shard-<pp>.json    {"terms": [...sorted], "postings": [[gap, weight, gap, weight, ...], ...]}
+
+        A term's id is its position in its shard's sorted term list; its postings
+        are (doc id gap, weighted frequency) pairs with ascending, delta-encoded doc
+        ids. Doc ids count from the oldest post so existing ids never move when a
+        new post is added, and unchanged shards stay byte-identical.
+        """
+        search_dir = self.data_dir / SEARCH_DIR_NAME
+        manifest_path = search_dir / "manifest.json"
+        nothing_changed = not (self._counts["parsed"] or self._counts["removed"])
+        if self.incremental and nothing_changed and manifest_path.exists():
+            return
+        search_dir.mkdir(parents=True, exist_ok=True)
+
+        oldest_first = posts[::-1]
+        # term -> flat [gap, weight, gap, weight, ...]; docs are visited in id order,
+        # so postings come out sorted and can be delta-encoded as they are built
+        index: Dict[str, List[int]] = {}
+        last_doc: Dict[str, int] = {}
+        for doc_id, post in enumerate(oldest_first):
+            weights: Dict[str, int] = {}
+            for field in ("title", "meta_description"):
+                for token in search_tokens(post.get(field) or ""):
+                    weights[token] = weights.get(token, 0) + SEARCH_FIELD_WEIGHTS[field]
+            for token in search_tokens(" ".join(post.get("keywords") or [])):
+                weights[token] = weights.get(token, 0) + SEARCH_FIELD_WEIGHTS["keywords"]
+
+            body_path = self.posts_dir / post["filename"]
+            if body_path.exists():
+                body = SEARCH_STRIP_RE.sub(" ", body_path.read_text(encoding="utf-8"))
+                body_counts: Dict[str, int] = {}
+                for token in search_tokens(body):
+                    body_counts[token] = body_counts.get(token, 0) + 1
+                top = sorted(body_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:SEARCH_MAX_BODY_TERMS]
+                for token, count in top:
+                    weights[token] = weights.get(token, 0) + count * SEARCH_FIELD_WEIGHTS["body"]
+
+            for token, weight in weights.items():
+                postings = index.get(token)
+                if postings is None:
+                    index[token] = [doc_id, weight]
+                else:
+                    postings += (doc_id - last_doc[token], weight)
+                last_doc[token] = doc_id
+
+        shards: Dict[str, Dict[str, list]] = {}
+        for term in sorted(index):
+            shard = shards.setdefault(term[:SEARCH_PREFIX_LENGTH], {"terms": [], "postings": []})
+            shard["terms"].append(term)
+            shard["postings"].append(index[term])
+
+        for prefix, shard in shards.items():
+            self._write_compact_json(search_dir / f"shard-{prefix}.json", shard)
+        for stale in search_dir.glob("shard-*.json"):
+            if stale.stem[len("shard-"):] not in shards:
+                stale.unlink()
+
+        self._write_compact_json(search_dir / "docs.json", [
+            [p["filename"], p["title"], p["date"], p["word_count"], p["seo_score"], p["status"]]
+            for p in oldest_first
+        ])
+        self._write_json(manifest_path, {
+            "version": SEARCH_VERSION,
+            "docs": len(oldest_first),
+            "terms": len(index),
+            "prefix_length": SEARCH_PREFIX_LENGTH,
+            "field_weights": SEARCH_FIELD_WEIGHTS,
+            "shards": {prefix: len(shard["terms"]) for prefix, shard in sorted(shards.items())},
+        })
+        logger.info(f"Search index: {len(index)} terms in {len(shards)} shards")
+
+    def write_metrics(self) -> None:
+        """
+        Fold run traces into data/metrics.json, one entry per run, oldest first.
+
+        Runs whose trace is still on disk are re-summarized (so a run that was
+        in progress at the last build is completed); older entries are kept
+        after the weekly cleanup deletes their traces.
+        """
+        path = self.data_dir / METRICS_NAME
+        runs: Dict[str, Dict] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == METRICS_VERSION:
+                    runs = {run["run"]: run for run in data.get("runs", [])}
+            except ValueError:
+                logger.warning(f"{path} unreadable, rebuilding from traces")
+
+        if self.logs_dir.is_dir():
+            for trace in self.logs_dir.glob(TRACE_GLOB):
+                summary = summarize(trace)
+                if summary:
+                    runs[summary["run"]] = summary
+
+        ordered = sorted(runs.values(), key=lambda run: run.get("started") or "")[-METRICS_MAX_RUNS:]
+        self._write_json(path, {"version": METRICS_VERSION, "runs": ordered})
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Load the previous build manifest ({} if missing, unreadable or outdated)."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable build manifest: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        # Older manifests also carried mtime/size, which now live in the stat cache
+        return {name: {"sha256": e["sha256"], "post": e["post"]} for name, e in data.get("files", {}).items()}
+
+    def _load_stat_cache(self) -> Dict[str, List]:
+        """This checkout's draft stats ({} if missing or unreadable: every draft is re-hashed)."""
+        try:
+            return json.loads(self.stat_cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_stat_cache(self) -> None:
+        """Local bookkeeping, not a dashboard output: not counted as written."""
+        text = json.dumps(self._stat_cache, separators=(",", ":"))
+        try:
+            if self.stat_cache_path.read_text(encoding="utf-8") == text:
+                return
+        except OSError:
+            pass
+        self.stat_cache_path.write_text(text, encoding="utf-8")
+
+    def _compute_stats(self, catalog: PostCatalog) -> Dict:
+        """Compute aggregate statistics with indexed catalog queries."""
+        stats = catalog.stats()
+        stats["updated_at"] = datetime.now().isoformat()
+        return stats
 
     def _get_config(self) -> Dict:
         """Get current pipeline configuration."""
@@ -169,12 +506,69 @@ class DashboardBuilder:
         return config
 
     def _write_json(self, path: Path, data) -> None:
-        """Write JSON data to file."""
+        """Write JSON data to file (skipped when the content is unchanged)."""
+        self._write_if_changed(path, json.dumps(data, indent=2, default=str))
+
+    def _write_json_lines(self, path: Path, opener: str, items: Iterable, closer: str) -> None:
+        """
+        Stream a large JSON array or object to disk, one compact item per line.
+
+        Items (dicts, or pre-encoded strings) are encoded one at a time with the
+        C encoder and written straight to a temp file, so posts.json and the
+        build manifest are never held as one big string. The temp file replaces
+        ``path`` only if the bytes differ.
+        """
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write(opener)
+            separator = "\n"
+            for item in items:
+                f.write(separator)
+                f.write(item if isinstance(item, str) else json.dumps(item, default=str))
+                separator = ",\n"
+            f.write("\n" + closer + "\n")
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            tmp.unlink()
+            return
+        os.replace(tmp, path)
+        self._counts["written"] += 1
+
+    def _write_compact_json(self, path: Path, data) -> None:
+        """Write JSON without whitespace (for large, machine-read index files)."""
+        self._write_if_changed(path, json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+    def _write_bytes(self, path: Path, data: bytes) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        path.write_bytes(data)
+        self._counts["written"] += 1
+
+    def _write_if_changed(self, path: Path, text: str) -> bool:
+        """Write text unless the file already holds exactly this content."""
+        if path.exists() and path.read_text(encoding="utf-8") == text:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        self._counts["written"] += 1
+        return True
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build dashboard data")
+    parser.add_argument("--full", action="store_true", help="Ignore the build manifest and re-parse every draft")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write a cProfile dump and collapsed stacks to logs/profiles/ (use --workers 1 to include parsing)",
+    )
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO)
-    builder = DashboardBuilder()
-    builder.build()
+    builder = DashboardBuilder(incremental=not args.full, workers=args.workers)
+    if args.profile:
+        from profiling import PhaseProfiler
+        profiler = PhaseProfiler(LOGS_DIR / "profiles" / f"dashboard-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        with profiler.profile("dashboard"):
+            builder.build()
+    else:
+        builder.build()
@@ -6,24 +6,134 @@ import os
 import json
 import re
 import logging
-from typing import Dict, List, Tuple, Optional
+import tempfile
+import threading
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple, Optional
 from pathlib import Path
 
-from openai import OpenAI
+from openai import OpenAI, RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
+
+from phase_executor import check_phase_deadline, phase_time_left
+from rate_limiter import RequestScheduler, retry_after_seconds
+from retry_utils import retry
+from topic_clusterer import related_items
+from tracing import record, span
 
 logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path(__file__).parent.parent / "config"
+DRAFTS_DIR = Path(__file__).parent.parent / "drafts"
+
+# Transient failures worth retrying; everything else (auth, bad request) fails fast
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+
+class StreamingDraft:
+    """
+    Accumulates a streamed completion into a temp draft file.
+
+    Keeps a running word count and heading outline as text arrives. Once a
+    closing section starts, ``expansion_hint`` projects whether expansion will
+    be needed; ``needs_expansion`` is only set by close(), from the real count.
+    """
+
+    HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+    # Sections the blog prompt puts last; once one starts, the body is nearly done
+    CLOSING_RE = re.compile(r"(?i)key takeaways|conclusion")
+    # Rough word budget of the closing sections (takeaways + conclusion)
+    CLOSING_WORDS = 500
+
+    def __init__(self, path: Path, min_words: int):
+        self.path = path
+        self.min_words = min_words
+        self.word_count = 0
+        self.headings: List[Tuple[int, str]] = []
+        self.expansion_hint: Optional[bool] = None  # Early projection, may be wrong
+        self.needs_expansion: Optional[bool] = None  # Final word count below min_words (set by close())
+        self._word_tail = ""
+        self._line_tail = ""
+        self._parts: List[str] = []
+        self._file = open(path, "w", encoding="utf-8")
+
+    def append(self, delta: str) -> None:
+        """Add a chunk of completion text."""
+        if not delta:
+            return
+        self._parts.append(delta)
+        self._file.write(delta)
+        self._file.flush()
+
+        # Words: only count tokens terminated by whitespace; carry the rest
+        text = self._word_tail + delta
+        words = text.split()
+        if words and not text[-1].isspace():
+            self._word_tail = words.pop()
+        else:
+            self._word_tail = ""
+        self.word_count += len(words)
+
+        # Headings: only inspect complete lines
+        lines = (self._line_tail + delta).split("\n")
+        self._line_tail = lines.pop()
+        for line in lines:
+            self._check_heading(line)
+
+    def close(self) -> str:
+        """Flush trailing partial word/line and return the full text."""
+        if self._word_tail:
+            self.word_count += 1
+            self._word_tail = ""
+        if self._line_tail:
+            self._check_heading(self._line_tail)
+            self._line_tail = ""
+        self.needs_expansion = self.word_count < self.min_words
+        self._file.close()
+        return "".join(self._parts)
+
+    def _check_heading(self, line: str) -> None:
+        match = self.HEADING_RE.match(line)
+        if not match:
+            return
+        level, text = len(match.group(1)), match.group(2)
+        self.headings.append((level, text))
+        logger.info(f"[stream] {'#' * level} {text} ({self.word_count} words so far)")
+
+        if self.expansion_hint is None and level == 2 and self.CLOSING_RE.search(text):
+            projected = self.word_count + self.CLOSING_WORDS
+            self.expansion_hint = projected < self.min_words
+            logger.info(
+                f"[stream] Closing section reached at {self.word_count} words "
+                f"(projected {projected}/{self.min_words}), "
+                f"expansion {'likely' if self.expansion_hint else 'unlikely'}"
+            )
 
 
 class ContentGenerator:
     """Generates blog content through a multi-step pipeline."""
 
-    def __init__(self, config_dir: Optional[str] = None):
+    def __init__(self, config_dir: Optional[str] = None, stream: bool = False, drafts_dir: Optional[str] = None):
         config_path = Path(config_dir) if config_dir else CONFIG_DIR
-
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.stream = stream
+        self.drafts_dir = Path(drafts_dir) if drafts_dir else DRAFTS_DIR
+
+        # Retries are handled by our scheduler, not the SDK; OPENAI_BASE_URL may point at a local fake
+        self.request_timeout = float(os.getenv("OPENAI_TIMEOUT", "300"))
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            timeout=self.request_timeout,
+            max_retries=0,
+        )
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o")
+        self.scheduler = RequestScheduler(
+            rpm=int(os.getenv("OPENAI_RPM", "500")),
+            tpm=int(os.getenv("OPENAI_TPM", "30000")),
+            max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")),
+            throttle_errors=(RateLimitError,),
+        )
 
         with open(config_path / "prompts.json") as f:
             self.prompts = json.load(f)
@@ -33,39 +143,73 @@ class ContentGenerator:
 
         self.total_tokens_used = 0
         self.total_cost = 0.0
+        self._usage_lock = threading.Lock()
 
-    def generate_blog(self, topics: Dict) -> Tuple[str, Dict]:
+    def generate_blog(
+        self,
+        topics: Dict,
+        on_title: Optional[Callable[[str, List[str]], None]] = None,
+    ) -> Tuple[str, Dict]:
         """
         Full pipeline: topic synthesis -> title -> blog -> metadata.
 
+        Args:
+            topics: Ranked topics from NewsAggregator.
+            on_title: Optional hook called with (title, keywords) as soon as they
+                are known, so callers can start dependent work (e.g. image lookup)
+                while the body is still being generated.
+
         Returns:
             Tuple of (blog_content_markdown, metadata_dict)
         """
         primary = topics["primary"]
-        backups = topics.get("backups", [])
+        # Related context comes from the primary's own story cluster, not just the next items by score
+        related = related_items(topics, primary)
 
         # Step 1: Synthesize a focused topic from the news items
-        logger.info("Step 1: Synthesizing topic...")
-        topic_brief = self._synthesize_topic(primary, backups[:2])
+        logger.info(f"Step 1: Synthesizing topic ({len(related)} related items)...")
+        topic_brief = self._synthesize_topic(primary, related)
 
         # Step 2: Generate title
         logger.info("Step 2: Generating title...")
         title = self._generate_title(topic_brief)
+        if on_title:
+            on_title(title, topic_brief.get("target_keywords", []))
 
-        # Step 3: Generate the full blog post
-        logger.info("Step 3: Generating blog content...")
-        blog_content = self._generate_blog_content(title, topic_brief, primary)
-
-        # Step 4: Validate word count and expand if needed
-        word_count = len(blog_content.split())
         min_words = self.seo_config["target_word_count"]["min"]
-        if word_count < min_words:
-            logger.info(f"Word count {word_count} < {min_words}, expanding...")
-            blog_content = self._expand_content(blog_content, min_words)
 
-        # Step 5: Generate meta description
-        logger.info("Step 4: Generating meta description...")
-        meta_desc = self._generate_meta_description(title, topic_brief)
+        if self.stream:
+            # Meta description only needs title + brief, so run it alongside the body
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                logger.info("Step 4: Generating meta description (concurrently)...")
+                # Copy the context so the call keeps the phase deadline and span parent
+                meta_future = pool.submit(
+                    contextvars.copy_context().run, self._generate_meta_description, title, topic_brief
+                )
+
+                logger.info("Step 3: Streaming blog content...")
+                blog_content, needs_expansion = self._stream_blog_content(
+                    title, topic_brief, primary, min_words
+                )
+                if needs_expansion:
+                    logger.info(f"Streamed body below {min_words} words, expanding...")
+                    blog_content = self._expand_content(blog_content, min_words)
+
+                meta_desc = meta_future.result()
+        else:
+            # Step 3: Generate the full blog post
+            logger.info("Step 3: Generating blog content...")
+            blog_content = self._generate_blog_content(title, topic_brief, primary)
+
+            # Step 4: Validate word count and expand if needed
+            word_count = len(blog_content.split())
+            if word_count < min_words:
+                logger.info(f"Word count {word_count} < {min_words}, expanding...")
+                blog_content = self._expand_content(blog_content, min_words)
+
+            # Step 5: Generate meta description
+            logger.info("Step 4: Generating meta description...")
+            meta_desc = self._generate_meta_description(title, topic_brief)
 
         # Build metadata
         metadata = {
@@ -73,7 +217,7 @@ class ContentGenerator:
             "keywords": topic_brief.get("target_keywords", []),
             "meta_description": meta_desc,
             "topic_angle": topic_brief.get("angle", ""),
-            "sources_used": [primary.source] + [b.source for b in backups[:2]],
+            "sources_used": [primary.source] + [r.source for r in related],
             "model_used": self.model,
             "tokens_used": self.total_tokens_used,
             "estimated_cost_usd": round(self.total_cost, 4),
@@ -124,6 +268,39 @@ class ContentGenerator:
 
     def _generate_blog_content(self, title: str, topic_brief: Dict, primary) -> str:
         """Generate the full blog post."""
+        prompt = self._build_blog_prompt(title, topic_brief, primary)
+        return self._call_openai(prompt, max_tokens=16000, temperature=0.7)
+
+    def _stream_blog_content(self, title: str, topic_brief: Dict, primary, min_words: int) -> Tuple[str, bool]:
+        """
+        Stream the full blog post into a temp draft file.
+
+        Returns:
+            Tuple of (blog_content_markdown, needs_expansion). The temp file is
+            removed on success and left in drafts/ for inspection on failure.
+        """
+        prompt = self._build_blog_prompt(title, topic_brief, primary)
+
+        self.drafts_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".stream-", suffix=".md", dir=self.drafts_dir)
+        os.close(fd)
+        draft = StreamingDraft(Path(tmp_name), min_words)
+
+        try:
+            for delta in self._stream_openai(prompt, max_tokens=16000, temperature=0.7):
+                draft.append(delta)
+        finally:
+            content = draft.close()
+
+        logger.info(
+            f"Streamed {draft.word_count} words, "
+            f"{sum(1 for level, _ in draft.headings if level == 2)} H2 sections"
+        )
+        draft.path.unlink(missing_ok=True)
+        return content, bool(draft.needs_expansion)
+
+    def _build_blog_prompt(self, title: str, topic_brief: Dict, primary) -> str:
+        """Fill the blog generation prompt template."""
         keyword = topic_brief.get("target_keywords", ["AI"])[0]
         angle = topic_brief.get("angle", "")
 
@@ -137,7 +314,7 @@ class ContentGenerator:
             for point in key_points:
                 source_summaries += f"- {point}\n"
 
-        prompt = (
+        return (
             self.prompts["blog_generation"]
             .replace("{topic_title}", title)
             .replace("{angle}", angle)
@@ -145,8 +322,6 @@ class ContentGenerator:
             .replace("{source_summaries}", source_summaries)
         )
 
-        return self._call_openai(prompt, max_tokens=16000, temperature=0.7)
-
     def _expand_content(self, content: str, target_words: int) -> str:
         """Expand content iteratively until target word count is reached."""
         max_attempts = 3
@@ -199,26 +374,112 @@ class ContentGenerator:
             desc = desc[:157] + "..."
         return desc
 
+    @retry(max_attempts=5, exceptions=RETRYABLE_ERRORS, jitter=True, max_wait=60,
+           wait_hint=retry_after_seconds, time_left=phase_time_left)
     def _call_openai(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.7) -> str:
-        """Make an OpenAI API call with cost tracking."""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-
-        # Track usage
-        usage = response.usage
-        if usage:
+        """Make a scheduled OpenAI API call with retries and cost tracking."""
+        check_phase_deadline()
+        with span("openai.call", model=self.model, max_tokens=max_tokens) as s:
+            ticket = self.scheduler.acquire(self._estimate_tokens(prompt, max_tokens))
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=self._timeout(),
+                )
+            except Exception as e:
+                self.scheduler.release(ticket, error=e)
+                raise
+
+            usage = response.usage
+            self.scheduler.release(ticket, actual_tokens=usage.total_tokens if usage else None)
+            self._track_usage(usage)
+            content = response.choices[0].message.content or ""
+            s.set(bytes=len(content.encode("utf-8")))
+            if usage:
+                s.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            return content
+
+    def _stream_openai(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.7):
+        """Stream an OpenAI completion, yielding text deltas as they arrive."""
+        started = time.perf_counter()
+        ticket, stream = self._open_stream(prompt, max_tokens, temperature)
+        actual_tokens = None
+        error = None
+        abandoned = False
+        # A span can't stay open across yields; the stream is recorded once it ends
+        attrs = {"model": self.model, "max_tokens": max_tokens, "bytes": 0}
+        try:
+            for chunk in stream:
+                check_phase_deadline()
+                # The final chunk carries usage and no choices
+                if chunk.usage:
+                    actual_tokens = chunk.usage.total_tokens
+                    self._track_usage(chunk.usage)
+                    attrs.update(prompt_tokens=chunk.usage.prompt_tokens,
+                                 completion_tokens=chunk.usage.completion_tokens)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    attrs["bytes"] += len(chunk.choices[0].delta.content.encode("utf-8"))
+                    yield chunk.choices[0].delta.content
+        except GeneratorExit:
+            # The caller stopped reading: neither a success nor a throttle for the scheduler
+            abandoned = True
+            attrs["abandoned"] = True
+            stream.close()
+            raise
+        except Exception as e:
+            error = e
+            stream.close()
+            raise
+        finally:
+            self.scheduler.release(ticket, actual_tokens=actual_tokens, error=error, adapt=not abandoned)
+            record("openai.stream", time.perf_counter() - started,
+                   error=f"{type(error).__name__}: {error}" if error else None, **attrs)
+
+    @retry(max_attempts=5, exceptions=RETRYABLE_ERRORS, jitter=True, max_wait=60,
+           wait_hint=retry_after_seconds, time_left=phase_time_left)
+    def _open_stream(self, prompt: str, max_tokens: int, temperature: float):
+        """Reserve a scheduler slot and open a streaming completion (retried until it starts)."""
+        check_phase_deadline()
+        ticket = self.scheduler.acquire(self._estimate_tokens(prompt, max_tokens))
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=self._timeout(),
+            )
+        except Exception as e:
+            self.scheduler.release(ticket, error=e)
+            raise
+        return ticket, stream
+
+    def _timeout(self) -> float:
+        """Per-request timeout: OPENAI_TIMEOUT, cut short so no call outlives its phase."""
+        left = phase_time_left()
+        return self.request_timeout if left is None else max(1.0, min(self.request_timeout, left))
+
+    @staticmethod
+    def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Upper-bound token estimate used for TPM budgeting (~4 chars per token)."""
+        return len(prompt) // 4 + max_tokens
+
+    def _track_usage(self, usage) -> None:
+        """Accumulate token usage and approximate cost (thread-safe)."""
+        if not usage:
+            return
+        with self._usage_lock:
             self.total_tokens_used += usage.total_tokens
             # Approximate cost (GPT-4 pricing)
             input_cost = usage.prompt_tokens * 0.03 / 1000
             output_cost = usage.completion_tokens * 0.06 / 1000
             self.total_cost += input_cost + output_cost
 
-        return response.choices[0].message.content or ""
-
     def _extract_json(self, text: str) -> str:
         """Extract JSON from text that might have markdown formatting."""
         # Try to find JSON block
@@ -3,73 +3,174 @@ Topic Deduplicator - Prevents repeat topics by tracking recent drafts.
 """
 
 import os
+import json
 import logging
-from typing import List, Set
-from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from datetime import date, timedelta
+
+from post_catalog import CATALOG_NAME, PostCatalog
+from similarity_index import INDEX_NAME, SimilarityIndex, topic_fields
 
 logger = logging.getLogger(__name__)
 
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+DEFAULT_CONFIG = {
+    "lookback_days": 7,
+    "similarity_threshold": 0.3,
+    "backend": "auto",
+    "penalty": 0.3,
+    "max_keyword_overlap": 2,
+}
+
 
 class TopicDeduplicator:
     """Prevent the same topic from being generated on consecutive days."""
 
-    def __init__(self, drafts_dir: str = "drafts", lookback_days: int = 7):
+    def __init__(
+        self,
+        drafts_dir: str = "drafts",
+        lookback_days: Optional[int] = None,
+        catalog_path: Optional[str] = None,
+        similarity_threshold: Optional[float] = None,
+        config_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            drafts_dir: Directory holding the drafts, the post catalog and the similarity index.
+            lookback_days: Days of history to compare against (default from config).
+            catalog_path: Post catalog location (default drafts/catalog.sqlite3).
+            similarity_threshold: Cosine similarity at which a candidate counts as a repeat.
+            config_path: Path to dedup_config.json (defaults to config/).
+        """
+        self.config = self._load_config(config_path)
         self.drafts_dir = drafts_dir
-        self.lookback_days = lookback_days
+        self.lookback_days = lookback_days or self.config["lookback_days"]
+        self.similarity_threshold = similarity_threshold or self.config["similarity_threshold"]
+        self.catalog_path = Path(catalog_path) if catalog_path else Path(drafts_dir) / CATALOG_NAME
+        self.index_path = Path(drafts_dir) / INDEX_NAME
+        self._index = None
+
+    @staticmethod
+    def _load_config(config_path: Optional[str]) -> Dict:
+        path = Path(config_path) if config_path else CONFIG_DIR / "dedup_config.json"
+        config = dict(DEFAULT_CONFIG)
+        if path.exists():
+            with open(path) as f:
+                config.update(json.load(f))
+        return config
+
+    @property
+    def since(self) -> date:
+        # Last `lookback_days` days, today included
+        return date.today() - timedelta(days=self.lookback_days - 1)
 
     def get_recent_topics(self) -> Set[str]:
-        """Extract keywords from recent draft filenames."""
+        """
+        Extract keywords from the slugs of recent posts in the post catalog.
+
+        Also brings the similarity index up to date with the catalog.
+        """
         recent_keywords: Set[str] = set()
-        cutoff = datetime.now() - timedelta(days=self.lookback_days)
 
         if not os.path.isdir(self.drafts_dir):
             return recent_keywords
 
-        for filename in os.listdir(self.drafts_dir):
-            if not filename.endswith(".md") or filename == ".gitkeep":
-                continue
+        with PostCatalog(self.catalog_path) as catalog:
+            # Not committed: built on a fresh checkout, caught up after a CI cache restore
+            catalog.sync_drafts(Path(self.drafts_dir))
+            recent = catalog.posts_since(self.since)
+            hashes = catalog.hashes()
 
-            # Parse date from filename: 2026-02-19-slug.md
-            parts = filename.split("-")
-            if len(parts) < 4:
-                continue
+        self._index = self._open_index()
+        self._index.sync(Path(self.drafts_dir), hashes)
+        self._index.save()
 
-            try:
-                date_str = "-".join(parts[:3])
-                file_date = datetime.strptime(date_str, "%Y-%m-%d")
-                if file_date >= cutoff:
-                    # Extract keywords from slug portion
-                    slug = "-".join(parts[3:]).replace(".md", "")
-                    words = slug.split("-")
-                    # Filter out short/common words
-                    recent_keywords.update(
-                        w for w in words if len(w) > 3
-                    )
-            except (ValueError, IndexError):
+        for post in recent:
+            # Slug portion of the filename: 2026-02-19-slug.md
+            parts = post["filename"][:-len(".md")].split("-")
+            if len(parts) < 4:
                 continue
+            # Filter out short/common words
+            recent_keywords.update(w for w in parts[3:] if len(w) > 3)
 
         if recent_keywords:
             logger.info(f"Recent topic keywords ({self.lookback_days}d): {recent_keywords}")
 
         return recent_keywords
 
+    def artifact_paths(self) -> List[Path]:
+        """
+        Similarity files this deduplicator keeps under drafts/ (for committing).
+
+        The matrix (8 KiB per post) is not committed: it is gitignored, cached
+        between CI runs, and rebuilt from the drafts when missing.
+        """
+        if isinstance(self._index, SimilarityIndex):
+            return [self._index.path]
+        return []
+
+    def _open_index(self):
+        """
+        The similarity backend: the memory-mapped matrix ("matrix", needs numpy)
+        or the JSON inverted index ("index"). "auto" prefers the matrix.
+        """
+        backend = self.config["backend"]
+        if backend in ("matrix", "auto"):
+            try:
+                from similarity_matrix import SimilarityMatrix  # Loads numpy
+            except ImportError:
+                if backend == "matrix":
+                    logger.warning("Similarity matrix backend needs numpy; using the inverted index")
+            else:
+                return SimilarityMatrix(Path(self.drafts_dir))
+        return SimilarityIndex(self.index_path)
+
     def filter_topics(self, topics: List, recent_keywords: Set[str]) -> List:
-        """Penalize topics that overlap heavily with recent drafts."""
-        if not recent_keywords:
-            return topics
-
-        for topic in topics:
-            title_words = set(topic.title.lower().split())
-            # Normalize
-            title_words = {w.strip(".,!?;:'\"()-") for w in title_words if len(w) > 3}
-            overlap = title_words & recent_keywords
-
-            if len(overlap) > 2:
-                old_score = topic.engagement_score
-                topic.engagement_score *= 0.3  # Heavy penalty
-                logger.info(
-                    f"Dedup penalty: '{topic.title}' "
-                    f"(overlap: {overlap}, score: {old_score:.3f} → {topic.engagement_score:.3f})"
-                )
+        """
+        Penalize topics that repeat recent drafts.
+
+        A topic is a repeat when its title, summary and keywords are similar
+        enough to a recent draft's content, or when its title shares several
+        words with recent slugs. Each repeat is penalized once.
+        """
+        penalty = self.config["penalty"]
+        similar = self._similar_posts(topics)
+        for topic, match in zip(topics, similar):
+            reason = match or self._keyword_overlap(topic, recent_keywords)
+            if not reason:
+                continue
+
+            old_score = topic.engagement_score
+            topic.engagement_score *= penalty  # Heavy penalty
+            logger.info(
+                f"Dedup penalty: '{topic.title}' "
+                f"({reason}, score: {old_score:.3f} → {topic.engagement_score:.3f})"
+            )
 
         return topics
+
+    def _similar_posts(self, topics: List) -> List[Optional[str]]:
+        """Closest recent draft per topic when it crosses the threshold (one batch query)."""
+        if self._index is None:
+            return [None] * len(topics)
+        results = self._index.query_many([topic_fields(t) for t in topics], since=self.since, limit=1)
+        reasons = []
+        for matches in results:
+            if matches and matches[0][1] >= self.similarity_threshold:
+                filename, score = matches[0]
+                reasons.append(f"similar to {filename}: {score:.2f}")
+            else:
+                reasons.append(None)
+        return reasons
+
+    def _keyword_overlap(self, topic, recent_keywords: Set[str]) -> Optional[str]:
+        if not recent_keywords:
+            return None
+        title_words = set(topic.title.lower().split())
+        # Normalize
+        title_words = {w.strip(".,!?;:'\"()-") for w in title_words if len(w) > 3}
+        overlap = title_words & recent_keywords
+        if len(overlap) > self.config["max_keyword_overlap"]:
+            return f"overlap: {overlap}"
+        return None
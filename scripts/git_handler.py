@@ -1,65 +1,163 @@
 """
 Git Handler - Commits draft artifacts to the repository.
 Only runs in CI (GitHub Actions) environment.
+
+A commit is a single scripted git invocation: stage exactly the given paths,
+build the commit with plumbing (write-tree / commit-tree / update-ref), and
+push, rebasing onto the remote branch if the push is rejected. Unchanged
+trees are detected inside the same script, and the bot identity is passed
+through the environment instead of `git config`.
+
+Usage:
+    python scripts/git_handler.py --message "[AUTO] Daily blog generated" drafts/ logs/ docs/data/
 """
 
 import os
-import subprocess
+import sys
 import logging
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
+ROOT_DIR = Path(__file__).parent.parent
+
+BOT_NAME = "AI Blog Bot"
+BOT_EMAIL = "bot@users.noreply.github.com"
+DEFAULT_MESSAGE = "[AUTO] Daily blog generated"
+PUSH_ATTEMPTS = 3
+TIMEOUT_SECONDS = 120
+
+# $1 = remote, $2 = branch, $3 = push (1/0), $4 = message, $5.. = paths.
+# Prints "NOCHANGE" or "COMMIT <sha>", then "PUSHED <sha>" (rebased if needed) once the push lands.
+COMMIT_SCRIPT = r"""
+set -eu
+remote=$1; branch=$2; push=$3; message=$4
+shift 4
+
+git add -A -- "$@"
+tree=$(git write-tree)
+parent=$(git rev-parse -q --verify HEAD^{commit} || true)
+if [ -n "$parent" ] && [ "$tree" = "$(git rev-parse "$parent^{tree}")" ]; then
+    echo NOCHANGE
+    exit 0
+fi
+
+if [ -n "$parent" ]; then
+    commit=$(git commit-tree "$tree" -p "$parent" -m "$message")
+    git update-ref -m "commit: $message" HEAD "$commit" "$parent"
+else
+    commit=$(git commit-tree "$tree" -m "$message")
+    git update-ref -m "commit (initial): $message" HEAD "$commit"
+fi
+echo "COMMIT $commit"
+
+[ "$push" = 1 ] || exit 0
+attempt=1
+until git push -q "$remote" "HEAD:$branch"; do
+    [ "$attempt" -lt {attempts} ] || exit 1
+    attempt=$((attempt + 1))
+    git pull -q --rebase --autostash "$remote" "$branch"
+done
+echo "PUSHED $(git rev-parse HEAD)"
+""".replace("{attempts}", str(PUSH_ATTEMPTS))
+
 
 class GitHandler:
     """Handle git operations for committing drafts."""
 
-    def __init__(self):
+    def __init__(self, repo_dir: Optional[str] = None, remote: str = "origin", branch: str = "main"):
         self.is_ci = os.getenv("GITHUB_ACTIONS") == "true"
+        self.repo_dir = Path(repo_dir) if repo_dir else ROOT_DIR
+        self.remote = remote
+        self.branch = branch
 
-    def commit_draft(self, draft_path: str, log_path: str) -> bool:
-        """Stage and commit the draft + log files."""
+    def commit_draft(self, draft_path: str, log_path: str, extra_paths: Iterable[str] = ()) -> bool:
+        """Commit and push the draft, its log and any other artifacts of this run."""
         if not self.is_ci:
             logger.info("Not in CI environment, skipping git commit")
             return False
 
         try:
-            self._run("git config user.name 'AI Blog Bot'")
-            self._run("git config user.email 'bot@users.noreply.github.com'")
-
-            # Stage files
-            self._run("git add drafts/")
-            self._run("git add logs/")
-            self._run("git add docs/data/ || true")
-
-            # Check if there are changes to commit
-            result = self._run("git diff --cached --quiet || echo CHANGES")
-            if "CHANGES" not in result:
-                logger.info("No changes to commit")
-                return False
-
-            # Commit
-            self._run('git commit -m "[AUTO] Daily blog generated"')
-
-            # Pull with rebase to avoid conflicts, then push
-            self._run("git pull --rebase origin main || true")
-            self._run("git push origin main")
-
-            logger.info("Draft committed and pushed successfully")
-            return True
-
+            commit = self.commit_paths([draft_path, log_path, *extra_paths])
         except Exception as e:
             logger.error(f"Git commit failed: {e}")
             return False
+        return commit is not None
+
+    def commit_paths(self, paths: Iterable[str], message: str = DEFAULT_MESSAGE, push: bool = True) -> Optional[str]:
+        """
+        Stage exactly ``paths``, commit them and (optionally) push, in one invocation.
+
+        Returns the new commit's sha (after any rebase), or None when nothing changed. Raises
+        RuntimeError if git fails.
+        """
+        pathspecs = self._pathspecs(paths)
+        if not pathspecs:
+            logger.info("No changes to commit")
+            return None
 
-    def _run(self, cmd: str) -> str:
-        """Run a shell command and return stdout."""
+        env = dict(
+            os.environ,
+            GIT_AUTHOR_NAME=BOT_NAME, GIT_AUTHOR_EMAIL=BOT_EMAIL,
+            GIT_COMMITTER_NAME=BOT_NAME, GIT_COMMITTER_EMAIL=BOT_EMAIL,
+        )
         result = subprocess.run(
-            cmd,
-            shell=True,
+            ["sh", "-c", COMMIT_SCRIPT, "git-commit", self.remote, self.branch, "1" if push else "0", message,
+             *pathspecs],
+            cwd=self.repo_dir,
+            env=env,
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=TIMEOUT_SECONDS,
         )
-        if result.returncode != 0 and "|| true" not in cmd and "|| echo" not in cmd:
-            raise RuntimeError(f"Command failed: {cmd}\nstderr: {result.stderr}")
-        return result.stdout + result.stderr
+        lines = result.stdout.split()
+        if "NOCHANGE" in lines:
+            logger.info("No changes to commit")
+            return None
+        commit = lines[lines.index("COMMIT") + 1] if "COMMIT" in lines else None
+        if "PUSHED" in lines:
+            commit = lines[lines.index("PUSHED") + 1]
+        if result.returncode != 0:
+            state = f"committed {commit[:10]} but push failed" if commit else "commit failed"
+            raise RuntimeError(f"git {state}: {result.stderr.strip()}")
+
+        logger.info(f"Committed {commit[:10]} ({len(pathspecs)} paths){' and pushed' if push else ''}")
+        return commit
+
+    def _pathspecs(self, paths: Iterable[str]) -> List[str]:
+        """Repo-relative pathspecs for paths that exist (deleted files are covered by their directory)."""
+        specs = []
+        for path in paths:
+            if not path:
+                continue
+            full = Path(path) if Path(path).is_absolute() else self.repo_dir / path
+            if not full.exists():
+                logger.debug(f"Skipping missing path: {path}")
+                continue
+            try:
+                specs.append(full.resolve().relative_to(self.repo_dir.resolve()).as_posix())
+            except ValueError:
+                logger.warning(f"Not inside the repository, skipping: {path}")
+        return list(dict.fromkeys(specs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Commit and push paths in a single git invocation")
+    parser.add_argument("paths", nargs="+", help="Files or directories to stage")
+    parser.add_argument("--message", default=DEFAULT_MESSAGE, help="Commit message")
+    parser.add_argument("--repo", default=None, help="Repository directory (default: project root)")
+    parser.add_argument("--remote", default="origin")
+    parser.add_argument("--branch", default="main")
+    parser.add_argument("--no-push", action="store_true", help="Commit only")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    handler = GitHandler(repo_dir=args.repo, remote=args.remote, branch=args.branch)
+    try:
+        handler.commit_paths(args.paths, message=args.message, push=not args.no_push)
+    except RuntimeError as e:
+        logger.error(str(e))
+        sys.exit(1)
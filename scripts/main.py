@@ -2,62 +2,68 @@
 """
 AI News Blog Generator - Main Orchestrator
 
-Runs the full pipeline:
-  1. Aggregate news from multiple sources
-  2. Rank and select top topic
-  3. Generate SEO-optimized blog post
-  4. Handle hero image (source or prompt)
-  5. Save draft to drafts/
-  6. Commit to git (CI only)
-  7. Send Telegram notification
-  8. Build dashboard data
+Runs the full pipeline as a phase graph (see phase_executor):
+  aggregate   Aggregate news from multiple sources
+  select      Dedup, rank and select top topic
+  generate    Generate SEO-optimized blog post
+  seo, image  SEO analysis and hero image (source or prompt), in parallel
+  save        Save draft to drafts/
+  git         Commit to git (CI only)
+  notify      Send Telegram notification (in parallel with git/dashboard)
+  dashboard   Build dashboard data
 """
 
-import os
 import sys
 import json
+import sqlite3
 import argparse
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-# Load .env for local development
-load_dotenv()
-
 # Project root
 ROOT_DIR = Path(__file__).parent.parent
 DRAFTS_DIR = ROOT_DIR / "drafts"
 LOGS_DIR = ROOT_DIR / "logs"
 
-# Ensure directories exist
-DRAFTS_DIR.mkdir(exist_ok=True)
-LOGS_DIR.mkdir(exist_ok=True)
-
-# Configure logging
-log_filename = f"run_{datetime.now().strftime('%Y%m%d_%H%M')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-    handlers=[
-        logging.FileHandler(LOGS_DIR / log_filename),
-        logging.StreamHandler(sys.stdout),
-    ],
-)
 logger = logging.getLogger("main")
 
 # Add scripts dir to path so imports work
 sys.path.insert(0, str(Path(__file__).parent))
 
-from news_aggregator import NewsAggregator
-from content_generator import ContentGenerator
-from seo_analyzer import SEOAnalyzer
-from image_handler import ImageHandler
+# Only light modules here; pipeline modules (openai, requests, feedparser,
+# numpy) are imported by the phases that use them, so --dry-run and
+# --resume don't pay for what they skip.
+from git_handler import TIMEOUT_SECONDS
+from post_catalog import CATALOG_NAME, PostCatalog
+from phase_executor import CONTINUE, Phase, PhaseExecutor
+from run_checkpoint import RunCheckpoint, new_run_id
 from telegram_notifier import TelegramNotifier
-from git_handler import GitHandler
-from deduplicator import TopicDeduplicator
+from tracing import ROOT_SPAN, TRACE_PREFIX, end_run, span, start_run
+
+
+def setup_run() -> Path:
+    """Load .env, create output directories and configure logging; returns the log file."""
+    from dotenv import load_dotenv
+
+    # Load .env for local development
+    load_dotenv()
+
+    DRAFTS_DIR.mkdir(exist_ok=True)
+    LOGS_DIR.mkdir(exist_ok=True)
+
+    log_path = LOGS_DIR / f"run_{datetime.now().strftime('%Y%m%d_%H%M')}.log"
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+        handlers=[
+            logging.FileHandler(log_path),
+            logging.StreamHandler(sys.stdout),
+        ],
+    )
+    return log_path
 
 
 def slugify(text: str) -> str:
@@ -88,16 +94,26 @@ def save_draft(content: str, metadata: dict, date_str: str) -> Path:
 
     draft_path.write_text(front_matter + content, encoding="utf-8")
     logger.info(f"Draft saved: {draft_path}")
+
+    # Keep the post catalog current for stats, listings and dedup lookbacks
+    try:
+        with PostCatalog(DRAFTS_DIR / CATALOG_NAME) as catalog:
+            catalog.record_draft(draft_path)
+    except sqlite3.Error as e:
+        logger.warning(f"Post catalog not updated: {e}")
     return draft_path
 
 
 def save_backup_topics(topics: dict, date_str: str) -> Path:
     """Save backup topics as JSON."""
+    from topic_clusterer import clusters_to_dict
+
     backup_path = DRAFTS_DIR / f"{date_str}-backup-topics.json"
     backup_data = {
         "date": date_str,
         "primary": topics["primary"].to_dict() if topics["primary"] else None,
         "backups": [t.to_dict() for t in topics.get("backups", [])],
+        "clusters": clusters_to_dict(topics.get("clusters", [])),
         "total_fetched": topics.get("total_fetched", 0),
         "timestamp": topics.get("timestamp", ""),
     }
@@ -106,44 +122,39 @@ def save_backup_topics(topics: dict, date_str: str) -> Path:
     return backup_path
 
 
-def main(topic_index: int | None = None, dry_run: bool = False):
-    """
-    Main pipeline.
-
-    Args:
-        topic_index: If provided (1-indexed), use that backup topic instead of primary.
-        dry_run: If True, run aggregation only (skip GPT-4 + git + notifications).
-    """
-    start_time = time.time()
-    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    notifier = TelegramNotifier()
+def build_phases(
+    log_path: Path,
+    date_str: str,
+    topic_index: int | None,
+    dry_run: bool,
+    stream: bool,
+    notifier: TelegramNotifier,
+    background: ThreadPoolExecutor,
+) -> list[Phase]:
+    """Pipeline phases with their data dependencies, timeouts and failure policies."""
 
-    try:
-        logger.info("=" * 60)
-        logger.info("AI News Blog Generator - Pipeline Started")
-        logger.info(f"Date: {date_str} | Dry run: {dry_run}")
-        logger.info("=" * 60)
+    def aggregate(inputs: dict) -> dict:
+        from news_aggregator import NewsAggregator
 
-        # Phase 1: Aggregate news
-        logger.info("\n--- Phase 1: News Aggregation ---")
         aggregator = NewsAggregator()
         topics = aggregator.get_ranked_topics(top_n=5)
-
         if not topics["primary"]:
-            msg = "No topics found from any source. Aborting."
-            logger.error(msg)
-            notifier.send_error_notification(msg)
-            return 1
+            raise RuntimeError("No topics found from any source. Aborting.")
+        return {"ranked_topics": topics}
+
+    def select_topic(inputs: dict) -> dict:
+        from deduplicator import TopicDeduplicator
+
+        topics = inputs["ranked_topics"]
 
         # Apply deduplication against recent drafts
         dedup = TopicDeduplicator(str(DRAFTS_DIR))
         recent_keywords = dedup.get_recent_topics()
-        if recent_keywords:
-            all_items = topics["all_ranked"]
-            dedup.filter_topics(all_items, recent_keywords)
-            all_items.sort(key=lambda x: x.engagement_score, reverse=True)
-            topics["primary"] = all_items[0]
-            topics["backups"] = all_items[1:5]
+        all_items = topics["all_ranked"]
+        dedup.filter_topics(all_items, recent_keywords)
+        all_items.sort(key=lambda x: x.engagement_score, reverse=True)
+        topics["primary"] = all_items[0]
+        topics["backups"] = all_items[1:5]
 
         # Handle topic switching
         if topic_index is not None and 1 <= topic_index <= len(topics.get("backups", [])):
@@ -155,94 +166,220 @@ def main(topic_index: int | None = None, dry_run: bool = False):
         logger.info(f"Total items fetched: {topics['total_fetched']}")
 
         # Save backup topics
-        save_backup_topics(topics, date_str)
+        backup_path = save_backup_topics(topics, date_str)
+        artifacts = [backup_path, *dedup.artifact_paths()]
+        return {"topics": topics, "artifacts": artifacts}
 
-        if dry_run:
-            logger.info("\n--- DRY RUN: Skipping content generation ---")
-            for i, topic in enumerate(topics.get("all_ranked", [])[:5], 1):
-                logger.info(f"  #{i}: {topic.title} (score: {topic.engagement_score}, source: {topic.source})")
-            elapsed = time.time() - start_time
-            logger.info(f"\nDry run completed in {elapsed:.1f}s")
-            return 0
+    def generate(inputs: dict) -> dict:
+        from content_generator import ContentGenerator
+        from image_handler import ImageHandler
 
-        # Phase 2: Generate blog content
-        logger.info("\n--- Phase 2: Content Generation ---")
-        generator = ContentGenerator()
-        blog_content, metadata = generator.generate_blog(topics)
+        generator = ContentGenerator(stream=stream, drafts_dir=str(DRAFTS_DIR))
+        image_lookup = None
 
-        word_count = len(blog_content.split())
-        logger.info(f"Blog generated: {word_count} words")
+        def start_image_lookup(title: str, keywords: list) -> None:
+            nonlocal image_lookup
+            image_lookup = background.submit(ImageHandler().get_hero_image, title, keywords)
 
-        # Phase 3: SEO Analysis
-        logger.info("\n--- Phase 3: SEO Analysis ---")
-        analyzer = SEOAnalyzer()
-        seo_report = analyzer.analyze(blog_content, metadata.get("keywords", []))
-        metadata["seo_score"] = seo_report.get("overall_score", 0)
-        metadata["word_count"] = word_count
-        logger.info(f"SEO Score: {metadata['seo_score']}/100")
-
-        # Phase 4: Image handling
-        logger.info("\n--- Phase 4: Image Processing ---")
-        image_handler = ImageHandler()
-        image_info = image_handler.get_hero_image(
-            metadata.get("title", ""),
-            metadata.get("keywords", []),
+        blog_content, metadata = generator.generate_blog(
+            inputs["topics"], on_title=start_image_lookup if stream else None
         )
-        metadata["hero_image"] = image_info
+        logger.info(f"Blog generated: {len(blog_content.split())} words")
+        return {"blog_content": blog_content, "metadata": metadata, "image_lookup": image_lookup}
+
+    def seo(inputs: dict) -> dict:
+        from seo_analyzer import SEOAnalyzer
+
+        analyzer = SEOAnalyzer()
+        seo_report = analyzer.analyze(inputs["blog_content"], inputs["metadata"].get("keywords", []))
+        logger.info(f"SEO Score: {seo_report.get('overall_score', 0)}/100")
+        return {"seo_report": seo_report}
+
+    def image(inputs: dict) -> dict:
+        from image_handler import ImageHandler
+
+        metadata = inputs["metadata"]
+        if inputs["image_lookup"] is not None:
+            image_info = inputs["image_lookup"].result()
+        else:
+            image_info = ImageHandler().get_hero_image(
+                metadata.get("title", ""),
+                metadata.get("keywords", []),
+            )
 
         # Save image prompt if generated
+        prompt_path = None
         if image_info.get("type") == "dalle_prompt":
             prompt_path = DRAFTS_DIR / f"{date_str}-{metadata.get('slug', 'post')}-image-prompt.txt"
             prompt_path.write_text(image_info["prompt"], encoding="utf-8")
             logger.info(f"Image prompt saved: {prompt_path}")
+        return {"image_info": image_info, "prompt_path": prompt_path}
 
-        # Phase 5: Save draft
-        logger.info("\n--- Phase 5: Saving Draft ---")
+    def save(inputs: dict) -> dict:
+        blog_content, metadata = inputs["blog_content"], dict(inputs["metadata"])
+        metadata["seo_score"] = inputs["seo_report"].get("overall_score", 0)
+        metadata["word_count"] = len(blog_content.split())
+        metadata["hero_image"] = inputs["image_info"]
         metadata["slug"] = slugify(metadata.get("title", "untitled"))
         metadata["date"] = date_str
         metadata["status"] = "draft"
-        draft_path = save_draft(blog_content, metadata, date_str)
+        return {"draft_path": save_draft(blog_content, metadata, date_str), "post_metadata": metadata}
+
+    def commit(inputs: dict) -> dict:
+        from git_handler import GitHandler
 
-        # Phase 6: Git commit (CI only)
-        logger.info("\n--- Phase 6: Git Operations ---")
         git_handler = GitHandler()
-        log_path = str(LOGS_DIR / log_filename)
-        git_handler.commit_draft(str(draft_path), log_path)
+        artifacts = [*inputs["artifacts"], inputs["prompt_path"]]
+        committed = git_handler.commit_draft(
+            str(inputs["draft_path"]), str(log_path), [str(p) for p in artifacts if p]
+        )
+        return {"committed": committed}
 
-        # Phase 7: Telegram notification
-        logger.info("\n--- Phase 7: Telegram Notification ---")
+    def notify(inputs: dict) -> dict:
         notifier.send_draft_notification(
-            {"metadata": metadata, "content": blog_content},
-            topics,
+            {"metadata": inputs["post_metadata"], "content": inputs["blog_content"]},
+            inputs["topics"],
         )
+        return {}
+
+    def dashboard(inputs: dict) -> dict:
+        from build_dashboard import DashboardBuilder
+        builder = DashboardBuilder()
+        builder.build()
+        logger.info("Dashboard data updated")
+        return {}
+
+    phases = [
+        Phase("aggregate", aggregate, outputs=("ranked_topics",), timeout=300),
+        Phase("select", select_topic, inputs=("ranked_topics",), outputs=("topics", "artifacts"), timeout=120),
+    ]
+    if dry_run:
+        return phases
+    return phases + [
+        Phase("generate", generate, inputs=("topics",),
+              outputs=("blog_content", "metadata", "image_lookup"), timeout=600),
+        Phase("seo", seo, inputs=("blog_content", "metadata"), outputs=("seo_report",), timeout=60),
+        Phase("image", image, inputs=("metadata", "image_lookup"),
+              outputs=("image_info", "prompt_path"), timeout=120),
+        Phase("save", save, inputs=("blog_content", "metadata", "seo_report", "image_info"),
+              outputs=("draft_path", "post_metadata"), timeout=60),
+        # The dashboard reads the catalog git stages, so it waits for the commit (but not its success)
+        Phase("git", commit, inputs=("draft_path", "artifacts", "prompt_path"), outputs=("committed",),
+              timeout=TIMEOUT_SECONDS + 30, on_failure=CONTINUE),
+        Phase("notify", notify, inputs=("post_metadata", "blog_content", "topics"),
+              timeout=30, on_failure=CONTINUE),
+        Phase("dashboard", dashboard, inputs=("draft_path",), after=("git",), timeout=120, on_failure=CONTINUE),
+    ]
+
+
+def main(
+    topic_index: int | None = None,
+    dry_run: bool = False,
+    stream: bool = False,
+    resume: str | None = None,
+    profile: bool = False,
+):
+    """
+    Main pipeline.
 
-        # Phase 8: Build dashboard data
-        logger.info("\n--- Phase 8: Dashboard Data ---")
+    Args:
+        topic_index: If provided (1-indexed), use that backup topic instead of primary.
+        dry_run: If True, run aggregation only (skip GPT-4 + git + notifications).
+        stream: If True, stream the blog body and overlap image lookup with generation.
+        resume: Run id of an earlier failed run; its completed phases are restored
+            from drafts/runs/<run-id>/ and its original options are used.
+        profile: If True, write per-phase cProfile dumps and collapsed stacks to
+            logs/profiles/<run-id>/ and log each phase's hottest functions.
+    """
+    log_path = setup_run()
+    start_time = time.time()
+    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    checkpoint = None
+    if resume:
         try:
-            from build_dashboard import DashboardBuilder
-            builder = DashboardBuilder()
-            builder.build()
-            logger.info("Dashboard data updated")
-        except Exception as e:
-            logger.warning(f"Dashboard build skipped: {e}")
+            checkpoint = RunCheckpoint.resume(DRAFTS_DIR, resume)
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            return 1
+        options = checkpoint.options()
+        date_str = options.get("date", date_str)
+        topic_index = options.get("topic_index")
+        stream = options.get("stream", False)
+        dry_run = False
+        logger.info(f"Resuming run {resume} (completed: {', '.join(checkpoint.completed()) or 'none'})")
+    elif not dry_run:
+        checkpoint = RunCheckpoint(DRAFTS_DIR)
+        checkpoint.start({"date": date_str, "topic_index": topic_index, "stream": stream})
+
+    run_id = checkpoint.run_id if checkpoint else new_run_id()
+    start_run(LOGS_DIR / f"{TRACE_PREFIX}{run_id}.jsonl", run_id)
+    notifier = TelegramNotifier()
+    background = ThreadPoolExecutor(max_workers=1)
+    executor = None
+
+    try:
+        logger.info("=" * 60)
+        logger.info("AI News Blog Generator - Pipeline Started")
+        logger.info(f"Date: {date_str} | Dry run: {dry_run}")
+        logger.info(f"Run id: {run_id}")
+        logger.info("=" * 60)
+
+        phases = build_phases(log_path, date_str, topic_index, dry_run, stream, notifier, background)
+        profiler = None
+        if profile:
+            from profiling import PhaseProfiler
+            profiler = PhaseProfiler(LOGS_DIR / "profiles" / run_id)
+        executor = PhaseExecutor(phases, checkpoint=checkpoint, profiler=profiler)
+        with span(ROOT_SPAN, dry_run=dry_run, resumed=bool(resume)):
+            context = executor.run({})
+
+        if dry_run:
+            logger.info("\n--- DRY RUN: Skipping content generation ---")
+            for i, topic in enumerate(context["topics"].get("all_ranked", [])[:5], 1):
+                logger.info(f"  #{i}: {topic.title} (score: {topic.engagement_score}, source: {topic.source})")
+            elapsed = time.time() - start_time
+            logger.info(f"\nDry run completed in {elapsed:.1f}s")
+            return 0
 
         elapsed = time.time() - start_time
         logger.info("=" * 60)
         logger.info(f"Pipeline completed successfully in {elapsed:.1f}s")
-        logger.info(f"Draft: {draft_path}")
-        logger.info(f"Word count: {word_count}")
-        logger.info(f"SEO score: {metadata['seo_score']}/100")
+        logger.info(f"Draft: {context['draft_path']}")
+        logger.info(f"Word count: {context['post_metadata']['word_count']}")
+        logger.info(f"SEO score: {context['post_metadata']['seo_score']}/100")
         logger.info("=" * 60)
+        checkpoint.discard()
         return 0
 
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
+        message = str(e)
+        if checkpoint is not None:
+            message += f"\nResume with: --resume {checkpoint.run_id}"
+            logger.info(f"Completed phases are checkpointed; resume with --resume {checkpoint.run_id}")
         try:
-            notifier.send_error_notification(str(e))
+            notifier.send_error_notification(message)
         except Exception:
             pass
         return 1
 
+    finally:
+        if executor is not None:
+            logger.info("Phase timings:")
+            for line in executor.summary():
+                logger.info(line)
+        background.shutdown(wait=False)
+        # Bounded wait for queued Telegram messages; undelivered ones go out next run
+        notifier.close()
+        end_run()
+        if not dry_run:
+            # Fold the finished trace into docs/data/metrics.json for the final commit step
+            try:
+                from build_dashboard import DashboardBuilder
+                DashboardBuilder().write_metrics()
+            except Exception as e:
+                logger.warning(f"Run metrics not updated: {e}")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="AI News Blog Generator")
@@ -257,7 +394,29 @@ if __name__ == "__main__":
         action="store_true",
         help="Run aggregation only, skip GPT-4 calls and git",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the blog body and start image/meta steps before it finishes",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume a failed run, skipping phases checkpointed in drafts/runs/RUN_ID/",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each phase into logs/profiles/<run-id>/ (.prof dumps + collapsed stacks)",
+    )
     args = parser.parse_args()
 
-    exit_code = main(topic_index=args.topic_index, dry_run=args.dry_run)
+    exit_code = main(
+        topic_index=args.topic_index,
+        dry_run=args.dry_run,
+        stream=args.stream,
+        resume=args.resume,
+        profile=args.profile,
+    )
     sys.exit(exit_code)
@@ -0,0 +1,360 @@
+"""
+Markdown Renderer - Safe Markdown-to-HTML rendering for pre-built post pages.
+
+Covers the Markdown our prompts produce (ATX headings, paragraphs, nested
+lists, fenced code, blockquotes, GFM tables, rules, emphasis, inline code,
+links and images), unwrapping posts the model returned inside a single
+```markdown fence. Output is sanitized by construction: all source text is
+HTML-escaped, raw HTML is shown as text, and link/image URLs are limited to
+http(s), mailto, fragment and relative targets.
+"""
+
+import re
+import html
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+FENCE_RE = re.compile(r"^(\s*)(`{3,}|~{3,})\s*([\w+#.-]*)")
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+RULE_RE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+QUOTE_RE = re.compile(r"^\s{0,3}>\s?")
+LIST_ITEM_RE = re.compile(r"^(\s*)([-*+]|\d{1,9}[.)])\s+(.*)$")
+TABLE_SEPARATOR_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(\s*<?([^)\s>]*)>?(?:\s+\"([^\"]*)\")?\s*\)")
+LINK_RE = re.compile(r"\[((?:[^\[\]]|\[[^\]]*\])*)\]\(\s*<?([^)\s>]*)>?(?:\s+\"([^\"]*)\")?\s*\)")
+AUTOLINK_RE = re.compile(r"<(https?://[^>\s]+)>")
+STRONG_RE = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+EM_RE = re.compile(r"(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?!\*)|(?<![\w_])_(?=\S)(.+?)(?<=\S)_(?![\w_])")
+STRIKE_RE = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+PLACEHOLDER_RE = re.compile("\x00(\\d+)\x00")
+SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+
+SAFE_URL_RE = re.compile(r"^(?:https?:|mailto:|#|/|\./|\.\./|[\w.-]+(?:[/?#]|$))", re.IGNORECASE)
+
+TOC_LEVELS = (2, 3)
+DOCUMENT_FENCES = ("```markdown", "```md")
+MAX_PREAMBLE_LINES = 2
+
+
+@dataclass
+class RenderedPost:
+    """Rendered HTML fragment plus the headings for a table of contents."""
+
+    html: str
+    toc: List[Dict] = field(default_factory=list)
+
+    def toc_html(self) -> str:
+        """Nested <nav> list of the h2/h3 headings ("" when there are none)."""
+        if not self.toc:
+            return ""
+        parts = ['<nav class="post-toc"><h3>Contents</h3><ul>']
+        item_open = sub_open = False
+        for entry in self.toc:
+            link = f'<a href="#{entry["id"]}">{html.escape(entry["text"])}</a>'
+            if entry["level"] == TOC_LEVELS[0]:
+                if sub_open:
+                    parts.append("</ul>")
+                    sub_open = False
+                if item_open:
+                    parts.append("</li>")
+                parts.append(f"<li>{link}")
+                item_open = True
+                continue
+            # Subheadings nest inside the preceding h2's item
+            if not item_open:
+                parts.append("<li>")
+                item_open = True
+            if not sub_open:
+                parts.append("<ul>")
+                sub_open = True
+            parts.append(f"<li>{link}</li>")
+        if sub_open:
+            parts.append("</ul>")
+        if item_open:
+            parts.append("</li>")
+        parts.append("</ul></nav>")
+        return "".join(parts)
+
+
+def safe_url(url: str) -> str:
+    """Return ``url`` if it uses an allowed scheme, else "#" (blocks javascript: etc.)."""
+    url = url.strip()
+    # Browsers ignore embedded whitespace/control characters in schemes ("java\tscript:")
+    compact = re.sub(r"[\x00-\x20]", "", url)
+    return url if SAFE_URL_RE.match(compact) else "#"
+
+
+def unwrap_document_fence(lines: List[str]) -> List[str]:
+    """Drop a ```markdown fence wrapped around the whole document (a common LLM artifact)."""
+    content = [n for n, line in enumerate(lines) if line.strip()]
+    if len(content) < 2 or lines[content[-1]].strip() != "```":
+        return lines
+    # The fence may follow a short preamble ("Sure, here's the expanded post:")
+    for n in content[:MAX_PREAMBLE_LINES + 1]:
+        if lines[n].strip().lower() in DOCUMENT_FENCES:
+            return lines[:n] + lines[n + 1:content[-1]]
+    return lines
+
+
+class MarkdownRenderer:
+    """Render one Markdown document; create a fresh instance per document."""
+
+    def __init__(self):
+        self._slugs: Dict[str, int] = {}
+        self._toc: List[Dict] = []
+
+    def render(self, markdown: str) -> RenderedPost:
+        markdown = markdown.replace("\x00", "").replace("\r\n", "\n").replace("\t", "    ")
+        lines = unwrap_document_fence(markdown.split("\n"))
+        return RenderedPost(html=self._blocks(lines, top_level=True), toc=self._toc)
+
+    # ---- Block level ----
+
+    def _blocks(self, lines: List[str], top_level: bool = False) -> str:
+        out: List[str] = []
+        paragraph: List[str] = []
+
+        def flush():
+            if paragraph:
+                out.append(f"<p>{self._inline_lines(paragraph)}</p>")
+                paragraph.clear()
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            if not stripped:
+                flush()
+                i += 1
+                continue
+
+            fence = FENCE_RE.match(line)
+            if fence:
+                flush()
+                marker = fence.group(2)
+                lang = fence.group(3)
+                i += 1
+                code = []
+                while i < len(lines) and not lines[i].strip().startswith(marker):
+                    code.append(lines[i])
+                    i += 1
+                i += 1  # closing fence (or end of document)
+                cls = f' class="language-{html.escape(lang)}"' if lang else ""
+                out.append(f"<pre><code{cls}>{html.escape(chr(10).join(code))}</code></pre>")
+                continue
+
+            heading = HEADING_RE.match(line)
+            if heading:
+                flush()
+                out.append(self._heading(len(heading.group(1)), heading.group(2), top_level))
+                i += 1
+                continue
+
+            if RULE_RE.match(line):
+                flush()
+                out.append("<hr>")
+                i += 1
+                continue
+
+            if QUOTE_RE.match(line):
+                flush()
+                quoted = []
+                while i < len(lines) and lines[i].strip() and QUOTE_RE.match(lines[i]):
+                    quoted.append(QUOTE_RE.sub("", lines[i], count=1))
+                    i += 1
+                out.append(f"<blockquote>{self._blocks(quoted)}</blockquote>")
+                continue
+
+            item = LIST_ITEM_RE.match(line)
+            # Bullets and lists starting at 1 may interrupt a paragraph ("**TL;DR**" then "- ...")
+            if item and (not paragraph or item.group(2)[0] in "-*+" or item.group(2)[:-1] == "1"):
+                flush()
+                i = self._list(lines, i, out)
+                continue
+
+            if "|" in line and i + 1 < len(lines) and TABLE_SEPARATOR_RE.match(lines[i + 1]) and "-" in lines[i + 1]:
+                flush()
+                i = self._table(lines, i, out)
+                continue
+
+            paragraph.append(line)
+            i += 1
+
+        flush()
+        return "\n".join(out)
+
+    def _heading(self, level: int, text: str, top_level: bool) -> str:
+        plain = self._plain_text(text)
+        slug = self._slugify(plain)
+        if top_level and level in TOC_LEVELS:
+            self._toc.append({"level": level, "id": slug, "text": plain})
+        return f'<h{level} id="{slug}">{self._inline(text)}</h{level}>'
+
+    def _list(self, lines: List[str], i: int, out: List[str]) -> int:
+        """Render the list starting at ``lines[i]``; return the index after it."""
+        first = LIST_ITEM_RE.match(lines[i])
+        indent = len(first.group(1))
+        ordered = first.group(2)[0].isdigit()
+        items: List[List[str]] = []
+        loose = False
+
+        while i < len(lines):
+            line = lines[i]
+            match = LIST_ITEM_RE.match(line)
+            if match and len(match.group(1)) == indent and match.group(2)[0].isdigit() == ordered:
+                items.append([match.group(3)])
+                i += 1
+                continue
+            if not line.strip():
+                # A blank line continues the list only if indented content follows
+                nxt = next((l for l in lines[i + 1:] if l.strip()), None)
+                if nxt is None or len(nxt) - len(nxt.lstrip()) <= indent:
+                    same_list = nxt is not None and LIST_ITEM_RE.match(nxt)
+                    if not (same_list and len(same_list.group(1)) == indent):
+                        break
+                loose = True
+                items[-1].append("")
+                i += 1
+                continue
+            if len(line) - len(line.lstrip()) > indent:
+                # Continuation or nested block: strip up to the item's content indent
+                items[-1].append(line[indent + 2:] if line[:indent + 2].strip() == "" else line.lstrip())
+                i += 1
+                continue
+            if LIST_ITEM_RE.match(line) or HEADING_RE.match(line) or FENCE_RE.match(line):
+                break
+            items[-1].append(line)  # lazy paragraph continuation
+            i += 1
+
+        tag = "ol" if ordered else "ul"
+        start = ""
+        if ordered:
+            number = int(first.group(2)[:-1])
+            start = f' start="{number}"' if number != 1 else ""
+        rendered = []
+        for item in items:
+            body = self._blocks(item)
+            if not loose and body.startswith("<p>"):
+                # Tight list: unwrap the item's leading paragraph
+                head, sep, rest = body.partition("</p>")
+                body = head[3:] + ("\n" + rest.lstrip("\n") if rest.strip() else "")
+            rendered.append(f"<li>{body}</li>")
+        out.append(f"<{tag}{start}>\n" + "\n".join(rendered) + f"\n</{tag}>")
+        return i
+
+    def _table(self, lines: List[str], i: int, out: List[str]) -> int:
+        header = self._cells(lines[i])
+        aligns = []
+        for cell in self._cells(lines[i + 1]):
+            cell = cell.strip()
+            if cell.startswith(":") and cell.endswith(":"):
+                aligns.append("center")
+            elif cell.endswith(":"):
+                aligns.append("right")
+            elif cell.startswith(":"):
+                aligns.append("left")
+            else:
+                aligns.append("")
+        i += 2
+        rows = []
+        while i < len(lines) and "|" in lines[i] and lines[i].strip():
+            rows.append(self._cells(lines[i]))
+            i += 1
+
+        def row_html(cells: List[str], tag: str) -> str:
+            parts = []
+            for col in range(len(header)):
+                text = cells[col] if col < len(cells) else ""
+                align = aligns[col] if col < len(aligns) and aligns[col] else ""
+                style = f' style="text-align:{align}"' if align else ""
+                parts.append(f"<{tag}{style}>{self._inline(text.strip())}</{tag}>")
+            return "<tr>" + "".join(parts) + "</tr>"
+
+        body = "".join(row_html(r, "td") for r in rows)
+        out.append(
+            f"<table><thead>{row_html(header, 'th')}</thead>"
+            + (f"<tbody>{body}</tbody>" if body else "")
+            + "</table>"
+        )
+        return i
+
+    @staticmethod
+    def _cells(line: str) -> List[str]:
+        line = line.strip()
+        if line.startswith("|"):
+            line = line[1:]
+        if line.endswith("|") and not line.endswith("\\|"):
+            line = line[:-1]
+        return [c.replace("\\|", "|") for c in re.split(r"(?<!\\)\|", line)]
+
+    # ---- Inline level ----
+
+    def _inline_lines(self, lines: List[str]) -> str:
+        rendered = []
+        for n, line in enumerate(lines):
+            hard_break = line.endswith("  ") and n < len(lines) - 1
+            rendered.append(self._inline(line.strip()) + ("<br>" if hard_break else ""))
+        return "\n".join(rendered)
+
+    def _inline(self, text: str) -> str:
+        """Render inline Markdown; every piece of source text is escaped exactly once."""
+        stash: List[str] = []
+
+        def keep(fragment: str) -> str:
+            stash.append(fragment)
+            return f"\x00{len(stash) - 1}\x00"
+
+        text = CODE_SPAN_RE.sub(lambda m: keep(f"<code>{html.escape(m.group(2).strip())}</code>"), text)
+        text = IMAGE_RE.sub(lambda m: keep(self._image(m)), text)
+        text = LINK_RE.sub(lambda m: keep(self._link(m)), text)
+        text = AUTOLINK_RE.sub(lambda m: keep(self._anchor(m.group(1), html.escape(m.group(1)))), text)
+
+        text = html.escape(text, quote=False)
+        text = STRONG_RE.sub(r"<strong>\2</strong>", text)
+        text = EM_RE.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+        text = STRIKE_RE.sub(r"<del>\1</del>", text)
+
+        # Placeholders can nest (a link around inline code), so restore until stable
+        while PLACEHOLDER_RE.search(text):
+            text = PLACEHOLDER_RE.sub(lambda m: stash[int(m.group(1))], text)
+        return text
+
+    def _link(self, match: re.Match) -> str:
+        return self._anchor(match.group(2), self._inline(match.group(1)), match.group(3))
+
+    @staticmethod
+    def _anchor(url: str, label_html: str, title: str = None) -> str:
+        url = safe_url(url)
+        attrs = f' href="{html.escape(url)}"'
+        if title:
+            attrs += f' title="{html.escape(title)}"'
+        if url.lower().startswith(("http:", "https:")):
+            attrs += ' rel="noopener noreferrer" target="_blank"'
+        return f"<a{attrs}>{label_html}</a>"
+
+    @staticmethod
+    def _image(match: re.Match) -> str:
+        url = safe_url(match.group(2))
+        title = f' title="{html.escape(match.group(3))}"' if match.group(3) else ""
+        return f'<img src="{html.escape(url)}" alt="{html.escape(match.group(1))}"{title} loading="lazy">'
+
+    def _plain_text(self, text: str) -> str:
+        """Heading text without Markdown syntax, for TOC labels and slugs."""
+        text = CODE_SPAN_RE.sub(lambda m: m.group(2), text)
+        text = IMAGE_RE.sub(lambda m: m.group(1), text)
+        text = LINK_RE.sub(lambda m: m.group(1), text)
+        return re.sub(r"[*_~]", "", text).strip()
+
+    def _slugify(self, text: str) -> str:
+        slug = re.sub(r"\s+", "-", SLUG_STRIP_RE.sub("", text.lower()).strip()) or "section"
+        count = self._slugs.get(slug, 0)
+        self._slugs[slug] = count + 1
+        return slug if count == 0 else f"{slug}-{count + 1}"
+
+
+def render_markdown(markdown: str) -> RenderedPost:
+    """Render a Markdown document to a sanitized HTML fragment and its TOC."""
+    return MarkdownRenderer().render(markdown)
@@ -16,6 +16,9 @@ from pathlib import Path
 import requests
 import feedparser
 
+from topic_clusterer import TopicClusterer
+from tracing import add as trace_add, span
+
 logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path(__file__).parent.parent / "config"
@@ -31,6 +34,7 @@ class NewsItem:
     published_at: Optional[str] = None
     keywords: List[str] = field(default_factory=list)
     raw_data: Dict = field(default_factory=dict)
+    cluster_id: Optional[int] = None  # Set by TopicClusterer
 
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -120,6 +124,7 @@ class HackerNewsFetcher:
     def fetch(self) -> List[NewsItem]:
         try:
             resp = self.session.get(f"{self.base_url}/topstories.json", timeout=10)
+            trace_add(bytes=len(resp.content))
             resp.raise_for_status()
             story_ids = resp.json()[: self.config.get("max_stories", 30)]
         except Exception as e:
@@ -132,6 +137,7 @@ class HackerNewsFetcher:
         for story_id in story_ids:
             try:
                 resp = self.session.get(f"{self.base_url}/item/{story_id}.json", timeout=10)
+                trace_add(bytes=len(resp.content))
                 resp.raise_for_status()
                 story = resp.json()
             except Exception:
@@ -254,6 +260,7 @@ class ArxivFetcher:
             # ArXiv API requires the query string to be passed directly (not URL-encoded by requests)
             url = f"{self.base_url}?search_query={cat_query}&sortBy=submittedDate&sortOrder=descending&max_results={max_results}"
             resp = requests.get(url, timeout=15)
+            trace_add(bytes=len(resp.content))
             resp.raise_for_status()
         except Exception as e:
             logger.error(f"[ArXiv] API call failed: {e}")
@@ -309,6 +316,7 @@ class GoogleNewsFetcher:
                     },
                     timeout=10,
                 )
+                trace_add(bytes=len(resp.content))
                 resp.raise_for_status()
                 data = resp.json()
 
@@ -464,6 +472,7 @@ class NewsAggregator:
                 logger.info(f"[{name}] Disabled in config, skipping")
 
         self.ranker = TopicRanker()
+        self.clusterer = TopicClusterer()
 
     def fetch_all(self) -> List[NewsItem]:
         """Fetch from all enabled sources. Each source fails independently."""
@@ -471,7 +480,9 @@ class NewsAggregator:
 
         for name, fetcher in self.fetchers.items():
             try:
-                items = fetcher.fetch()
+                with span(f"fetch.{name}") as s:
+                    items = fetcher.fetch()
+                    s.set(items=len(items))
                 logger.info(f"[{name}] Fetched {len(items)} items")
                 all_items.extend(items)
             except Exception as e:
@@ -485,11 +496,14 @@ class NewsAggregator:
         """Returns primary topic + backup topics."""
         items = self.fetch_all()
         ranked = self.ranker.rank(items)
+        # Group every ranked item into stories; the primary's story supplies related context
+        clusters = self.clusterer.cluster(ranked)
 
         result = {
             "primary": ranked[0] if ranked else None,
             "backups": ranked[1:top_n] if len(ranked) > 1 else [],
             "all_ranked": ranked[:top_n],
+            "clusters": clusters,
             "total_fetched": len(items),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
@@ -0,0 +1,205 @@
+"""
+Notification Outbox - Persisted, coalescing queue drained by a background worker.
+
+Messages are appended to a JSON file before anything is sent, so a
+notification that cannot be delivered during this run (network down, API
+errors, process exit) is delivered on the next one. A daemon thread drains
+the queue: whatever is pending when it wakes up is joined into one message
+(up to the size limit), failed sends back off exponentially with jitter,
+and messages queued during a backoff ride along with the retry.
+"""
+
+import json
+import time
+import uuid
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_VERSION = 1
+SEPARATOR = "\n\n➖➖➖\n\n"
+
+
+class NotificationOutbox:
+    """File-backed outbox with a background sender."""
+
+    def __init__(
+        self,
+        path: Path,
+        send: Callable[[str], None],
+        max_length: int = 4096,
+        coalesce_window: float = 0.5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_attempts: int = 10,
+        retry_hint: Optional[Callable[[Exception], Optional[float]]] = None,
+    ):
+        """
+        Args:
+            path: JSON file holding undelivered messages.
+            send: Delivers one (possibly coalesced) message; raises on failure.
+            max_length: Upper bound for a coalesced message.
+            coalesce_window: Seconds to wait for companions before sending.
+            base_delay / max_delay: Exponential backoff bounds between attempts.
+            max_attempts: Attempts (across runs) before a message is dropped.
+            retry_hint: Optional server-requested wait for a send error.
+        """
+        self.path = Path(path)
+        self._send = send
+        self.max_length = max_length
+        self.coalesce_window = coalesce_window
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._retry_hint = retry_hint
+
+        self._cond = threading.Condition()
+        self._messages: List[Dict] = self._load()
+        self._closing = False
+        self._deadline: Optional[float] = None  # Set by close(): monotonic time to give up
+        self._worker: Optional[threading.Thread] = None
+        if self._messages:
+            logger.info(f"Outbox has {len(self._messages)} undelivered message(s) from earlier runs")
+            self._start()
+
+    # ---- Persistence ----
+
+    def _load(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Outbox unreadable, starting empty: {e}")
+            return []
+        return data.get("messages", []) if data.get("version") == OUTBOX_VERSION else []
+
+    def _save(self) -> None:
+        """Persist pending messages (caller holds the lock)."""
+        if not self._messages:
+            if self.path.exists():
+                self.path.unlink()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps({"version": OUTBOX_VERSION, "messages": self._messages}, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+    # ---- Producer side ----
+
+    def put(self, text: str, kind: str = "info") -> None:
+        """Queue a message; returns immediately."""
+        message = {
+            "id": uuid.uuid4().hex[:12],
+            "kind": kind,
+            "text": text[: self.max_length],
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "attempts": 0,
+        }
+        with self._cond:
+            self._messages.append(message)
+            self._save()
+            self._cond.notify()
+        self._start()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._messages)
+
+    def close(self, timeout: float = 10.0) -> int:
+        """
+        Give the worker up to ``timeout`` seconds to deliver what is queued.
+
+        Returns the number of messages left for the next run.
+        """
+        with self._cond:
+            self._closing = True
+            self._deadline = time.monotonic() + timeout
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout + 1)
+        left = self.pending
+        if left:
+            logger.warning(f"{left} notification(s) kept in {self.path} for the next run")
+        return left
+
+    # ---- Worker ----
+
+    def _start(self) -> None:
+        with self._cond:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="notification-outbox", daemon=True)
+                self._worker.start()
+
+    def _take_batch(self) -> List[Dict]:
+        """Oldest messages that fit into one coalesced message (caller holds the lock)."""
+        batch, length = [], 0
+        for message in self._messages:
+            extra = len(message["text"]) + (len(SEPARATOR) if batch else 0)
+            if batch and length + extra > self.max_length:
+                break
+            batch.append(message)
+            length += extra
+        return batch
+
+    def _sleep(self, seconds: float) -> None:
+        """Wait ``seconds`` (caller holds the lock); new messages don't cut it short, close() may."""
+        until = time.monotonic() + seconds
+        while True:
+            if self._deadline is not None:
+                until = min(until, self._deadline)
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return
+            self._cond.wait(remaining)
+
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._messages and not self._closing:
+                    self._cond.wait()
+                if not self._messages:
+                    return
+                # Let companions (e.g. an error right after a draft summary) arrive
+                if not self._closing:
+                    self._sleep(self.coalesce_window)
+                batch = self._take_batch()
+
+            text = SEPARATOR.join(m["text"] for m in batch)
+            try:
+                self._send(text)
+            except Exception as e:
+                failures += 1
+                with self._cond:
+                    for message in batch:
+                        message["attempts"] += 1
+                    dropped = [m for m in batch if m["attempts"] >= self.max_attempts]
+                    for message in dropped:
+                        self._messages.remove(message)
+                    self._save()
+                    if dropped:
+                        logger.error(f"Dropping {len(dropped)} notification(s) after {self.max_attempts} attempts")
+                    wait = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** failures))
+                    hinted = self._retry_hint(e) if self._retry_hint else None
+                    if hinted is not None:
+                        wait = max(wait, hinted)
+                    if self._deadline is not None and time.monotonic() + wait >= self._deadline:
+                        logger.warning(f"Notification send failed ({e}), no time left to retry this run")
+                        return
+                    logger.warning(f"Notification send failed ({e}), retrying in {wait:.1f}s")
+                    self._sleep(wait)
+                continue
+
+            failures = 0
+            sent = {m["id"] for m in batch}
+            with self._cond:
+                self._messages = [m for m in self._messages if m["id"] not in sent]
+                self._save()
+            logger.info(f"Notification sent ({len(batch)} message(s) coalesced)")
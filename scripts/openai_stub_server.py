@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+OpenAI Stub Server - Local stand-in for the Chat Completions API.
+
+Answers POST /v1/chat/completions with a synthetic Markdown post (H2
+sections, a "Key Takeaways" and a "Conclusion", about ``words`` words),
+either as one JSON response or, with stream=true, as server-sent chunks
+ending in a usage chunk (stream_options.include_usage) and [DONE]. It can
+be told to fail the next N requests with a given status; 429 includes a
+Retry-After header, like OpenAI's rate limit responses. Point the
+generator at it with OPENAI_BASE_URL.
+
+Usage:
+    python scripts/openai_stub_server.py --port 8082 --fail 2 --status 429 --retry-after 1
+    OPENAI_BASE_URL=http://127.0.0.1:8082/v1 OPENAI_API_KEY=x python scripts/main.py --stream
+
+In code:
+    with OpenAIStubServer(fail=1, status=429) as stub:
+        os.environ["OPENAI_BASE_URL"] = stub.url
+        ...
+        stub.requests  # every request body received
+"""
+
+import json
+import time
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("Introduction", "Background", "Technical Deep Dive", "Practical Applications",
+            "Challenges", "Key Takeaways", "Conclusion")
+
+
+def synthetic_post(words: int) -> str:
+    """Markdown body of about ``words`` words spread over SECTIONS."""
+    per_section = max(1, words // len(SECTIONS))
+    sentence = "The stub model writes one more plain sentence about the topic."
+    parts = []
+    for section in SECTIONS:
+        body = []
+        while len(body) < per_section:
+            body.extend(sentence.split())
+        parts.append(f"## {section}\n\n{' '.join(body[:per_section])}\n")
+    return "\n".join(parts)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "OpenAIStubServer"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._error(400, "invalid_request_error", "Invalid JSON body")
+
+        stub = self.server
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._error(404, "invalid_request_error", f"Unknown path {self.path}")
+
+        with stub.lock:
+            stub.requests.append(payload)
+            if stub.fail > 0:
+                stub.fail -= 1
+                headers = {"Retry-After": f"{stub.retry_after:g}"} if stub.status == 429 else {}
+                return self._error(stub.status, "requests", "Stub failure", headers)
+
+        model = payload.get("model", "stub")
+        content = synthetic_post(stub.words)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in payload.get("messages", [])) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+        }
+        logger.info(f"chat.completions ({'stream' if payload.get('stream') else 'json'}): {len(content.split())} words")
+
+        if not payload.get("stream"):
+            return self._reply(200, {
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        include_usage = (payload.get("stream_options") or {}).get("include_usage", False)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for chunk in self._chunks(model, content, usage if include_usage else None):
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(stub.chunk_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Client closed the stream early")
+
+    def _chunks(self, model: str, content: str, usage) -> Iterator[Dict]:
+        base = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+        words = content.split(" ")
+        size = self.server.chunk_words
+        for i in range(0, len(words), size):
+            text = " ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+            yield dict(base, choices=[{"index": 0, "delta": {"content": text}, "finish_reason": None}])
+        yield dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage:
+            yield dict(base, choices=[], usage=usage)
+
+    def _error(self, status: int, kind: str, message: str, headers: Dict = None) -> None:
+        self._reply(status, {"error": {"message": message, "type": kind, "param": None, "code": None}}, headers)
+
+    def _reply(self, status: int, body: Dict, headers: Dict = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class OpenAIStubServer(ThreadingHTTPServer):
+    """Chat Completions stub; use as a context manager to run it on a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, fail: int = 0, status: int = 429,
+                 retry_after: float = 1, words: int = 4000, chunk_words: int = 20, chunk_delay: float = 0.0):
+        super().__init__((host, port), _Handler)
+        self.lock = threading.Lock()
+        self.fail = fail
+        self.status = status
+        self.retry_after = retry_after
+        self.words = words
+        self.chunk_words = chunk_words
+        self.chunk_delay = chunk_delay
+        self.requests: List[Dict] = []  # Every request body received
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL for the OpenAI client (OPENAI_BASE_URL)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "OpenAIStubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI Chat Completions stub")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--fail", type=int, default=0, help="Fail this many requests first")
+    parser.add_argument("--status", type=int, default=429, help="Status for failed requests (429 adds Retry-After)")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--words", type=int, default=4000, help="Words per completion")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    server = OpenAIStubServer(port=args.port, fail=args.fail, status=args.status, retry_after=args.retry_after,
+                              words=args.words, chunk_delay=args.chunk_delay)
+    logger.info(f"OpenAI stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,293 @@
+"""
+Phase Executor - Runs pipeline phases as a dependency graph.
+
+Each phase declares the context keys it reads (inputs) and writes
+(outputs); a phase starts as soon as every phase producing its inputs has
+finished, so independent phases run concurrently, each on its own daemon
+thread. Phases get a timeout and a failure policy:
+
+  abort     the run stops and the error is raised to the caller
+  continue  the failure is recorded; phases needing its outputs are skipped
+
+``after`` adds ordering without a data dependency: the phase waits for the
+named phases but still runs if they failed or were skipped. A timed-out
+phase's thread cannot be killed; it is abandoned and its outputs ignored.
+Long-running phase code should call phase_time_left() (or
+check_phase_deadline()) before starting more work, such as another API
+retry, so an abandoned thread stops soon after its phase expired.
+
+With a checkpoint (see run_checkpoint), each successful phase's outputs
+are saved, and phases that already have saved outputs are restored
+("resumed") instead of run. With a profiler (see profiling), each phase is
+profiled on its own thread.
+"""
+
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tracing import record, span
+
+logger = logging.getLogger(__name__)
+
+ABORT = "abort"
+CONTINUE = "continue"
+
+# Monotonic deadline of the phase running in this thread (None = no timeout)
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("phase_deadline", default=None)
+
+
+class PhaseExpired(TimeoutError):
+    """Raised inside a phase thread whose phase already timed out."""
+
+
+def phase_time_left() -> Optional[float]:
+    """Seconds until the current phase times out (<= 0 once expired), or None without a timeout."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_phase_deadline() -> None:
+    """Raise PhaseExpired if the current phase has timed out."""
+    left = phase_time_left()
+    if left is not None and left <= 0:
+        raise PhaseExpired("phase timed out; stopping its remaining work")
+
+
+class PhaseError(RuntimeError):
+    """A phase with the abort policy failed or timed out."""
+
+    def __init__(self, phase: str, cause: BaseException):
+        super().__init__(f"Phase '{phase}' failed: {cause}")
+        self.phase = phase
+        self.cause = cause
+
+
+@dataclass
+class Phase:
+    name: str
+    func: Callable[[Dict], Optional[Dict]]  # Gets the run context, returns {output: value}
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()
+    timeout: Optional[float] = None  # Seconds; None = no limit
+    on_failure: str = ABORT
+
+
+@dataclass
+class PhaseResult:
+    name: str
+    status: str = "pending"  # ok | resumed | failed | timeout | skipped
+    seconds: float = 0.0
+    error: Optional[str] = None
+    started: float = field(default=0.0, repr=False)
+
+
+DONE = ("ok", "resumed")
+
+
+class PhaseExecutor:
+    """Schedule phases by their declared inputs and outputs."""
+
+    def __init__(self, phases: List[Phase], checkpoint=None, profiler=None):
+        """
+        Args:
+            phases: Phases to run; output keys must be unique.
+            checkpoint: Optional object with load(name) -> outputs | None and
+                save(name, outputs, seconds), e.g. a RunCheckpoint.
+            profiler: Optional PhaseProfiler; each phase runs inside profiler.profile(name).
+        """
+        self.phases = {p.name: p for p in phases}
+        self.checkpoint = checkpoint
+        self.profiler = profiler
+        self.results: Dict[str, PhaseResult] = {p.name: PhaseResult(p.name) for p in phases}
+        self._deps = self._dependencies()
+
+    def _dependencies(self) -> Dict[str, Tuple[set, set]]:
+        """phase -> (data dependencies, ordering-only dependencies)."""
+        producers: Dict[str, str] = {}
+        for phase in self.phases.values():
+            for key in phase.outputs:
+                if key in producers:
+                    raise ValueError(f"'{key}' is produced by both {producers[key]} and {phase.name}")
+                producers[key] = phase.name
+
+        deps = {}
+        for phase in self.phases.values():
+            data = {producers[key] for key in phase.inputs if key in producers}
+            order = set(phase.after) - data
+            unknown = order - self.phases.keys()
+            if unknown:
+                raise ValueError(f"{phase.name} runs after unknown phase(s): {sorted(unknown)}")
+            deps[phase.name] = (data, order)
+
+        # Reject cycles up front (Kahn's algorithm)
+        remaining = {name: set(data | order) for name, (data, order) in deps.items()}
+        while remaining:
+            ready = [name for name, waits in remaining.items() if not waits]
+            if not ready:
+                raise ValueError(f"Phase dependency cycle among: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for waits in remaining.values():
+                waits.difference_update(ready)
+        return deps
+
+    def run(self, context: Dict) -> Dict:
+        """Run every phase; returns the context with all produced outputs."""
+        for phase in self.phases.values():
+            missing = [k for k in phase.inputs if k not in context and not any(
+                k in p.outputs for p in self.phases.values())]
+            if missing:
+                raise ValueError(f"{phase.name} needs {missing}, which nothing provides")
+
+        running: Dict[Future, str] = {}
+        while True:
+            self._skip_blocked()
+            ready = self._ready()
+            for name in ready:
+                if not self._restore(name, context):
+                    running[self._submit(name, context)] = name
+            if not running:
+                if ready:
+                    continue  # All restored; their dependents may be ready now
+                return context
+
+            done, _ = wait(running, timeout=self._next_deadline(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                self._finish(running.pop(future), future, context)
+            self._expire(running)
+
+    def _ready(self) -> List[str]:
+        ready = []
+        for name, (data, order) in self._deps.items():
+            if self.results[name].status != "pending":
+                continue
+            if all(self.results[d].status in DONE for d in data) and all(
+                self.results[d].status not in ("pending", "running") for d in order
+            ):
+                ready.append(name)
+        return ready
+
+    def _skip_blocked(self) -> None:
+        """Skip pending phases whose data dependencies failed (repeat until stable)."""
+        changed = True
+        while changed:
+            changed = False
+            for name, (data, _) in self._deps.items():
+                result = self.results[name]
+                if result.status != "pending":
+                    continue
+                failed = [d for d in data if self.results[d].status in ("failed", "timeout", "skipped")]
+                if failed:
+                    result.status = "skipped"
+                    result.error = f"needs {', '.join(sorted(failed))}"
+                    logger.warning(f"Skipping phase '{name}' ({result.error})")
+                    changed = True
+
+    def _restore(self, name: str, context: Dict) -> bool:
+        """Take the phase's outputs from the checkpoint, if it has them."""
+        if self.checkpoint is None:
+            return False
+        outputs = self.checkpoint.load(name)
+        if outputs is None or any(key not in outputs for key in self.phases[name].outputs):
+            return False
+        context.update({key: outputs[key] for key in self.phases[name].outputs})
+        self.results[name].status = "resumed"
+        record(f"phase.{name}", 0.0, cache_hits=1)
+        logger.info(f"Phase '{name}' restored from checkpoint")
+        return True
+
+    def _submit(self, name: str, context: Dict) -> Future:
+        phase = self.phases[name]
+        result = self.results[name]
+        result.status = "running"
+        result.started = time.monotonic()
+        logger.info(f"\n--- Phase: {name} ---")
+        inputs = {key: context[key] for key in phase.inputs}
+        future: Future = Future()
+
+        def target():
+            if not future.set_running_or_notify_cancel():
+                return
+            if phase.timeout is not None:
+                _deadline.set(result.started + phase.timeout)
+            # Resolve the future only after the span and profile are written: the
+            # main thread may end the run (and the process) as soon as it resolves
+            try:
+                with span(f"phase.{name}"), self._profile(name):
+                    outputs = phase.func(inputs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(outputs)
+
+        # Daemon threads, so an abandoned (timed-out) phase never blocks interpreter exit;
+        # the copied context makes the phase span a child of the caller's span
+        context_copy = contextvars.copy_context()
+        threading.Thread(target=context_copy.run, args=(target,), name=f"phase-{name}", daemon=True).start()
+        return future
+
+    def _profile(self, name: str):
+        return self.profiler.profile(name) if self.profiler is not None else nullcontext()
+
+    def _finish(self, name: str, future: Future, context: Dict) -> None:
+        phase = self.phases[name]
+        result = self.results[name]
+        result.seconds = time.monotonic() - result.started
+        try:
+            outputs = future.result() or {}
+            missing = [key for key in phase.outputs if key not in outputs]
+            if missing:
+                raise RuntimeError(f"did not produce {missing}")
+        except Exception as e:
+            self._fail(name, "failed", e)
+            return
+        outputs = {key: outputs[key] for key in phase.outputs}
+        context.update(outputs)
+        result.status = "ok"
+        logger.info(f"Phase '{name}' done in {result.seconds:.1f}s")
+        if self.checkpoint is not None:
+            try:
+                self.checkpoint.save(name, outputs, result.seconds)
+            except (OSError, TypeError) as e:
+                logger.warning(f"Checkpoint for '{name}' not saved: {e}")
+
+    def _next_deadline(self, running: Dict[Future, str]) -> Optional[float]:
+        now = time.monotonic()
+        remaining = [
+            self.results[name].started + self.phases[name].timeout - now
+            for name in running.values()
+            if self.phases[name].timeout is not None
+        ]
+        return max(0.0, min(remaining)) if remaining else None
+
+    def _expire(self, running: Dict[Future, str]) -> None:
+        now = time.monotonic()
+        for future, name in list(running.items()):
+            phase = self.phases[name]
+            if phase.timeout is not None and now - self.results[name].started >= phase.timeout:
+                del running[future]
+                self.results[name].seconds = now - self.results[name].started
+                self._fail(name, "timeout", TimeoutError(f"timed out after {phase.timeout:g}s"))
+
+    def _fail(self, name: str, status: str, error: BaseException) -> None:
+        result = self.results[name]
+        result.status = status
+        result.error = str(error)
+        if self.phases[name].on_failure == ABORT:
+            logger.error(f"Phase '{name}' {status}: {error}")
+            raise PhaseError(name, error) from error
+        logger.warning(f"Phase '{name}' {status} (continuing): {error}")
+
+    def summary(self) -> List[str]:
+        """One line per phase: name, status and wall time."""
+        return [
+            f"  {r.name:<12} {r.status:<8} {r.seconds:>7.1f}s" + (f"  ({r.error})" if r.error else "")
+            for r in self.results.values()
+        ]
@@ -0,0 +1,228 @@
+"""
+Post Catalog - SQLite index of every draft for stats, listings and lookbacks.
+
+One row per post (date, slug, title, keywords, word count, SEO score,
+status, content hash) with indexes on date and status. save_draft() records
+new posts as they are written and DashboardBuilder reconciles the catalog
+against drafts/ on every build, so it never drifts from the files on disk.
+The catalog is derived data: it is gitignored, cached between CI runs and
+rebuilt from drafts/ (sync_drafts) when missing or stale.
+"""
+
+import json
+import sqlite3
+import hashlib
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+CATALOG_NAME = "catalog.sqlite3"
+DEFAULT_CATALOG = ROOT_DIR / "drafts" / CATALOG_NAME
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    filename         TEXT PRIMARY KEY,
+    date             TEXT NOT NULL,
+    slug             TEXT NOT NULL,
+    title            TEXT NOT NULL,
+    keywords         TEXT NOT NULL DEFAULT '[]',
+    word_count       INTEGER NOT NULL DEFAULT 0,
+    seo_score        INTEGER NOT NULL DEFAULT 0,
+    status           TEXT NOT NULL DEFAULT 'draft',
+    meta_description TEXT NOT NULL DEFAULT '',
+    content_hash     TEXT NOT NULL,
+    updated_at       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_date ON posts (date, filename);
+CREATE INDEX IF NOT EXISTS idx_posts_status ON posts (status, date);
+"""
+
+POST_COLUMNS = ("filename", "date", "title", "slug", "word_count", "seo_score", "status", "keywords", "meta_description")
+# Listing order used everywhere: newest first, filename breaks same-day ties
+LISTING_ORDER = "ORDER BY date DESC, filename DESC"
+
+
+def content_hash(content: str) -> str:
+    """Hash used for change detection (matches the dashboard build manifest)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class PostCatalog:
+    """SQLite-backed catalog of posts."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_CATALOG
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._migrate()
+
+    def __enter__(self) -> "PostCatalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # The catalog is derived from drafts/, so an unknown layout is simply rebuilt
+            logger.warning(f"Rebuilding post catalog (schema {version} -> {SCHEMA_VERSION})")
+            self._conn.execute("DROP TABLE IF EXISTS posts")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ---- Writes ----
+
+    def upsert(self, post: Dict, digest: str) -> None:
+        """Insert or replace one post (a dict shaped like posts.json entries)."""
+        self.upsert_many([(post, digest)])
+
+    def upsert_many(self, rows: Iterable[Tuple[Dict, str]]) -> int:
+        now = datetime.now().isoformat(timespec="seconds")
+        params = [
+            (
+                post["filename"], post["date"], post["slug"], post["title"],
+                json.dumps(post.get("keywords", [])), int(post.get("word_count", 0)),
+                int(post.get("seo_score", 0)), post.get("status", "draft"),
+                post.get("meta_description", ""), digest, now,
+            )
+            for post, digest in rows
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO posts (filename, date, slug, title, keywords, word_count, "
+                "seo_score, status, meta_description, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                params,
+            )
+        return len(params)
+
+    def delete(self, filenames: Iterable[str]) -> int:
+        filenames = list(filenames)
+        with self._conn:
+            self._conn.executemany("DELETE FROM posts WHERE filename = ?", [(f,) for f in filenames])
+        return len(filenames)
+
+    def record_draft(self, path: Path) -> Dict:
+        """Parse a draft file and upsert it; returns the catalogued post."""
+        from build_dashboard import build_post  # build_dashboard imports this module
+
+        path = Path(path)
+        content = path.read_text(encoding="utf-8")
+        post, _ = build_post(path, content)
+        self.upsert(post, content_hash(content))
+        return post
+
+    def sync(self, posts: Dict[str, Tuple[Dict, str]]) -> Tuple[int, int]:
+        """
+        Make the catalog match ``{filename: (post, content hash)}`` exactly.
+
+        Only rows whose hash differs are rewritten. Returns (upserted, deleted).
+        """
+        known = self.hashes()
+        changed = [(post, digest) for name, (post, digest) in posts.items() if known.get(name) != digest]
+        removed = known.keys() - posts.keys()
+        upserted = self.upsert_many(changed) if changed else 0
+        deleted = self.delete(removed) if removed else 0
+        if upserted or deleted:
+            logger.info(f"Post catalog synced: {upserted} upserted, {deleted} deleted")
+        return upserted, deleted
+
+    def sync_drafts(self, drafts_dir: Path) -> Tuple[int, int]:
+        """
+        Reconcile with a drafts directory: parses only drafts whose hash changed.
+
+        The catalog is not committed, so this builds it on a fresh checkout and
+        catches up a stale copy restored from the CI cache.
+        """
+        from build_dashboard import build_post
+
+        known = self.hashes()
+        changed, present = [], set()
+        for path in sorted(Path(drafts_dir).glob("*.md")):
+            content = path.read_text(encoding="utf-8")
+            digest = content_hash(content)
+            present.add(path.name)
+            if known.get(path.name) != digest:
+                changed.append((build_post(path, content)[0], digest))
+        removed = known.keys() - present
+        upserted = self.upsert_many(changed) if changed else 0
+        deleted = self.delete(removed) if removed else 0
+        if upserted or deleted:
+            logger.info(f"Post catalog synced with drafts: {upserted} upserted, {deleted} deleted")
+        return upserted, deleted
+
+    # ---- Queries ----
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        return self._conn.execute("SELECT COUNT(*) FROM posts WHERE status = ?", (status,)).fetchone()[0]
+
+    def hashes(self) -> Dict[str, str]:
+        return dict(self._conn.execute("SELECT filename, content_hash FROM posts"))
+
+    def list_posts(self, limit: Optional[int] = None, offset: int = 0, status: Optional[str] = None) -> List[Dict]:
+        """Posts newest first, shaped like posts.json entries."""
+        sql = f"SELECT {', '.join(POST_COLUMNS)} FROM posts"
+        params: list = []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += f" {LISTING_ORDER}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [self._to_post(row) for row in self._conn.execute(sql, params)]
+
+    def posts_since(self, since: date) -> List[Dict]:
+        """Posts dated on or after ``since`` (index range scan on date)."""
+        rows = self._conn.execute(
+            f"SELECT {', '.join(POST_COLUMNS)} FROM posts WHERE date >= ? {LISTING_ORDER}",
+            (since.isoformat(),),
+        )
+        return [self._to_post(row) for row in rows]
+
+    def stats(self, today: Optional[date] = None) -> Dict:
+        """Aggregate dashboard statistics (the same keys as stats.json)."""
+        today = today or date.today()
+        week_start = today - timedelta(days=6)  # Rolling 7 days including today
+        month_start = today.replace(day=1)
+
+        totals = self._conn.execute(
+            "SELECT COUNT(*), AVG(word_count), MAX(date) FROM posts"
+        ).fetchone()
+        avg_seo = self._conn.execute("SELECT AVG(seo_score) FROM posts WHERE seo_score > 0").fetchone()[0]
+        this_week = self._conn.execute(
+            "SELECT COUNT(*) FROM posts WHERE date >= ? AND date <= ?",
+            (week_start.isoformat(), today.isoformat()),
+        ).fetchone()[0]
+        this_month = self._conn.execute(
+            "SELECT COUNT(*) FROM posts WHERE date >= ? AND date <= ?",
+            (month_start.isoformat(), today.isoformat()),
+        ).fetchone()[0]
+
+        return {
+            "total_posts": totals[0],
+            "avg_word_count": round(totals[1]) if totals[1] is not None else 0,
+            "avg_seo_score": round(avg_seo) if avg_seo is not None else 0,
+            "last_generated": totals[2],
+            "posts_this_week": this_week,
+            "posts_this_month": this_month,
+        }
+
+    @staticmethod
+    def _to_post(row: sqlite3.Row) -> Dict:
+        post = dict(row)
+        post["keywords"] = json.loads(post["keywords"])
+        return post
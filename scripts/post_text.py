@@ -0,0 +1,79 @@
+"""
+Post Text - Front matter parsing and search tokenization shared by the
+dashboard build, the similarity index and the SEO tools.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Shared by the search index (mirrored in docs/js/search.js) and the similarity index
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+SEARCH_STRIP_RE = re.compile(r"```[\s\S]*?```|\]\([^)]*\)|https?://\S+")
+SEARCH_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have how if in into is it its "
+    "more not of on or our so than that the their them then there these they this to "
+    "was we were what when where which while who why will with you your".split()
+)
+
+FRONT_MATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+FRONT_MATTER_BLOCK_RE = re.compile(r"^---\n.*?\n---\n*", re.DOTALL)
+
+
+def parse_front_matter(content: str) -> Dict:
+    """Parse YAML-like front matter from markdown (single linear pass)."""
+    metadata = {}
+    match = FRONT_MATTER_RE.match(content)
+    if not match:
+        return metadata
+
+    last_key = None  # Most recently added key; "- item" lines attach to it
+    for line in match.group(1).split("\n"):
+        line = line.strip()
+        if ":" in line and not line.startswith("-"):
+            key, _, value = line.partition(":")
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+
+            # Handle lists (simple single-level)
+            if key in metadata:
+                if isinstance(metadata[key], list):
+                    continue
+            else:
+                last_key = key
+            metadata[key] = value
+        elif line.startswith("- ") and last_key is not None:
+            # Append to last key as list
+            if not isinstance(metadata[last_key], list):
+                metadata[last_key] = []
+            metadata[last_key].append(line[2:].strip())
+
+    return metadata
+
+
+def strip_front_matter(content: str) -> str:
+    """Remove YAML front matter from content."""
+    return FRONT_MATTER_BLOCK_RE.sub("", content, count=1)
+
+
+@lru_cache(maxsize=65536)
+def _search_term(token: str) -> Optional[str]:
+    """Index form of a raw token, or None for tokens that are never indexed."""
+    if len(token) < 2 or token.isdigit() or token in SEARCH_STOPWORDS:
+        return None
+    # Fold regular plurals so "agents" finds "agent"
+    if len(token) > 3:
+        if token.endswith("ies"):
+            return token[:-3] + "y"
+        if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+            return token[:-1]
+    return token
+
+
+def search_tokens(text: str) -> List[str]:
+    """
+    Tokenize text for the search index.
+
+    Mirrored by searchTokens() in docs/js/search.js; keep the two in sync.
+    """
+    return [term for term in map(_search_term, SEARCH_TOKEN_RE.findall(text.lower())) if term]
@@ -0,0 +1,119 @@
+"""
+Profiling - Per-phase cProfile dumps, collapsed stacks and hot-function logs.
+
+    profiler = PhaseProfiler(LOGS_DIR / "profiles" / run_id)
+    with profiler.profile("generate"):
+        ...
+
+For each profiled section this writes, under the output directory:
+
+  <name>.prof       cProfile dump (python -m pstats, snakeviz, ...)
+  <name>.collapsed  sampled stacks, one "a;b;c count" line each, for
+                    flamegraph.pl / speedscope / inferno
+  and logs the top-N functions by own time.
+
+Up to Python 3.11 cProfile only sees the thread that enabled it, so
+profile() must run in the thread doing the work (PhaseExecutor does this
+per phase). From 3.12 cProfile is process-wide: its dump also holds other
+threads' calls, and only one can be active, so a phase overlapping another
+profiled phase gets only the stack sampler. The sampler always follows just
+the profiled thread and covers any number of phases at once.
+"""
+
+import io
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+TOP_N = 15
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format: root-first frames joined by ';', then the sample count."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+class PhaseProfiler:
+    """Profiles named sections into one output directory."""
+
+    def __init__(self, out_dir: Path, top_n: int = TOP_N, interval: float = SAMPLE_INTERVAL):
+        self.out_dir = Path(out_dir)
+        self.top_n = top_n
+        self.interval = interval
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Profile the block (in the current thread) as ``name``."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiled phase is running (Python 3.12+)
+            profiler = None
+            logger.info(f"[Profile] {name}: overlaps another profiled phase, stack samples only")
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+            self._write(name, profiler, sampler, time.perf_counter() - started)
+
+    def _write(self, name: str, profiler, sampler: StackSampler, seconds: float) -> None:
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            (self.out_dir / f"{name}.collapsed").write_text(sampler.collapsed(), encoding="utf-8")
+            lines = [f"[Profile] {name}: {seconds:.2f}s, {sum(sampler.counts.values())} stack samples"]
+            if profiler is not None:
+                profiler.dump_stats(self.out_dir / f"{name}.prof")
+                lines += self.hot_functions(pstats.Stats(profiler, stream=io.StringIO()))
+            lines.append(f"[Profile] {name}: written to {self.out_dir}")
+            logger.info("\n".join(lines))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"[Profile] {name}: could not write profile: {e}")
+
+    def hot_functions(self, stats: pstats.Stats) -> List[str]:
+        """Top-N functions by own time, one log line each."""
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[: self.top_n]
+        lines = [f"  {'own':>9} {'cumulative':>11} {'calls':>9}  function"]
+        for (filename, line, func), (_, calls, own, cumulative, _) in rows:
+            where = f"{Path(filename).name}:{line}" if line else filename
+            lines.append(f"  {own * 1000:7.1f}ms {cumulative * 1000:9.1f}ms {calls:>9}  {func} ({where})")
+        return lines
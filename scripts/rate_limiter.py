@@ -0,0 +1,168 @@
+"""
+Rate Limiter - Client-side request scheduler for rate-limited APIs.
+
+Tracks requests-per-minute and tokens-per-minute budgets over a sliding
+window, caps in-flight calls with an adaptive (AIMD) concurrency limit and
+pauses every caller when the server asks for a Retry-After.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class Ticket:
+    """A reserved request slot; released once the call finishes."""
+
+    tokens: int
+    issued_at: float
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract a server-requested wait from an HTTP error's response headers."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_ms = headers.get("retry-after-ms")
+    if retry_ms:
+        try:
+            return max(0.0, float(retry_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(retry_after)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """Gate API calls on RPM/TPM budgets and an adaptive concurrency limit."""
+
+    def __init__(
+        self,
+        rpm: int = 500,
+        tpm: int = 30000,
+        max_concurrency: int = 4,
+        throttle_errors: Tuple[type, ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = max_concurrency
+        self.throttle_errors = throttle_errors
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._window: Deque[Tuple[float, Ticket]] = deque()
+        self._window_tokens = 0
+        self._in_flight = 0
+        self._resume_at = 0.0
+
+    def acquire(self, tokens: int) -> Ticket:
+        """Block until a request of ``tokens`` estimated tokens fits every budget."""
+        # A single request larger than the whole TPM budget could never fit
+        tokens = min(max(tokens, 0), self.tpm)
+
+        with self._cond:
+            while True:
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                logger.debug(f"[scheduler] Waiting {wait:.2f}s for capacity")
+                self._cond.wait(timeout=wait)
+
+            now = self._clock()
+            ticket = Ticket(tokens=tokens, issued_at=now)
+            self._window.append((now, ticket))
+            self._window_tokens += tokens
+            self._in_flight += 1
+            return ticket
+
+    def release(
+        self,
+        ticket: Ticket,
+        actual_tokens: Optional[int] = None,
+        error: Optional[Exception] = None,
+        adapt: bool = True,
+    ) -> None:
+        """
+        Return a slot, reconcile token usage and adapt concurrency.
+
+        ``adapt=False`` returns the slot without counting the call as a success
+        or a throttle (e.g. a stream the caller stopped reading).
+        """
+        with self._cond:
+            self._in_flight -= 1
+
+            if actual_tokens is not None and actual_tokens != ticket.tokens:
+                # Ticket is still in the window unless it already aged out
+                if any(t is ticket for _, t in self._window):
+                    self._window_tokens += actual_tokens - ticket.tokens
+                ticket.tokens = actual_tokens
+
+            if not adapt:
+                pass
+            elif error is not None and isinstance(error, self.throttle_errors):
+                self.concurrency_limit = max(1, self.concurrency_limit // 2)
+                pause = retry_after_seconds(error)
+                if pause:
+                    self._resume_at = max(self._resume_at, self._clock() + pause)
+                logger.warning(
+                    f"[scheduler] Throttled, concurrency -> {self.concurrency_limit}"
+                    + (f", pausing {pause:.1f}s" if pause else "")
+                )
+            elif error is None and self.concurrency_limit < self.max_concurrency:
+                self.concurrency_limit += 1
+
+            self._cond.notify_all()
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until a request of ``tokens`` may start (0 = now). Caller holds the lock."""
+        now = self._clock()
+        self._evict(now)
+
+        if now < self._resume_at:
+            return self._resume_at - now
+        if self._in_flight >= self.concurrency_limit:
+            # Woken by release(); the timeout is just a safety net
+            return WINDOW_SECONDS
+
+        waits = []
+        if len(self._window) >= self.rpm:
+            waits.append(self._window[0][0] + WINDOW_SECONDS - now)
+        if self._window_tokens + tokens > self.tpm:
+            # Find when enough old tokens age out of the window
+            freed = 0
+            for issued, ticket in self._window:
+                freed += ticket.tokens
+                if self._window_tokens - freed + tokens <= self.tpm:
+                    waits.append(issued + WINDOW_SECONDS - now)
+                    break
+        return max(waits) if waits else 0.0
+
+    def _evict(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            _, ticket = self._window.popleft()
+            self._window_tokens -= ticket.tokens
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+SEO Re-scorer - Recomputes seo_score for every draft after SEO config changes.
+
+Runs SEOAnalyzer over drafts/ across a process pool, writes updated scores
+back into front matter in place and emits a CSV or JSON report. The
+published copies in docs/data/posts/ are body-only (no front matter, so no
+keywords or score); rebuild the dashboard afterwards to publish new scores.
+
+Usage:
+    python scripts/rescore_seo.py [--workers N] [--dry-run] [--report logs/rescore.csv]
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from post_text import parse_front_matter, strip_front_matter
+from seo_analyzer import SEOAnalyzer
+
+logger = logging.getLogger("rescore_seo")
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_DIRS = [ROOT_DIR / "drafts"]
+LOGS_DIR = ROOT_DIR / "logs"
+
+FRONT_MATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+SEO_SCORE_LINE_RE = re.compile(r"^seo_score:.*$", re.MULTILINE)
+
+REPORT_FIELDS = [
+    "path", "old_score", "new_score", "changed", "written",
+    "word_count", "flesch_reading_ease", "keywords", "error",
+]
+
+# Per-process analyzer, created once by the pool initializer
+_analyzer: Optional[SEOAnalyzer] = None
+_write = True
+
+
+def _init_worker(config_path: Optional[str], write: bool) -> None:
+    global _analyzer, _write
+    logging.getLogger("seo_analyzer").setLevel(logging.WARNING)
+    _analyzer = SEOAnalyzer(config_path)
+    _write = write
+
+
+def rescore_file(path: str) -> Dict:
+    """Analyze one draft and update its front matter seo_score if it changed."""
+    row = {field: "" for field in REPORT_FIELDS}
+    row["path"] = path
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+        metadata = parse_front_matter(content)
+        if not metadata:
+            # Body-only copies (docs/data/posts/) have no keywords to score against
+            row["error"] = "no front matter (rescore the draft, then rebuild the dashboard)"
+            return row
+        keywords = metadata.get("keywords", [])
+        if not isinstance(keywords, list):
+            keywords = [keywords] if keywords else []
+
+        report = _analyzer.analyze(strip_front_matter(content), keywords)
+        new_score = report["overall_score"]
+        old_score = metadata.get("seo_score")
+
+        row.update(
+            old_score=old_score if old_score is not None else "",
+            new_score=new_score,
+            changed=old_score is None or str(old_score) != str(new_score),
+            written=False,
+            word_count=report["word_count"],
+            flesch_reading_ease=report["flesch_reading_ease"],
+            keywords="; ".join(keywords),
+        )
+
+        if _write and row["changed"]:
+            _write_atomic(Path(path), update_seo_score(content, new_score))
+            row["written"] = True
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+def update_seo_score(content: str, score: int) -> str:
+    """Replace (or add) the seo_score line inside the front matter."""
+    match = FRONT_MATTER_RE.match(content)
+    if not match:
+        return content
+    block = match.group(1)
+    if SEO_SCORE_LINE_RE.search(block):
+        block = SEO_SCORE_LINE_RE.sub(f"seo_score: {score}", block, count=1)
+    else:
+        block += f"\nseo_score: {score}"
+    return content[: match.start(1)] + block + content[match.end(1):]
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def find_drafts(dirs: List[Path]) -> List[str]:
+    files = []
+    for directory in dirs:
+        if directory.is_dir():
+            files.extend(str(p) for p in sorted(directory.glob("*.md")))
+    return files
+
+
+def write_report(rows: List[Dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".json":
+        path.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def rescore(
+    files: List[str],
+    workers: Optional[int] = None,
+    write: bool = True,
+    config_path: Optional[str] = None,
+    progress_every: float = 2.0,
+) -> List[Dict]:
+    """Re-score ``files`` across a process pool, logging progress and throughput."""
+    workers = workers or os.cpu_count() or 1
+    # Large chunks amortize IPC; keep enough chunks for load balancing
+    chunksize = max(1, min(256, len(files) // (workers * 8)))
+    rows: List[Dict] = []
+
+    start = time.perf_counter()
+    last_report = start
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(config_path, write),
+    ) as pool:
+        for row in pool.map(rescore_file, files, chunksize=chunksize):
+            rows.append(row)
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                last_report = now
+                logger.info(
+                    f"Processed {len(rows)}/{len(files)} "
+                    f"({len(rows) / (now - start):.0f} docs/sec)"
+                )
+
+    elapsed = time.perf_counter() - start
+    changed = sum(1 for r in rows if r["changed"] is True)
+    written = sum(1 for r in rows if r["written"] is True)
+    errors = sum(1 for r in rows if r["error"])
+    logger.info(
+        f"Re-scored {len(rows)} drafts in {elapsed:.1f}s "
+        f"({len(rows) / max(elapsed, 1e-9):.0f} docs/sec, {workers} workers): "
+        f"{changed} changed, {written} written, {errors} errors"
+    )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute SEO scores for all drafts")
+    parser.add_argument("dirs", nargs="*", type=Path, help="Directories to scan (default: drafts/)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute scores without writing front matter")
+    parser.add_argument("--config", default=None, help="Path to seo_config.json")
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=LOGS_DIR / f"seo_rescore_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+        help="Report path (.csv or .json)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+
+    files = find_drafts(args.dirs or DEFAULT_DIRS)
+    if not files:
+        logger.warning("No drafts found")
+        return 0
+
+    rows = rescore(files, workers=args.workers, write=not args.dry_run, config_path=args.config)
+    write_report(rows, args.report)
+    logger.info(f"Report written: {args.report}")
+    return 1 if any(r["error"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,37 @@ Retry utilities with exponential backoff.
 """
 
 import time
+import random
 import logging
 from functools import wraps
-from typing import Callable
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
 
-def retry(max_attempts: int = 3, backoff_factor: float = 2.0, exceptions: tuple = (Exception,)):
-    """Decorator for retrying functions with exponential backoff."""
+def retry(
+    max_attempts: int = 3,
+    backoff_factor: float = 2.0,
+    exceptions: tuple = (Exception,),
+    jitter: bool = False,
+    max_wait: Optional[float] = None,
+    wait_hint: Optional[Callable[[Exception], Optional[float]]] = None,
+    time_left: Optional[Callable[[], Optional[float]]] = None,
+):
+    """
+    Decorator for retrying functions with exponential backoff.
+
+    Args:
+        max_attempts: Total attempts including the first call.
+        backoff_factor: Base of the exponential wait (factor ** attempt seconds).
+        exceptions: Exception types that trigger a retry.
+        jitter: Use "full jitter" (uniform 0..wait) to spread concurrent retries.
+        max_wait: Upper bound on the computed backoff (server hints are not capped).
+        wait_hint: Optional callable returning a server-requested wait for an
+            exception (e.g. a parsed Retry-After header), or None.
+        time_left: Optional callable returning the seconds left for the caller
+            (None = unbounded); no retry is attempted that would start after it.
+    """
 
     def decorator(func: Callable):
         @wraps(func)
@@ -24,6 +46,17 @@ def retry(max_attempts: int = 3, backoff_factor: float = 2.0, exceptions: tuple
                     last_exception = e
                     if attempt < max_attempts:
                         wait = backoff_factor ** attempt
+                        if max_wait is not None:
+                            wait = min(wait, max_wait)
+                        if jitter:
+                            wait = random.uniform(0, wait)
+                        hinted = wait_hint(e) if wait_hint else None
+                        if hinted is not None:
+                            wait = max(wait, hinted)
+                        left = time_left() if time_left else None
+                        if left is not None and wait >= left:
+                            logger.error(f"{func.__name__} failed ({e}); no time left to retry")
+                            raise
                         logger.warning(
                             f"{func.__name__} attempt {attempt}/{max_attempts} failed: {e}. "
                             f"Retrying in {wait:.1f}s..."
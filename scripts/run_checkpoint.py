@@ -0,0 +1,200 @@
+"""
+Run Checkpoint - Per-phase outputs persisted so a failed run can resume.
+
+Each run gets a directory ``drafts/runs/<run-id>/`` holding ``run.json``
+(the options the run started with) and one ``<phase>.json`` per completed
+phase with that phase's outputs. ``main.py --resume <run-id>`` reloads the
+options and hands the checkpoint to the PhaseExecutor, which restores
+completed phases instead of running them again.
+
+Outputs are stored as JSON. Dataclass instances (NewsItem) go into an
+object table so shared references (the primary topic is also in
+``all_ranked`` and its cluster) are shared again after loading; Paths are
+tagged, and stored relative to the project root when inside it (a resumed
+run may be a fresh checkout somewhere else); futures and other in-flight
+handles are stored as None.
+
+Successful runs remove their directory; failed ones that are never
+resumed are pruned by age (``python scripts/run_checkpoint.py --prune-days 7``,
+run by the weekly cleanup workflow).
+"""
+
+import json
+import shutil
+import logging
+import argparse
+import importlib
+import dataclasses
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+CHECKPOINT_VERSION = 1
+RUNS_DIRNAME = "runs"
+RUN_FILE = "run.json"
+RUN_ID_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def new_run_id() -> str:
+    return datetime.now(timezone.utc).strftime(RUN_ID_FORMAT)
+
+
+def prune_runs(drafts_dir: Path, max_age_days: float) -> List[str]:
+    """
+    Remove run directories started more than ``max_age_days`` ago.
+
+    Age comes from the run id, not the file mtime, which a fresh checkout
+    resets. Returns the removed run ids.
+    """
+    cutoff = datetime.now(timezone.utc).timestamp() - max_age_days * 86400
+    removed = []
+    for run_dir in sorted((Path(drafts_dir) / RUNS_DIRNAME).glob("*/")):
+        try:
+            started = datetime.strptime(run_dir.name, RUN_ID_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            logger.warning(f"Not a run directory, leaving it: {run_dir}")
+            continue
+        if started.timestamp() < cutoff:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            removed.append(run_dir.name)
+            logger.info(f"Pruned abandoned run {run_dir.name}")
+    return removed
+
+
+class RunCheckpoint:
+    """Checkpoint directory for one pipeline run."""
+
+    def __init__(self, drafts_dir: Path, run_id: Optional[str] = None):
+        self.run_id = run_id or new_run_id()
+        self.dir = Path(drafts_dir) / RUNS_DIRNAME / self.run_id
+
+    @classmethod
+    def resume(cls, drafts_dir: Path, run_id: str) -> "RunCheckpoint":
+        """Open an existing run; raises FileNotFoundError if it has no checkpoint."""
+        checkpoint = cls(drafts_dir, run_id)
+        if not (checkpoint.dir / RUN_FILE).exists():
+            raise FileNotFoundError(f"No checkpoint for run {run_id} in {checkpoint.dir.parent}")
+        return checkpoint
+
+    # ---- Run options ----
+
+    def start(self, options: Dict) -> None:
+        """Record the options this run was started with."""
+        self._write(RUN_FILE, {
+            "version": CHECKPOINT_VERSION,
+            "run_id": self.run_id,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "options": options,
+        })
+
+    def options(self) -> Dict:
+        return json.loads((self.dir / RUN_FILE).read_text(encoding="utf-8")).get("options", {})
+
+    def completed(self) -> List[str]:
+        return sorted(p.stem for p in self.dir.glob("*.json") if p.name != RUN_FILE)
+
+    def discard(self) -> None:
+        """Remove the run directory (after the run finished)."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    # ---- Phase outputs (PhaseExecutor hooks) ----
+
+    def load(self, phase: str) -> Optional[Dict]:
+        path = self.dir / f"{phase}.json"
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != CHECKPOINT_VERSION:
+                return None
+            objects: List[Any] = [None] * len(data["objects"])
+            outputs = _decode(data["outputs"], data["objects"], objects)
+        except (OSError, ValueError, KeyError, TypeError, ImportError, AttributeError) as e:
+            logger.warning(f"Checkpoint {path.name} unreadable, re-running {phase}: {e}")
+            return None
+        return outputs
+
+    def save(self, phase: str, outputs: Dict, seconds: float = 0.0) -> None:
+        table: List[Dict] = []
+        refs: Dict[int, int] = {}
+        encoded = _encode(outputs, table, refs)
+        self._write(f"{phase}.json", {
+            "version": CHECKPOINT_VERSION,
+            "phase": phase,
+            "seconds": round(seconds, 3),
+            "completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "outputs": encoded,
+            "objects": table,
+        })
+
+    def _write(self, name: str, data: Dict) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.dir / f".{name}.tmp"
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.dir / name)
+
+
+def _encode(value: Any, table: List[Dict], refs: Dict[int, int]) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Path):
+        try:
+            return {"__root__": value.resolve().relative_to(ROOT_DIR.resolve()).as_posix()}
+        except ValueError:
+            return {"__path__": str(value)}
+    if isinstance(value, Future):
+        return None
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        key = id(value)
+        if key not in refs:
+            refs[key] = len(table)
+            table.append({})  # Reserve the slot before recursing
+            cls = type(value)
+            table[refs[key]] = {
+                "class": f"{cls.__module__}.{cls.__qualname__}",
+                "fields": {
+                    f.name: _encode(getattr(value, f.name), table, refs) for f in dataclasses.fields(value)
+                },
+            }
+        return {"__ref__": refs[key]}
+    if isinstance(value, dict):
+        return {str(k): _encode(v, table, refs) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v, table, refs) for v in value]
+    raise TypeError(f"Cannot checkpoint {type(value).__name__}")
+
+
+def _decode(value: Any, table: List[Dict], objects: List[Any]) -> Any:
+    if isinstance(value, list):
+        return [_decode(v, table, objects) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__root__" in value:
+        return ROOT_DIR / value["__root__"]
+    if "__path__" in value:
+        return Path(value["__path__"])
+    if "__ref__" in value:
+        index = value["__ref__"]
+        if objects[index] is None:
+            entry = table[index]
+            module, _, name = entry["class"].rpartition(".")
+            cls = getattr(importlib.import_module(module), name)
+            objects[index] = cls(**{k: _decode(v, table, objects) for k, v in entry["fields"].items()})
+        return objects[index]
+    return {k: _decode(v, table, objects) for k, v in value.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prune abandoned run checkpoints")
+    parser.add_argument("--drafts", type=Path, default=ROOT_DIR / "drafts", help="Drafts directory")
+    parser.add_argument("--prune-days", type=float, required=True,
+                        help="Remove checkpoints of runs started more than this many days ago")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    removed = prune_runs(args.drafts, args.prune_days)
+    logger.info(f"Pruned {len(removed)} run checkpoint(s)")
@@ -7,30 +7,246 @@ import re
 import json
 import logging
 import math
-from typing import Dict, List
+import hashlib
+from functools import lru_cache
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from syllables import SyllableCounter
+from tracing import span
+
 logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path(__file__).parent.parent / "config"
 
+HEADING_RE = re.compile(r"^(#+) ", re.MULTILINE)
+LIST_ITEM_RE = re.compile(r"^[\s]*[-*] ", re.MULTILINE)
+NUMBERED_RE = re.compile(r"^\d+\.", re.MULTILINE)
+BOLD_RE = re.compile(r"\*\*[^*]+\*\*")
+LINK_RE = re.compile(r"\[.+?\]\(.+?\)")
+CONCLUSION_TERMS = ("conclusion", "takeaway", "summary", "tl;dr")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?%?\b")
+CODE_BLOCK_RE = re.compile(r"```[\s\S]*?```")
+HEADER_PREFIX_RE = re.compile(r"^#{1,6}\s+", re.MULTILINE)
+LINK_TEXT_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+FORMATTING_RE = re.compile(r"[*_~`]")
+SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+WORD_STRIP = ".,!?;:\"'()-"
+SECTION_BOUNDARY_RE = re.compile(r"^(?:## |```)", re.MULTILINE)
+H2_TEXT_RE = re.compile(r"^## (.*)$", re.MULTILINE)
+# Hyphens separate tokens ("supply-chain" == "supply chain"); dots/apostrophes inside words don't
+KEYWORD_TOKEN_RE = re.compile(r"\w+(?:[.']\w+)*")
+# Words ending in "s" that are not regular plurals: "news" must not match "new"
+UNFOLDED_TOKENS = frozenset(
+    "news series species bias alias atlas canvas lens chaos ethos kudos always perhaps whereas "
+    "physics mathematics economics politics ethics robotics analytics genetics graphics electronics".split()
+)
+# "-ies" plurals of "-ie" words: "movies" is "movie", not "movy"
+IE_PLURALS = frozenset(
+    "lies ties pies dies movies cookies selfies zombies rookies calories hoodies smoothies brownies "
+    "newbies goalies freebies aunties".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def normalize_token(token: str) -> str:
+    """Fold simple morphological variants: possessives and regular plurals."""
+    if token.endswith("'s"):
+        token = token[:-2]
+    if len(token) <= 3 or token in UNFOLDED_TOKENS:
+        return token
+    if token.endswith("ies"):
+        return token[:-1] if token in IE_PLURALS else token[:-3] + "y"
+    if token.endswith(("sses", "shes", "ches", "xes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def keyword_tokens(text: str) -> List[str]:
+    """Lowercase, word-boundary tokens with variants folded."""
+    return list(map(normalize_token, KEYWORD_TOKEN_RE.findall(text.lower())))
+
+
+@dataclass
+class SectionStats:
+    """
+    Additive statistics for one H2 section of a document.
+
+    Cached by content hash in incremental mode, so unchanged sections are
+    never re-tokenized between edits.
+    """
+
+    text_lower: str
+    word_count: int
+    heading_levels: List[int]
+    paragraph_count: int
+    list_items: int
+    bold_count: int
+    link_count: int
+    number_count: int
+    question_count: int
+    fence_count: int
+    numbered_lines: int
+    has_conclusion: bool
+    # Readability stats over markdown-stripped prose
+    prose_words: int
+    prose_sentences: int
+    prose_syllables: int
+    heading: str = ""
+    # n-gram length -> Counter of token tuples, built lazily on first keyword lookup
+    _ngrams: Dict[int, Counter] = field(default_factory=dict, repr=False)
+    _tokens: Optional[List[str]] = field(default=None, repr=False)
+
+    def phrase_count(self, phrase: Tuple[str, ...]) -> int:
+        """Word-boundary occurrences of a normalized keyword phrase."""
+        n = len(phrase)
+        if not n:
+            return 0
+        counts = self._ngrams.get(n)
+        if counts is None:
+            if self._tokens is None:
+                self._tokens = keyword_tokens(self.text_lower)
+            tokens = self._tokens
+            # One C-level pass per distinct phrase length serves every keyword of that length
+            if n == 1:
+                counts = Counter(tokens)
+            else:
+                counts = Counter(zip(*(tokens[i:] for i in range(n))))
+            self._ngrams[n] = counts
+        return counts[phrase[0] if n == 1 else phrase]
+
+
+@dataclass
+class ParsedDocument:
+    """
+    Everything the scorers need, aggregated from per-section statistics.
+
+    Built once per analyze() call so no scorer re-splits or re-strips the text.
+    """
+
+    sections: List[SectionStats]
+    word_count: int
+    heading_levels: List[int]
+    paragraph_count: int
+    list_items: int
+    bold_count: int
+    link_count: int
+    number_count: int
+    question_count: int
+    code_blocks: int
+    has_numbered_list: bool
+    has_conclusion: bool
+    total_words: int
+    total_sentences: int
+    total_syllables: int
+
+    @classmethod
+    def from_sections(cls, sections: List[SectionStats]) -> "ParsedDocument":
+        return cls(
+            sections=sections,
+            word_count=sum(s.word_count for s in sections),
+            heading_levels=[level for s in sections for level in s.heading_levels],
+            paragraph_count=sum(s.paragraph_count for s in sections),
+            list_items=sum(s.list_items for s in sections),
+            bold_count=sum(s.bold_count for s in sections),
+            link_count=sum(s.link_count for s in sections),
+            number_count=sum(s.number_count for s in sections),
+            question_count=sum(s.question_count for s in sections),
+            code_blocks=sum(s.fence_count for s in sections) // 2,
+            has_numbered_list=any(s.numbered_lines for s in sections),
+            has_conclusion=any(s.has_conclusion for s in sections),
+            total_words=max(1, sum(s.prose_words for s in sections)),
+            total_sentences=max(1, sum(s.prose_sentences for s in sections)),
+            total_syllables=sum(s.prose_syllables for s in sections),
+        )
+
+    @property
+    def h1_count(self) -> int:
+        return self.heading_levels.count(1)
+
+    @property
+    def h2_count(self) -> int:
+        return self.heading_levels.count(2)
+
+    @property
+    def h3_count(self) -> int:
+        return self.heading_levels.count(3)
+
+    def phrase_count(self, phrase: Tuple[str, ...]) -> int:
+        return sum(s.phrase_count(phrase) for s in self.sections)
+
+
+def split_sections(content: str) -> List[str]:
+    """Split Markdown before each H2 heading that is not inside a code fence."""
+    sections = []
+    start = 0
+    in_fence = False
+    for match in SECTION_BOUNDARY_RE.finditer(content):
+        if match.group() == "```":
+            in_fence = not in_fence
+        elif not in_fence and match.start() > start:
+            sections.append(content[start:match.start()])
+            start = match.start()
+    sections.append(content[start:])
+    return sections
+
 
 class SEOAnalyzer:
     """Analyze blog content for SEO optimization."""
 
-    def __init__(self, config_path: str | None = None):
+    def __init__(self, config_path: str | None = None, incremental: bool = False, section_cache_size: int = 512):
+        """
+        Args:
+            config_path: Path to seo_config.json (defaults to config/).
+            incremental: Cache per-section statistics by content hash so repeated
+                analysis of an evolving draft only re-tokenizes changed sections.
+            section_cache_size: Max cached sections in incremental mode (LRU).
+        """
         cfg_file = Path(config_path) if config_path else CONFIG_DIR / "seo_config.json"
         with open(cfg_file) as f:
             self.config = json.load(f)
 
+        # Optional tech-vocabulary table next to the SEO config; absent = pure heuristic
+        exceptions_file = self.config["readability"].get("syllable_exceptions")
+        if exceptions_file:
+            self.syllables = SyllableCounter.from_file(cfg_file.parent / exceptions_file)
+        else:
+            self.syllables = SyllableCounter()
+
+        self.incremental = incremental
+        self.section_cache_size = section_cache_size
+        self._section_cache: "OrderedDict[bytes, SectionStats]" = OrderedDict()
+        self.last_recomputed = 0
+
     def analyze(self, content: str, keywords: List[str]) -> Dict:
         """Run full SEO analysis and return a report with overall score."""
-        word_count_score = self._score_word_count(content)
-        readability_score = self._score_readability(content)
-        keyword_score = self._score_keywords(content, keywords)
-        structure_score = self._score_structure(content)
-        meta_score = self._score_meta_quality(content)
-        depth_score = self._score_content_depth(content)
+        with span("seo.analyze") as s:
+            syllables_before = self.syllables.cache_info()
+            report, doc = self._analyze(content, keywords)
+            syllables = self.syllables.cache_info()
+            s.set(
+                items=doc.word_count,
+                # Sections reused from the incremental cache plus memoized syllable lookups
+                cache_hits=len(doc.sections) - self.last_recomputed + syllables.hits - syllables_before.hits,
+                cache_misses=self.last_recomputed + syllables.misses - syllables_before.misses,
+            )
+        logger.info(f"SEO Analysis: {json.dumps(report, indent=2)}")
+        return report
+
+    def _analyze(self, content: str, keywords: List[str]) -> Tuple[Dict, ParsedDocument]:
+        doc = self.parse(content)
+        densities = self.keyword_density(doc, keywords)["global"]
+
+        word_count_score = self._score_word_count(doc)
+        readability_score = self._score_readability(doc)
+        keyword_score = self._score_keywords(doc, keywords, densities)
+        structure_score = self._score_structure(doc)
+        meta_score = self._score_meta_quality(doc)
+        depth_score = self._score_content_depth(doc)
 
         weights = self.config["scoring_weights"]
         overall = (
@@ -44,26 +260,83 @@ class SEOAnalyzer:
 
         report = {
             "overall_score": round(overall),
-            "word_count": len(content.split()),
+            "word_count": doc.word_count,
             "word_count_score": round(word_count_score),
             "readability_score": round(readability_score),
             "keyword_score": round(keyword_score),
             "structure_score": round(structure_score),
             "meta_score": round(meta_score),
             "depth_score": round(depth_score),
-            "flesch_reading_ease": self._flesch_reading_ease(content),
-            "flesch_kincaid_grade": self._flesch_kincaid_grade(content),
+            "flesch_reading_ease": self._flesch_reading_ease(doc),
+            "flesch_kincaid_grade": self._flesch_kincaid_grade(doc),
+            "keyword_density": {kw: stats["density"] for kw, stats in densities.items()},
         }
-
-        logger.info(f"SEO Analysis: {json.dumps(report, indent=2)}")
-        return report
+        return report, doc
+
+    def parse(self, content: str) -> ParsedDocument:
+        """Tokenize the document into the shared model used by every scorer."""
+        sections = []
+        recomputed = 0
+        for text in split_sections(content):
+            if not self.incremental:
+                sections.append(self._section_stats(text))
+                recomputed += 1
+                continue
+
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            stats = self._section_cache.get(key)
+            if stats is None:
+                stats = self._section_stats(text)
+                recomputed += 1
+                self._section_cache[key] = stats
+                if len(self._section_cache) > self.section_cache_size:
+                    self._section_cache.popitem(last=False)
+            else:
+                self._section_cache.move_to_end(key)
+            sections.append(stats)
+
+        self.last_recomputed = recomputed
+        if self.incremental:
+            logger.debug(f"SEO parse: recomputed {recomputed}/{len(sections)} sections")
+        return ParsedDocument.from_sections(sections)
+
+    def _section_stats(self, text: str) -> SectionStats:
+        """Compute additive statistics for one section of Markdown."""
+        paragraphs = 0
+        for block in text.split("\n\n"):
+            block = block.strip()
+            if block and not block.startswith("#"):
+                paragraphs += 1
+
+        prose = self._get_text_stats(text)
+        text_lower = text.lower()
+        h2 = H2_TEXT_RE.match(text)
+
+        return SectionStats(
+            text_lower=text_lower,
+            word_count=len(text.split()),
+            heading_levels=[len(h) for h in HEADING_RE.findall(text)],
+            paragraph_count=paragraphs,
+            list_items=len(LIST_ITEM_RE.findall(text)),
+            bold_count=len(BOLD_RE.findall(text)),
+            link_count=len(LINK_RE.findall(text)),
+            number_count=len(NUMBER_RE.findall(text)),
+            question_count=text.count("?"),
+            fence_count=text.count("```"),
+            numbered_lines=len(NUMBERED_RE.findall(text)),
+            has_conclusion=any(term in text_lower for term in CONCLUSION_TERMS),
+            prose_words=prose["total_words"],
+            prose_sentences=prose["total_sentences"],
+            prose_syllables=prose["total_syllables"],
+            heading=h2.group(1).strip() if h2 else "",
+        )
 
     # ------------------------------------------------------------------
     # Scoring methods (each returns 0-100)
     # ------------------------------------------------------------------
 
-    def _score_word_count(self, content: str) -> float:
-        word_count = len(content.split())
+    def _score_word_count(self, doc: ParsedDocument) -> float:
+        word_count = doc.word_count
         cfg = self.config["target_word_count"]
         if cfg["min"] <= word_count <= cfg["max"]:
             return 100.0
@@ -72,8 +345,8 @@ class SEOAnalyzer:
         # Over max is slightly penalized but not terrible
         return max(70, 100 - (word_count - cfg["max"]) / 10)
 
-    def _score_readability(self, content: str) -> float:
-        fre = self._flesch_reading_ease(content)
+    def _score_readability(self, doc: ParsedDocument) -> float:
+        fre = self._flesch_reading_ease(doc)
         cfg = self.config["readability"]
         if cfg["flesch_reading_ease_min"] <= fre <= cfg["flesch_reading_ease_max"]:
             return 100.0
@@ -83,18 +356,19 @@ class SEOAnalyzer:
         diff = fre - cfg["flesch_reading_ease_max"]
         return max(50, 100 - diff * 1.5)
 
-    def _score_keywords(self, content: str, keywords: List[str]) -> float:
+    def _score_keywords(self, doc: ParsedDocument, keywords: List[str], densities: Optional[Dict] = None) -> float:
+        """``densities``: keyword_density(...)["global"] if the caller already has it."""
         if not keywords:
             return 50.0  # Neutral if no keywords provided
 
-        content_lower = content.lower()
-        word_count = len(content.split())
         cfg = self.config["keyword_density"]
+        scored = keywords[: cfg.get("scored_keywords", 3)]
+        if densities is None:
+            densities = self.keyword_density(doc, scored)["global"]
 
         scores = []
-        for kw in keywords[:3]:  # Check top 3 keywords
-            count = content_lower.count(kw.lower())
-            density = (count / max(word_count, 1)) * 100
+        for kw in scored:
+            density = densities[kw]["density"]
             if cfg["min"] <= density <= cfg["max"]:
                 scores.append(100.0)
             elif density < cfg["min"]:
@@ -104,12 +378,43 @@ class SEOAnalyzer:
 
         return sum(scores) / len(scores) if scores else 50.0
 
-    def _score_structure(self, content: str) -> float:
+    def keyword_density(self, doc: ParsedDocument, keywords: List[str]) -> Dict:
+        """
+        Word-boundary keyword counts and densities (% of words), globally and per H2 section.
+
+        Plurals and possessives count as the same keyword, and hyphens match
+        spaces, so "LLMs" counts for "LLM" and "supply-chain risk" for
+        "supply chain risk" but "rag" does not match inside "fragment".
+        """
+        phrases = {kw: tuple(keyword_tokens(kw)) for kw in keywords}
+
+        sections = []
+        totals = dict.fromkeys(keywords, 0)
+        for section in doc.sections:
+            counts = {}
+            for kw, phrase in phrases.items():
+                count = section.phrase_count(phrase)
+                totals[kw] += count
+                counts[kw] = {
+                    "count": count,
+                    "density": round(count / max(section.word_count, 1) * 100, 3),
+                }
+            sections.append({"heading": section.heading, "words": section.word_count, "keywords": counts})
+
+        return {
+            "global": {
+                kw: {"count": n, "density": round(n / max(doc.word_count, 1) * 100, 3)}
+                for kw, n in totals.items()
+            },
+            "sections": sections,
+        }
+
+    def _score_structure(self, doc: ParsedDocument) -> float:
         cfg = self.config["structure"]
-        h2_count = len(re.findall(r"^## ", content, re.MULTILINE))
-        h3_count = len(re.findall(r"^### ", content, re.MULTILINE))
-        paragraphs = [p.strip() for p in content.split("\n\n") if p.strip() and not p.strip().startswith("#")]
-        list_items = len(re.findall(r"^[\s]*[-*] ", content, re.MULTILINE))
+        h2_count = doc.h2_count
+        h3_count = doc.h3_count
+        paragraph_count = doc.paragraph_count
+        list_items = doc.list_items
 
         score = 0.0
         # H2 headings
@@ -125,10 +430,10 @@ class SEOAnalyzer:
             score += 25 * h3_count / cfg["min_h3_headings"]
 
         # Paragraphs
-        if len(paragraphs) >= cfg["min_paragraphs"]:
+        if paragraph_count >= cfg["min_paragraphs"]:
             score += 25
         else:
-            score += 25 * len(paragraphs) / cfg["min_paragraphs"]
+            score += 25 * paragraph_count / cfg["min_paragraphs"]
 
         # Lists
         if list_items >= cfg["min_list_items"]:
@@ -138,54 +443,50 @@ class SEOAnalyzer:
 
         return min(100, score)
 
-    def _score_meta_quality(self, content: str) -> float:
+    def _score_meta_quality(self, doc: ParsedDocument) -> float:
         """Score based on presence of key meta elements in content."""
         score = 0.0
 
         # Has a clear H1 title
-        if re.search(r"^# ", content, re.MULTILINE):
+        if doc.h1_count:
             score += 25
 
         # Has bold/emphasis for key terms
-        if len(re.findall(r"\*\*[^*]+\*\*", content)) >= 3:
+        if doc.bold_count >= 3:
             score += 25
 
         # Has links
-        if len(re.findall(r"\[.+?\]\(.+?\)", content)) >= 1:
+        if doc.link_count >= 1:
             score += 25
 
         # Has a conclusion or takeaways section
-        if re.search(r"(?i)(conclusion|takeaway|summary|tl;dr)", content):
+        if doc.has_conclusion:
             score += 25
 
         return score
 
-    def _score_content_depth(self, content: str) -> float:
+    def _score_content_depth(self, doc: ParsedDocument) -> float:
         """Score based on content depth indicators."""
         score = 0.0
-        word_count = len(content.split())
 
         # Code blocks
-        code_blocks = len(re.findall(r"```", content)) // 2
-        if code_blocks >= 1:
+        if doc.code_blocks >= 1:
             score += 20
 
         # Numbered lists
-        if re.search(r"^\d+\.", content, re.MULTILINE):
+        if doc.has_numbered_list:
             score += 20
 
         # Questions / rhetorical elements
-        question_count = content.count("?")
-        if question_count >= 3:
+        if doc.question_count >= 3:
             score += 20
 
         # Statistics / numbers in content
-        numbers = re.findall(r"\b\d+(?:\.\d+)?%?\b", content)
-        if len(numbers) >= 5:
+        if doc.number_count >= 5:
             score += 20
 
         # Variety of sections
-        sections = len(re.findall(r"^#{1,3} ", content, re.MULTILINE))
+        sections = sum(1 for level in doc.heading_levels if level <= 3)
         if sections >= 8:
             score += 20
 
@@ -197,69 +498,44 @@ class SEOAnalyzer:
 
     def _count_syllables(self, word: str) -> int:
         """Estimate syllable count for a word."""
-        word = word.lower().strip(".,!?;:\"'()-")
-        if not word:
-            return 0
-        if len(word) <= 3:
-            return 1
-
-        vowels = "aeiouy"
-        count = 0
-        prev_vowel = False
-
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_vowel:
-                count += 1
-            prev_vowel = is_vowel
-
-        # Adjust for silent e
-        if word.endswith("e") and count > 1:
-            count -= 1
-        # Adjust for -le ending
-        if word.endswith("le") and len(word) > 2 and word[-3] not in vowels:
-            count += 1
-
-        return max(1, count)
+        return self.syllables.count(word)
 
     def _get_text_stats(self, content: str) -> Dict:
-        """Get basic text statistics."""
+        """Get raw sentence/word/syllable counts for markdown-stripped prose."""
         # Strip markdown formatting
-        text = re.sub(r"```[\s\S]*?```", "", content)  # Remove code blocks
-        text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)  # Remove headers
-        text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)  # Remove links
-        text = re.sub(r"[*_~`]", "", text)  # Remove formatting
+        text = CODE_BLOCK_RE.sub("", content)  # Remove code blocks
+        text = HEADER_PREFIX_RE.sub("", text)  # Remove headers
+        text = LINK_TEXT_RE.sub(r"\1", text)  # Remove links
+        text = FORMATTING_RE.sub("", text)  # Remove formatting
 
-        sentences = re.split(r"[.!?]+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        sentences = SENTENCE_SPLIT_RE.split(text)
+        sentences = [s for s in sentences if s.strip()]
 
-        words = text.split()
-        words = [w.strip(".,!?;:\"'()-") for w in words if w.strip(".,!?;:\"'()-")]
+        words = [w.strip(WORD_STRIP) for w in text.split()]
+        words = [w for w in words if w]
 
-        total_syllables = sum(self._count_syllables(w) for w in words)
+        total_syllables = self.syllables.total(words)
 
         return {
-            "total_sentences": max(1, len(sentences)),
-            "total_words": max(1, len(words)),
+            "total_sentences": len(sentences),
+            "total_words": len(words),
             "total_syllables": total_syllables,
         }
 
-    def _flesch_reading_ease(self, content: str) -> float:
+    def _flesch_reading_ease(self, doc: ParsedDocument) -> float:
         """Calculate Flesch Reading Ease score (0-100, higher = easier)."""
-        stats = self._get_text_stats(content)
         score = (
             206.835
-            - 1.015 * (stats["total_words"] / stats["total_sentences"])
-            - 84.6 * (stats["total_syllables"] / stats["total_words"])
+            - 1.015 * (doc.total_words / doc.total_sentences)
+            - 84.6 * (doc.total_syllables / doc.total_words)
         )
         return round(max(0, min(100, score)), 1)
 
-    def _flesch_kincaid_grade(self, content: str) -> float:
+    def _flesch_kincaid_grade(self, doc: ParsedDocument) -> float:
         """Calculate Flesch-Kincaid Grade Level."""
-        stats = self._get_text_stats(content)
         grade = (
-            0.39 * (stats["total_words"] / stats["total_sentences"])
-            + 11.8 * (stats["total_syllables"] / stats["total_words"])
+            0.39 * (doc.total_words / doc.total_sentences)
+            + 11.8 * (doc.total_syllables / doc.total_words)
             - 15.59
         )
         return round(max(0, grade), 1)
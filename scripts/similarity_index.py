@@ -0,0 +1,222 @@
+"""
+Similarity Index - Persistent hashed TF-IDF index of past drafts for topic dedup.
+
+Every draft is reduced to a sparse vector over hashed terms drawn from its
+title, keywords, meta description, topic angle and body (field-weighted,
+log-scaled TF times IDF, L2-normalized, top terms only). Vectors live in
+drafts/similarity_index.json keyed by filename and the post catalog's content
+hash, so each run only vectorizes drafts that are new or changed since the last.
+
+Queries walk an in-memory inverted index (hashed term -> postings), so the
+cost of checking a candidate depends on how many past posts share its terms,
+not on the size of the archive.
+"""
+
+import json
+import math
+import zlib
+import logging
+from collections import Counter, defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from post_text import SEARCH_STRIP_RE, parse_front_matter, search_tokens, strip_front_matter
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "similarity_index.json"
+INDEX_VERSION = 1
+
+HASH_BITS = 20  # 1M buckets: collisions are rare at our vocabulary size
+FIELD_WEIGHTS = {"title": 3.0, "keywords": 2.0, "meta_description": 1.5, "topic_angle": 1.5, "body": 1.0}
+MAX_DOC_TERMS = 64  # Highest-weighted terms kept per post
+MAX_DF_RATIO = 0.5  # Terms in more than half the archive carry no signal and are skipped at query time
+
+
+def term_hash(term: str) -> int:
+    """Stable bucket for a term (crc32 is identical across runs and platforms)."""
+    return zlib.crc32(term.encode("utf-8")) & ((1 << HASH_BITS) - 1)
+
+
+def hashed_term_counts(fields: Dict[str, str]) -> Dict[int, float]:
+    """Field-weighted, log-scaled term frequencies over hashed terms."""
+    counts: Dict[int, float] = defaultdict(float)
+    for field, weight in FIELD_WEIGHTS.items():
+        text = fields.get(field) or ""
+        if field == "body":
+            text = SEARCH_STRIP_RE.sub(" ", text)
+        for term, tf in Counter(search_tokens(text)).items():
+            counts[term_hash(term)] += weight * (1.0 + math.log(tf))
+    return counts
+
+
+def draft_fields(content: str) -> Dict[str, str]:
+    """Indexable text fields of a draft file."""
+    metadata = parse_front_matter(content)
+    keywords = metadata.get("keywords", [])
+    return {
+        "title": metadata.get("title", ""),
+        "keywords": " ".join(keywords) if isinstance(keywords, list) else str(keywords),
+        "meta_description": metadata.get("meta_description", ""),
+        "topic_angle": metadata.get("topic_angle", ""),
+        "body": strip_front_matter(content),
+    }
+
+
+def topic_fields(topic) -> Dict[str, str]:
+    """Indexable text fields of a candidate NewsItem."""
+    return {"title": topic.title, "keywords": " ".join(topic.keywords), "body": topic.summary}
+
+
+def draft_date(path: Path) -> str:
+    """ISO date from a draft filename (2026-02-21-slug.md)."""
+    return path.name[:10]
+
+
+class SimilarityIndex:
+    """Hashed TF-IDF vectors of past drafts with an inverted index for lookups."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # filename -> {"hash", "date", "terms": [...], "weights": [...]}
+        self.docs: Dict[str, Dict] = {}
+        self.df: Counter = Counter()
+        self._postings: Optional[Dict[int, List[Tuple[str, float]]]] = None
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Similarity index unreadable, rebuilding: {e}")
+            return
+        if data.get("version") != INDEX_VERSION or data.get("hash_bits") != HASH_BITS:
+            logger.info("Similarity index format changed, rebuilding")
+            return
+        self.docs = data.get("docs", {})
+        for doc in self.docs.values():
+            self.df.update(doc["terms"])
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": INDEX_VERSION, "hash_bits": HASH_BITS, "docs": self.docs}
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+        self._dirty = False
+
+    # ---- Maintenance ----
+
+    def sync(self, drafts_dir: Path, hashes: Dict[str, str]) -> Tuple[int, int]:
+        """
+        Bring the index in line with ``{filename: content hash}`` (from the post catalog).
+
+        Only drafts whose hash changed are read and vectorized; returns (added, removed).
+        """
+        removed = [name for name in self.docs if name not in hashes]
+        for name in removed:
+            self._remove(name)
+
+        pending = []
+        for name, digest in sorted(hashes.items()):
+            if self.docs.get(name, {}).get("hash") == digest:
+                continue
+            path = Path(drafts_dir) / name
+            try:
+                content = path.read_text(encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Similarity index: cannot read {name}: {e}")
+                continue
+            self._remove(name)
+            pending.append((name, draft_date(path), digest, hashed_term_counts(draft_fields(content))))
+
+        # Weigh the whole batch with document frequencies that include it, so a
+        # first build gets the same IDF for every post. Afterwards df counts only
+        # the terms each post keeps, which is what a reload reconstructs.
+        for *_, counts in pending:
+            self.df.update(counts.keys())
+        n_docs = len(self.docs) + len(pending)
+        for name, day, digest, counts in pending:
+            self._add(name, day, digest, counts, n_docs)
+        for name, _, _, counts in pending:
+            self.df.subtract(counts.keys())
+            self.df.update(self.docs[name]["terms"])
+
+        if pending or removed:
+            self._postings = None
+            self._dirty = True
+            logger.info(f"Similarity index synced: {len(pending)} added, {len(removed)} removed, {len(self.docs)} posts")
+        return len(pending), len(removed)
+
+    def _add(self, name: str, day: str, digest: str, counts: Dict[int, float], n_docs: int) -> None:
+        vector = self._weigh(counts, n_docs)
+        top = sorted(vector.items(), key=lambda item: -item[1])[:MAX_DOC_TERMS]
+        norm = math.sqrt(sum(w * w for _, w in top)) or 1.0
+        self.docs[name] = {
+            "hash": digest,
+            "date": day,
+            "terms": [t for t, _ in top],
+            "weights": [round(w / norm, 5) for _, w in top],
+        }
+
+    def _remove(self, name: str) -> None:
+        doc = self.docs.pop(name, None)
+        if doc:
+            self.df.subtract(doc["terms"])
+
+    def _weigh(self, counts: Dict[int, float], n_docs: int) -> Dict[int, float]:
+        """TF-IDF weights (smoothed IDF, always >= 1)."""
+        df = self.df
+        return {term: tf * (math.log((n_docs + 1) / (df.get(term, 0) + 1)) + 1.0) for term, tf in counts.items()}
+
+    # ---- Queries ----
+
+    def _build_postings(self) -> Dict[int, List[Tuple[str, float]]]:
+        postings: Dict[int, List[Tuple[str, float]]] = defaultdict(list)
+        for name, doc in self.docs.items():
+            for term, weight in zip(doc["terms"], doc["weights"]):
+                postings[term].append((name, weight))
+        return postings
+
+    def query(self, fields: Dict[str, str], since: Optional[date] = None, limit: int = 3) -> List[Tuple[str, float]]:
+        """
+        Most similar past posts to a candidate as [(filename, cosine)], best first.
+
+        Only posts dated on or after ``since`` are considered.
+        """
+        if not self.docs:
+            return []
+        if self._postings is None:
+            self._postings = self._build_postings()
+
+        vector = self._weigh(hashed_term_counts(fields), len(self.docs))
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if not norm:
+            return []
+
+        max_df = max(1, int(len(self.docs) * MAX_DF_RATIO))
+        cutoff = since.isoformat() if since else ""
+        scores: Dict[str, float] = defaultdict(float)
+        for term, weight in vector.items():
+            if self.df.get(term, 0) > max_df:
+                continue
+            for name, doc_weight in self._postings.get(term, ()):
+                scores[name] += weight * doc_weight
+
+        ranked = [
+            (name, round(score / norm, 4))
+            for name, score in scores.items()
+            if self.docs[name]["date"] >= cutoff
+        ]
+        ranked.sort(key=lambda item: -item[1])
+        return ranked[:limit]
+
+    def query_many(self, candidates: Sequence[Dict[str, str]], **kwargs) -> List[List[Tuple[str, float]]]:
+        """query() for several candidates (same interface as SimilarityMatrix.query_many)."""
+        return [self.query(fields, **kwargs) for fields in candidates]
@@ -0,0 +1,245 @@
+"""
+Similarity Matrix - Memory-mapped NumPy history of past drafts for batch topic dedup.
+
+Each draft becomes one row of drafts/similarity_matrix.npy: its hashed terms
+(see similarity_index) folded into DIM dense buckets, TF-IDF weighted and
+L2-normalized, stored as float32. A JSON sidecar records which draft each row
+belongs to plus per-bucket document frequencies. New or changed drafts are
+appended once per run (changed and deleted ones leave a tombstoned row until
+the next compaction), and the matrix is opened with mmap_mode="r", so startup
+reads no vectors at all.
+
+Scoring every candidate against the whole history is one matrix multiply:
+(candidates x DIM) @ (DIM x posts).
+"""
+
+import io
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from similarity_index import draft_date, draft_fields, hashed_term_counts
+
+logger = logging.getLogger(__name__)
+
+MATRIX_NAME = "similarity_matrix.npy"
+SIDECAR_NAME = "similarity_matrix.json"
+MATRIX_VERSION = 1
+
+DIM = 2048  # Dense buckets per vector (8 KiB per post as float32)
+DTYPE = np.dtype("<f4")
+MAX_DF_RATIO = 0.5  # Same cut-off as SimilarityIndex: near-universal buckets are ignored in queries
+COMPACT_RATIO = 0.25  # Rewrite the matrix once this share of rows is tombstoned
+
+
+def _npy_header(rows: int) -> bytes:
+    buf = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        buf, {"descr": np.lib.format.dtype_to_descr(DTYPE), "fortran_order": False, "shape": (rows, DIM)}
+    )
+    return buf.getvalue()
+
+
+class SimilarityMatrix:
+    """Append-only, memory-mapped matrix of normalized draft vectors."""
+
+    def __init__(self, drafts_dir: Path):
+        self.matrix_path = Path(drafts_dir) / MATRIX_NAME
+        self.sidecar_path = Path(drafts_dir) / SIDECAR_NAME
+        # rows[i] = [filename, date, content hash] or None once tombstoned
+        self.rows: List[Optional[List[str]]] = []
+        self.df = np.zeros(DIM, dtype=np.int64)
+        self._matrix: Optional[np.ndarray] = None
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not (self.matrix_path.exists() and self.sidecar_path.exists()):
+            return
+        try:
+            sidecar = json.loads(self.sidecar_path.read_text(encoding="utf-8"))
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Similarity matrix unreadable, rebuilding: {e}")
+            return
+        if (
+            sidecar.get("version") != MATRIX_VERSION
+            or matrix.shape != (len(sidecar.get("rows", [])), DIM)
+            or matrix.dtype != DTYPE
+        ):
+            logger.info("Similarity matrix format changed, rebuilding")
+            return
+        self.rows = sidecar["rows"]
+        self.df = np.asarray(sidecar["df"], dtype=np.int64)
+        self._matrix = matrix
+
+    @property
+    def active(self) -> int:
+        return sum(1 for row in self.rows if row is not None)
+
+    # ---- Maintenance ----
+
+    def sync(self, drafts_dir: Path, hashes: Dict[str, str]) -> Tuple[int, int]:
+        """
+        Bring the matrix in line with ``{filename: content hash}`` (from the post catalog).
+
+        Only drafts whose hash changed are read; their vectors are appended
+        in a single write. Returns (added, removed).
+        """
+        current = {row[0]: i for i, row in enumerate(self.rows) if row is not None}
+        removed = 0
+        for name, i in current.items():
+            if hashes.get(name) != self.rows[i][2]:
+                self._tombstone(i)
+                removed += name not in hashes
+
+        pending = []
+        for name, digest in sorted(hashes.items()):
+            i = current.get(name)
+            if i is not None and self.rows[i] is not None:
+                continue
+            path = Path(drafts_dir) / name
+            try:
+                content = path.read_text(encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Similarity matrix: cannot read {name}: {e}")
+                continue
+            pending.append(([name, draft_date(path), digest], self._bucket_counts(draft_fields(content))))
+
+        if pending:
+            counts = np.stack([c for _, c in pending])
+            self.df += (counts > 0).sum(axis=0)
+            vectors = self._normalize(counts, self.active + len(pending))
+            self._append([row for row, _ in pending], vectors)
+
+        tombstoned = len(self.rows) - self.active
+        if self.rows and tombstoned / len(self.rows) > COMPACT_RATIO:
+            self._compact()
+
+        if pending or removed:
+            logger.info(f"Similarity matrix synced: {len(pending)} added, {removed} removed, {self.active} posts")
+        return len(pending), removed
+
+    def _tombstone(self, i: int) -> None:
+        # Stored weights are non-zero exactly where the draft had terms
+        history = self._history()
+        if history is not None:
+            self.df -= np.asarray(history[i] != 0, dtype=np.int64)
+        self.rows[i] = None
+        self._dirty = True
+
+    @staticmethod
+    def _bucket_counts(fields: Dict[str, str]) -> np.ndarray:
+        """Hashed term counts folded into DIM dense buckets."""
+        vector = np.zeros(DIM, dtype=np.float32)
+        for term, weight in hashed_term_counts(fields).items():
+            vector[term % DIM] += weight
+        return vector
+
+    def _normalize(self, counts: np.ndarray, n_docs: int, skip_common: bool = False) -> np.ndarray:
+        """TF-IDF weight and L2-normalize rows of bucket counts."""
+        idf = np.log((n_docs + 1) / (self.df + 1)) + 1.0
+        if skip_common:
+            idf[self.df > max(1, int(n_docs * MAX_DF_RATIO))] = 0.0
+        weighted = counts * idf.astype(np.float32)
+        norms = np.linalg.norm(weighted, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (weighted / norms).astype(DTYPE)
+
+    def _append(self, rows: List[List[str]], vectors: np.ndarray) -> None:
+        """Append rows to the .npy in place, patching the shape in its header."""
+        self._matrix = None  # Drop the old mapping before the file grows
+        total = len(self.rows) + len(rows)
+        header = _npy_header(total)
+        if self.matrix_path.exists() and self.rows:
+            with open(self.matrix_path, "r+b") as f:
+                np.lib.format.read_magic(f)
+                np.lib.format.read_array_header_1_0(f)
+                if f.tell() == len(header):
+                    f.seek(0, io.SEEK_END)
+                    f.write(vectors.tobytes())
+                    f.seek(0)
+                    f.write(header)
+                    self.rows.extend(rows)
+                    self._dirty = True
+                    return
+        # First write, or a header that no longer fits: rewrite the whole file
+        existing = np.load(self.matrix_path, mmap_mode="r") if self.rows else np.zeros((0, DIM), dtype=DTYPE)
+        self.rows.extend(rows)
+        self._write_matrix(np.concatenate([existing, vectors]))
+
+    def _compact(self) -> None:
+        keep = [i for i, row in enumerate(self.rows) if row is not None]
+        matrix = np.load(self.matrix_path, mmap_mode="r") if self.rows else np.zeros((0, DIM), dtype=DTYPE)
+        logger.info(f"Compacting similarity matrix: {len(self.rows)} -> {len(keep)} rows")
+        self._matrix = None
+        self.rows = [self.rows[i] for i in keep]
+        self._write_matrix(matrix[keep])
+
+    def _write_matrix(self, matrix: np.ndarray) -> None:
+        self.matrix_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.matrix_path.with_name(f".{self.matrix_path.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=DTYPE))
+        tmp.replace(self.matrix_path)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the sidecar (the matrix itself is written as rows are appended)."""
+        if not self._dirty:
+            return
+        data = {"version": MATRIX_VERSION, "dim": DIM, "df": self.df.tolist(), "rows": self.rows}
+        tmp = self.sidecar_path.with_name(f".{self.sidecar_path.name}.tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.sidecar_path)
+        self._dirty = False
+
+    # ---- Queries ----
+
+    def _history(self) -> Optional[np.ndarray]:
+        if self._matrix is None and self.rows and self.matrix_path.exists():
+            self._matrix = np.load(self.matrix_path, mmap_mode="r")
+        return self._matrix
+
+    def query_many(
+        self, candidates: Sequence[Dict[str, str]], since: Optional[date] = None, limit: int = 3
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Most similar past posts for every candidate at once, as
+        [[(filename, cosine), ...] per candidate], best first.
+
+        Only live rows dated on or after ``since`` are considered.
+        """
+        history = self._history()
+        if history is None or not candidates:
+            return [[] for _ in candidates]
+
+        cutoff = since.isoformat() if since else ""
+        live = np.fromiter(
+            (row is not None and row[1] >= cutoff for row in self.rows), dtype=bool, count=len(self.rows)
+        )
+        if not live.any():
+            return [[] for _ in candidates]
+
+        counts = np.stack([self._bucket_counts(c) for c in candidates])
+        queries = self._normalize(counts, self.active, skip_common=True)
+        # Rows are appended as posts are written, so a lookback window is
+        # (nearly) a suffix of the matrix: only those pages get read
+        start = int(np.argmax(live))
+        scores = queries @ history[start:].T  # (candidates, posts)
+        scores[:, ~live[start:]] = -1.0
+
+        results = []
+        k = min(limit, int(live.sum()))
+        for row_scores in scores:
+            top = np.argpartition(-row_scores, k - 1)[:k]
+            top = top[np.argsort(-row_scores[top])]
+            results.append([(self.rows[start + i][0], round(float(row_scores[i]), 4)) for i in top])
+        return results
+
+    def query(self, fields: Dict[str, str], since: Optional[date] = None, limit: int = 3) -> List[Tuple[str, float]]:
+        return self.query_many([fields], since=since, limit=limit)[0]
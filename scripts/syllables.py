@@ -0,0 +1,121 @@
+"""
+Syllable Counter - Memoized, table-driven syllable estimation for readability metrics.
+
+Combines an optional pronunciation-style exception table (tech vocabulary the
+vowel-group heuristic gets wrong), letter-by-letter counting for acronyms
+like "LLM", and an LRU-bounded memo so repeated words are counted once.
+"""
+
+import re
+import json
+import logging
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+WORD_STRIP = ".,!?;:\"'()-"
+VOWELS = "aeiouy"
+
+# Syllables when an acronym is spelled out letter by letter ("W" is "dub-ul-you")
+LETTER_SYLLABLES = {letter: 1 for letter in "abcdefghijklmnopqrstuvxyz"}
+LETTER_SYLLABLES["w"] = 3
+
+MAX_ACRONYM_LENGTH = 5
+
+
+class SyllableCounter:
+    """Count syllables per word with an exception table and an LRU memo."""
+
+    def __init__(self, exceptions: Optional[Dict[str, int]] = None, cache_size: int = 65536):
+        self.exceptions = {k.lower(): v for k, v in (exceptions or {}).items()}
+        self._cached = lru_cache(maxsize=cache_size)(self._compute)
+
+    @classmethod
+    def from_file(cls, path: str | Path, cache_size: int = 65536) -> "SyllableCounter":
+        """Build a counter from a JSON ``{"word": syllables}`` table; missing file = no table."""
+        path = Path(path)
+        if not path.exists():
+            return cls(cache_size=cache_size)
+        with open(path) as f:
+            table = json.load(f)
+        logger.debug(f"Loaded {len(table)} syllable exceptions from {path}")
+        return cls(exceptions=table, cache_size=cache_size)
+
+    def count(self, word: str) -> int:
+        """Estimate syllable count for a single word."""
+        word = word.strip(WORD_STRIP)
+        if not word:
+            return 0
+        return self._cached(self._cache_key(word))
+
+    def count_many(self, words: Iterable[str]) -> List[int]:
+        """Syllable counts for a list of words, in order."""
+        return [self.count(w) for w in words]
+
+    def total(self, words: Iterable[str]) -> int:
+        """Total syllables over a word list, counting each distinct word once."""
+        return sum(self.count(word) * n for word, n in Counter(words).items())
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def cache_clear(self) -> None:
+        self._cached.cache_clear()
+
+    def _compute(self, word: str) -> int:
+        lower = word.lower()
+        if lower in self.exceptions:
+            return self.exceptions[lower]
+
+        if self._is_acronym(word):
+            return sum(LETTER_SYLLABLES.get(c, 1) for c in lower)
+        # Plural acronyms ("LLMs", "GPUs") add no syllable
+        if word.endswith("s") and self._is_acronym(word[:-1]):
+            return self._cached(word[:-1])
+
+        # Compounds like "fine-tuning" or "GPT-4": count each part on its own
+        parts = [p for p in word.split("-") if p]
+        if len(parts) > 1:
+            return sum(self._cached(self._cache_key(p)) for p in parts)
+
+        return self._heuristic(lower)
+
+    def _cache_key(self, word: str) -> str:
+        """Fold case for cache hits, except on acronym parts where case is meaningful."""
+        if word.islower():
+            return word
+        if "-" not in word:
+            return word if self._keeps_case(word) else word.lower()
+        return "-".join(p if self._keeps_case(p) else p.lower() for p in word.split("-"))
+
+    def _keeps_case(self, part: str) -> bool:
+        return self._is_acronym(part) or (part.endswith("s") and self._is_acronym(part[:-1]))
+
+    def _is_acronym(self, word: str) -> bool:
+        """Spelled out letter by letter: short, all caps, and unpronounceable ("LLM") or listed ("API")."""
+        if not (2 <= len(word) <= MAX_ACRONYM_LENGTH and word.isalpha() and word.isupper()):
+            return False
+        # Shouted words with vowels ("NOTE", "NEVER") are read as words
+        lower = word.lower()
+        return not VOWEL_GROUP_RE.search(lower) or lower in self.exceptions
+
+    @staticmethod
+    def _heuristic(word: str) -> int:
+        """Vowel-group estimate with silent-e and -le adjustments."""
+        if len(word) <= 3:
+            return 1
+
+        count = len(VOWEL_GROUP_RE.findall(word))
+
+        # Adjust for silent e
+        if word.endswith("e") and count > 1:
+            count -= 1
+        # Adjust for -le ending
+        if word.endswith("le") and len(word) > 2 and word[-3] not in VOWELS:
+            count += 1
+
+        return max(1, count)
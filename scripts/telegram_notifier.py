@@ -1,51 +1,88 @@
 """
 Telegram Notifier - Sends formatted blog draft notifications.
 Uses raw requests with HTML parse mode (more reliable than MarkdownV2).
+Messages go through a persisted outbox drained in the background.
 """
 
 import os
+import re
+import html
 import logging
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Optional
 
-import requests
+from notification_outbox import NotificationOutbox
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_API_URL = "https://api.telegram.org"
+OUTBOX_PATH = Path(__file__).parent.parent / "logs" / "telegram-outbox.json"
+MAX_MESSAGE_LENGTH = 4096  # Telegram's limit for sendMessage text
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+class TelegramError(Exception):
+    """Failed sendMessage call; ``retry_after`` carries Telegram's flood-wait hint."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 class TelegramNotifier:
-    """Send one-way Telegram notifications for blog drafts."""
+    """
+    Send one-way Telegram notifications for blog drafts.
 
-    def __init__(self):
+    Notifications are queued in a persisted outbox and sent by a background
+    worker, so callers never wait on Telegram; call close() before exiting
+    to give queued messages a bounded chance to go out this run.
+    """
+
+    def __init__(self, outbox_path: Optional[Path] = None, api_url: Optional[str] = None):
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         chat_id_str = os.getenv("TELEGRAM_CHAT_ID", "")
         self.chat_id = int(chat_id_str) if chat_id_str.strip() else None
+        # TELEGRAM_API_URL points at a local stub server (scripts/telegram_stub_server.py) in tests
+        self.api_url = (api_url or os.getenv("TELEGRAM_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.outbox = None
+        if self.is_configured:
+            self.outbox = NotificationOutbox(
+                outbox_path or OUTBOX_PATH,
+                self._deliver,
+                max_length=MAX_MESSAGE_LENGTH,
+                retry_hint=lambda e: getattr(e, "retry_after", None),
+            )
 
     @property
     def _base_url(self) -> str:
-        return f"https://api.telegram.org/bot{self.bot_token}"
+        return f"{self.api_url}/bot{self.bot_token}"
 
     @property
     def is_configured(self) -> bool:
         return bool(self.bot_token and self.chat_id)
 
     def send_draft_notification(self, draft: Dict, topics: Dict) -> bool:
-        """Send a formatted notification about the generated draft."""
+        """Queue a formatted notification about the generated draft."""
         if not self.is_configured:
             logger.warning("Telegram credentials not set, skipping notification")
             return False
 
-        message = self._format_message(draft, topics)
-        return self._send_message(message)
+        self.outbox.put(self._format_message(draft, topics), kind="draft")
+        return True
 
     def send_error_notification(self, error_msg: str) -> bool:
-        """Send error alert via Telegram."""
+        """Queue an error alert."""
         if not self.is_configured:
             logger.warning("Telegram credentials not set, skipping error notification")
             return False
 
-        # Keep error messages plain text to avoid formatting issues
-        text = f"🚨 Blog Generator Error\n\n{error_msg[:500]}\n\nCheck GitHub Actions logs for details."
-        return self._send_message(text, use_html=False)
+        text = f"🚨 <b>Blog Generator Error</b>\n\n{self._escape_html(error_msg[:500])}\n\nCheck GitHub Actions logs for details."
+        self.outbox.put(text, kind="error")
+        return True
+
+    def close(self, timeout: float = 10.0) -> int:
+        """Wait up to ``timeout`` seconds for queued notifications; returns how many are left for next run."""
+        return self.outbox.close(timeout) if self.outbox else 0
 
     def _format_message(self, draft: Dict, topics: Dict) -> str:
         """Format the Telegram notification message using HTML."""
@@ -109,27 +146,32 @@ class TelegramNotifier:
             .replace(">", "&gt;")
         )
 
-    def _send_message(self, text: str, use_html: bool = True) -> bool:
-        """Send a message via Telegram Bot API."""
-        payload = {
-            "chat_id": self.chat_id,
-            "text": text,
-        }
-        if use_html:
-            payload["parse_mode"] = "HTML"
+    def _deliver(self, text: str) -> None:
+        """POST one message (runs on the outbox worker); raises TelegramError on failure."""
+        try:
+            self._post({"chat_id": self.chat_id, "text": text, "parse_mode": "HTML"})
+        except TelegramError as e:
+            if "parse" not in str(e).lower():
+                raise
+            # Markup Telegram rejects: send the same text without formatting
+            logger.warning(f"Telegram rejected HTML ({e}), sending as plain text")
+            self._post({"chat_id": self.chat_id, "text": html.unescape(HTML_TAG_RE.sub("", text))})
+
+    def _post(self, payload: Dict) -> None:
+        import requests  # First send only; constructing a notifier stays cheap
 
         try:
-            resp = requests.post(
-                f"{self._base_url}/sendMessage",
-                json=payload,
-                timeout=10,
-            )
-            resp.raise_for_status()
-            logger.info("Telegram notification sent successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Telegram notification failed: {e}")
-            # Last resort: try plain text
-            if use_html:
-                return self._send_message(text, use_html=False)
-            return False
+            resp = requests.post(f"{self._base_url}/sendMessage", json=payload, timeout=10)
+        except requests.RequestException as e:
+            raise TelegramError(str(e)) from e
+        if resp.ok:
+            return
+        try:
+            body = resp.json()
+        except ValueError:
+            body = {}
+        retry_after = (body.get("parameters") or {}).get("retry_after")
+        raise TelegramError(
+            f"HTTP {resp.status_code}: {body.get('description', resp.text[:200])}",
+            retry_after=float(retry_after) if retry_after is not None else None,
+        )
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Telegram Stub Server - Local stand-in for the Bot API's sendMessage.
+
+Records every message it accepts and can be told to fail: the next N
+requests with a given status (429 includes a retry_after hint), or every
+request that uses parse_mode=HTML (like Telegram's "can't parse entities").
+Point the notifier at it with TELEGRAM_API_URL.
+
+Usage:
+    python scripts/telegram_stub_server.py --port 8081 --fail 2 --status 500
+    TELEGRAM_API_URL=http://127.0.0.1:8081 TELEGRAM_BOT_TOKEN=x TELEGRAM_CHAT_ID=1 python scripts/main.py
+
+In code:
+    with TelegramStubServer(fail=1) as stub:
+        notifier = TelegramNotifier(api_url=stub.url)
+        ...
+        stub.messages  # accepted sendMessage payloads
+"""
+
+import json
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "TelegramStubServer"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._reply(400, {"ok": False, "error_code": 400, "description": "Bad Request: invalid JSON"})
+
+        stub = self.server
+        if not self.path.endswith("/sendMessage"):
+            return self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+        with stub.lock:
+            stub.requests.append(payload)
+            if stub.fail > 0:
+                stub.fail -= 1
+                body = {"ok": False, "error_code": stub.status, "description": "Stub failure"}
+                if stub.status == 429:
+                    body["parameters"] = {"retry_after": stub.retry_after}
+                return self._reply(stub.status, body)
+            if stub.reject_html and payload.get("parse_mode") == "HTML":
+                return self._reply(400, {
+                    "ok": False, "error_code": 400,
+                    "description": "Bad Request: can't parse entities: unsupported start tag",
+                })
+            stub.messages.append(payload)
+            message_id = len(stub.messages)
+
+        logger.info(f"sendMessage #{message_id}: {str(payload.get('text', ''))[:80]!r}")
+        self._reply(200, {"ok": True, "result": {"message_id": message_id, "text": payload.get("text")}})
+
+    def _reply(self, status: int, body: Dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class TelegramStubServer(ThreadingHTTPServer):
+    """sendMessage stub; use as a context manager to run it on a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, fail: int = 0, status: int = 500,
+                 retry_after: float = 1, reject_html: bool = False):
+        super().__init__((host, port), _Handler)
+        self.lock = threading.Lock()
+        self.fail = fail
+        self.status = status
+        self.retry_after = retry_after
+        self.reject_html = reject_html
+        self.requests: List[Dict] = []  # Every payload received
+        self.messages: List[Dict] = []  # Payloads that were accepted
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "TelegramStubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Telegram Bot API stub")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--fail", type=int, default=0, help="Fail this many requests first")
+    parser.add_argument("--status", type=int, default=500, help="Status for failed requests (429 adds retry_after)")
+    parser.add_argument("--reject-html", action="store_true", help="Reject parse_mode=HTML like a markup error")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    server = TelegramStubServer(port=args.port, fail=args.fail, status=args.status, reject_html=args.reject_html)
+    logger.info(f"Telegram stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,135 @@
+"""
+Topic Clusterer - Groups ranked news items into stories.
+
+Items are turned into sparse hashed term vectors (title and summary, minus
+generic headline words) and clustered in a single pass, best score first:
+each item joins the most similar existing cluster when its cosine with the
+cluster centroid reaches the threshold, otherwise it starts a new cluster.
+Centroids are found through an inverted index (term -> clusters), so each
+item only touches clusters it shares terms with and the pass stays
+near-linear at thousands of items.
+"""
+
+import math
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+from post_text import search_tokens
+from similarity_index import hashed_term_counts, term_hash
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_THRESHOLD = 0.3
+# Words in most AI headlines regardless of story; they never link items. This
+# is a fixed list, and terms are not weighted by batch document frequency: on
+# a day one story fills most of the batch, its own terms ("gemini") are the
+# commonest ones and must still link its items.
+GENERIC_WORDS = (
+    "ai artificial intelligence model llm new news open source release launch announce "
+    "introducing show hn ask using use via just now today first update week year"
+)
+GENERIC_TERMS = frozenset(term_hash(term) for term in search_tokens(GENERIC_WORDS))
+
+
+class TopicClusterer:
+    """Single-pass threshold clustering of news items."""
+
+    def __init__(self, threshold: float = CLUSTER_THRESHOLD):
+        self.threshold = threshold
+
+    def cluster(self, items: List) -> List[List]:
+        """
+        Cluster items (expected best score first).
+
+        Sets ``cluster_id`` on every item and returns the clusters, each a
+        list of items in score order; clusters are ordered by their lead item.
+        """
+        if not items:
+            return []
+
+        counts = [hashed_term_counts({"title": item.title, "body": item.summary}) for item in items]
+        n = len(items)
+
+        clusters: List[List] = []
+        centroid_norms2: List[float] = []  # |centroid|^2, centroid = sum of member vectors
+        # term -> {cluster: centroid weight}; doubles as the centroids themselves
+        postings: Dict[int, Dict[int, float]] = defaultdict(dict)
+        threshold2 = self.threshold * self.threshold
+
+        for item, tf in zip(items, counts):
+            vector = self._normalize({term: weight for term, weight in tf.items() if term not in GENERIC_TERMS})
+
+            # Dot products with centroids sharing a term, heaviest terms first.
+            # Once the unvisited terms' norm drops below the threshold, a cluster
+            # not seen yet can no longer reach it, so only seen ones are updated.
+            dots: Dict[int, float] = defaultdict(float)
+            remaining2 = 1.0
+            for term, weight in sorted(vector.items(), key=lambda tw: -tw[1]):
+                if remaining2 >= threshold2:
+                    for cid, cw in postings.get(term, {}).items():
+                        dots[cid] += weight * cw
+                else:
+                    for cid, cw in postings.get(term, {}).items():
+                        if cid in dots:
+                            dots[cid] += weight * cw
+                remaining2 -= weight * weight
+
+            # cos = dot / |c| (vector is unit length); compare squares to skip sqrt
+            best, best_score = None, threshold2
+            for cid, dot in dots.items():
+                if dot > 0:
+                    score = dot * dot / centroid_norms2[cid]
+                    if score >= best_score:
+                        best, best_score = cid, score
+
+            if best is None:
+                best = len(clusters)
+                clusters.append([])
+                centroid_norms2.append(0.0)
+
+            for term, weight in vector.items():
+                old = postings[term].get(best, 0.0)
+                postings[term][best] = old + weight
+                centroid_norms2[best] += 2 * old * weight + weight * weight
+
+            item.cluster_id = best
+            clusters[best].append(item)
+
+        multi = sum(1 for c in clusters if len(c) > 1)
+        logger.info(f"[Clusterer] {n} items → {len(clusters)} stories ({multi} with several items)")
+        return clusters
+
+    @staticmethod
+    def _normalize(vector: Dict[int, float]) -> Dict[int, float]:
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+
+def related_items(topics: Dict, primary, limit: int = 4) -> List:
+    """Other members of the primary's cluster, best score first."""
+    clusters = topics.get("clusters") or []
+    cid = getattr(primary, "cluster_id", None)
+    if cid is None or cid >= len(clusters):
+        return []
+    members = [item for item in clusters[cid] if item is not primary]
+    members.sort(key=lambda item: item.engagement_score, reverse=True)
+    return members[:limit]
+
+
+def clusters_to_dict(clusters: List[List], limit: int = 20) -> List[Dict]:
+    """Cluster structure for the backup-topics JSON (top clusters by lead score)."""
+    ordered = sorted(
+        enumerate(clusters), key=lambda pair: max(item.engagement_score for item in pair[1]), reverse=True
+    )
+    return [
+        {
+            "id": cid,
+            "size": len(members),
+            "members": [
+                {"title": item.title, "url": item.url, "source": item.source, "engagement_score": item.engagement_score}
+                for item in sorted(members, key=lambda item: item.engagement_score, reverse=True)
+            ],
+        }
+        for cid, members in ordered[:limit]
+    ]
@@ -0,0 +1,179 @@
+"""
+Tracing - Lightweight spans recorded as JSONL, one file per pipeline run.
+
+    with span("fetch.hackernews") as s:
+        items = fetcher.fetch()
+        s.set(items=len(items))
+
+    tracing.add(bytes=len(resp.content))  # Bump a counter on the current span
+
+Spans nest through a context variable (threads started with a copied
+context, like PhaseExecutor's, keep their parent). Each finished span is
+one JSON line: name, id, parent, start time, duration and attributes
+(bytes, items, tokens, cache hits, ...); an exception escaping a span is
+recorded as its error. Without an open run (start_run) spans still time
+their block but nothing is written, so library code can trace
+unconditionally.
+
+summarize() folds one trace file into per-name totals; build_dashboard
+keeps those in docs/data/metrics.json as a time series.
+"""
+
+import json
+import time
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_PREFIX = "trace_"
+TRACE_GLOB = f"{TRACE_PREFIX}*.jsonl"
+ROOT_SPAN = "run"
+# Numeric attributes that summarize() adds up per span name
+COUNTERS = ("bytes", "items", "prompt_tokens", "completion_tokens", "cache_hits", "cache_misses")
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+_lock = threading.Lock()
+_sink = None  # Open trace file of the current run
+_run_id: Optional[str] = None
+
+
+class Span:
+    __slots__ = ("name", "id", "parent", "start", "attrs")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict):
+        self.name = name
+        self.id = next(_ids)
+        self.parent = parent.id if parent else None
+        self.start = time.time()
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, **counters) -> None:
+        for key, value in counters.items():
+            self.attrs[key] = self.attrs.get(key, 0) + value
+
+
+def start_run(path: Path, run_id: str) -> None:
+    """Send spans to ``path`` (appended, so a resumed run continues its file)."""
+    global _sink, _run_id
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+        _sink = open(path, "a", encoding="utf-8", buffering=1)
+        _run_id = run_id
+
+
+def end_run() -> None:
+    global _sink, _run_id
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+        _sink, _run_id = None, None
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """Time the block as a child of the current span."""
+    current = Span(name, _current.get(), attrs)
+    token = _current.set(current)
+    started = time.perf_counter()
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        _write(current, time.perf_counter() - started, error)
+
+
+def add(**counters) -> None:
+    """Add to counters on the current span (no-op outside a span)."""
+    current = _current.get()
+    if current is not None:
+        current.add(**counters)
+
+
+def record(name: str, seconds: float, error: Optional[str] = None, **attrs) -> None:
+    """Record a span timed elsewhere (e.g. a generator's lifetime) under the current span."""
+    current = Span(name, _current.get(), attrs)
+    current.start -= seconds
+    _write(current, seconds, error)
+
+
+def _write(current: Span, seconds: float, error: Optional[str]) -> None:
+    if _sink is None:
+        return
+    entry = {
+        "run": _run_id,
+        "span": current.name,
+        "id": current.id,
+        "parent": current.parent,
+        "thread": threading.current_thread().name,
+        "start": datetime.fromtimestamp(current.start, timezone.utc).isoformat(timespec="milliseconds"),
+        "ms": round(seconds * 1000, 3),
+        "attrs": current.attrs,
+    }
+    if error:
+        entry["error"] = error[:500]
+    line = json.dumps(entry, default=str) + "\n"
+    with _lock:
+        if _sink is not None:
+            _sink.write(line)
+
+
+def summarize(path: Path) -> Optional[Dict]:
+    """
+    Fold one run's trace into {run, started, total_ms, status, spans: {name: totals}}.
+
+    A run without its root span is reported as "incomplete" (still running,
+    killed, or timed out).
+    """
+    spans: Dict[str, Dict] = {}
+    run_id, started, root = None, None, None
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of a killed run
+                run_id = run_id or entry.get("run")
+                started = min(started, entry["start"]) if started else entry["start"]
+                if entry["span"] == ROOT_SPAN:
+                    root = entry  # A resumed run appends a second root; the last one wins
+
+                totals = spans.setdefault(entry["span"], {"count": 0, "ms": 0.0, "errors": 0})
+                totals["count"] += 1
+                totals["ms"] = round(totals["ms"] + entry["ms"], 3)
+                totals["errors"] += 1 if entry.get("error") else 0
+                for key in COUNTERS:
+                    value = entry.get("attrs", {}).get(key)
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        totals[key] = totals.get(key, 0) + value
+    except OSError as e:
+        logger.warning(f"Trace {path} unreadable: {e}")
+        return None
+
+    if not spans:
+        return None
+    spans.pop(ROOT_SPAN, None)
+    return {
+        "run": run_id or path.stem[len(TRACE_PREFIX):],
+        "started": started,
+        "total_ms": root["ms"] if root else None,
+        "status": ("failed" if root.get("error") else "ok") if root else "incomplete",
+        "spans": spans,
+    }
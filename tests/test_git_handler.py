@@ -0,0 +1,78 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from git_handler import BOT_NAME, GitHandler
+
+IDENTITY = dict(GIT_AUTHOR_NAME="Test", GIT_AUTHOR_EMAIL="test@example.com",
+                GIT_COMMITTER_NAME="Test", GIT_COMMITTER_EMAIL="test@example.com")
+
+
+def git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, env=dict(os.environ, **IDENTITY),
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def clone(remote: Path, path: Path) -> Path:
+    git(remote.parent, "clone", "-q", str(remote), str(path))
+    return path
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Bare remote with one commit on main."""
+    bare = tmp_path / "remote.git"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(bare))
+    seed = tmp_path / "seed"
+    git(tmp_path, "init", "-q", "-b", "main", str(seed))
+    (seed / "README.md").write_text("seed\n")
+    git(seed, "add", "README.md")
+    git(seed, "commit", "-q", "-m", "seed")
+    git(seed, "push", "-q", str(bare), "HEAD:main")
+    return bare
+
+
+def test_commit_and_push(remote, tmp_path):
+    work = clone(remote, tmp_path / "work")
+    (work / "drafts").mkdir()
+    (work / "drafts" / "post.md").write_text("# Post\n")
+    (work / "untracked.txt").write_text("not staged\n")
+
+    sha = GitHandler(repo_dir=str(work)).commit_paths([str(work / "drafts"), str(work / "missing.md")])
+
+    assert sha == git(remote, "rev-parse", "main")
+    assert git(remote, "log", "-1", "--format=%an") == BOT_NAME
+    assert git(remote, "ls-tree", "-r", "--name-only", "main").split() == ["README.md", "drafts/post.md"]
+
+
+def test_nothing_changed(remote, tmp_path):
+    work = clone(remote, tmp_path / "work")
+    before = git(remote, "rev-parse", "main")
+
+    assert GitHandler(repo_dir=str(work)).commit_paths([str(work / "README.md")]) is None
+    assert git(work, "rev-parse", "HEAD") == before
+    assert git(remote, "rev-parse", "main") == before
+
+
+def test_rejected_push_rebases_and_retries(remote, tmp_path):
+    work = clone(remote, tmp_path / "work")
+    # Someone else pushes first, so the bot's first push is rejected
+    other = clone(remote, tmp_path / "other")
+    (other / "other.md").write_text("other\n")
+    git(other, "add", "other.md")
+    git(other, "commit", "-q", "-m", "other")
+    git(other, "push", "-q", "origin", "HEAD:main")
+    theirs = git(other, "rev-parse", "HEAD")
+
+    (work / "post.md").write_text("# Post\n")
+    sha = GitHandler(repo_dir=str(work)).commit_paths([str(work / "post.md")])
+
+    assert sha == git(remote, "rev-parse", "main")
+    assert git(remote, "rev-parse", "main~1") == theirs
+    assert sorted(git(remote, "ls-tree", "-r", "--name-only", "main").split()) == ["README.md", "other.md", "post.md"]
@@ -0,0 +1,97 @@
+import sys
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import notification_outbox
+from notification_outbox import SEPARATOR
+from telegram_notifier import TelegramNotifier
+from telegram_stub_server import TelegramStubServer
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "42")
+
+
+def notifier(stub: TelegramStubServer, tmp_path: Path) -> TelegramNotifier:
+    return TelegramNotifier(outbox_path=tmp_path / "outbox.json", api_url=stub.url)
+
+
+def test_undelivered_messages_are_sent_on_the_next_run(tmp_path):
+    with TelegramStubServer(fail=100, status=500) as down:
+        first = notifier(down, tmp_path)
+        first.send_error_notification("pipeline failed")
+        assert first.close(timeout=0.3) == 1
+    saved = json.loads((tmp_path / "outbox.json").read_text(encoding="utf-8"))
+    assert [m["kind"] for m in saved["messages"]] == ["error"]
+    assert saved["messages"][0]["attempts"] >= 1
+
+    with TelegramStubServer() as up:
+        second = notifier(up, tmp_path)  # Starts draining the saved message on construction
+        assert second.close(timeout=5) == 0
+        assert len(up.messages) == 1
+        assert "pipeline failed" in up.messages[0]["text"]
+    assert not (tmp_path / "outbox.json").exists()
+
+
+def test_messages_queued_together_are_coalesced(tmp_path):
+    with TelegramStubServer() as stub:
+        n = notifier(stub, tmp_path)
+        n.outbox.put("first")
+        n.outbox.put("second")
+        assert n.close(timeout=5) == 0
+        assert [m["text"] for m in stub.messages] == [f"first{SEPARATOR}second"]
+
+
+def test_flood_wait_is_retried_after_retry_after(tmp_path, monkeypatch):
+    monkeypatch.setattr(notification_outbox.random, "uniform", lambda low, high: 0.0)  # Wait = retry_after only
+    with TelegramStubServer(fail=2, status=429, retry_after=0.2) as stub:
+        n = notifier(stub, tmp_path)
+        started = time.monotonic()
+        n.outbox.put("hello")
+        assert n.close(timeout=5) == 0
+        assert time.monotonic() - started >= 0.4
+        assert len(stub.requests) == 3
+        assert [m["text"] for m in stub.messages] == ["hello"]
+
+
+def test_backoff_grows_and_message_is_dropped_after_max_attempts(tmp_path, monkeypatch):
+    waits = []
+    monkeypatch.setattr(notification_outbox.random, "uniform", lambda low, high: waits.append(high) or 0.0)
+
+    def send(text):
+        raise RuntimeError("down")
+
+    outbox = notification_outbox.NotificationOutbox(
+        tmp_path / "outbox.json", send, coalesce_window=0, base_delay=0.01, max_delay=0.04, max_attempts=4
+    )
+    outbox.put("never delivered")
+    deadline = time.monotonic() + 5
+    while outbox.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert outbox.pending == 0
+    assert waits[:3] == [0.02, 0.04, 0.04]  # Doubling, capped at max_delay
+    assert not (tmp_path / "outbox.json").exists()
+    outbox.close(timeout=0)
+
+
+def test_rejected_html_falls_back_to_plain_text(tmp_path):
+    with TelegramStubServer(reject_html=True) as stub:
+        n = notifier(stub, tmp_path)
+        n.send_error_notification("a < b & c")
+        assert n.close(timeout=5) == 0
+
+    assert stub.requests[0]["parse_mode"] == "HTML"
+    assert len(stub.messages) == 1
+    plain = stub.messages[0]
+    assert "parse_mode" not in plain
+    assert "<b>" not in plain["text"]
+    assert "Blog Generator Error" in plain["text"]
+    assert "a < b & c" in plain["text"]
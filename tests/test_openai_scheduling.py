@@ -0,0 +1,107 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import rate_limiter
+import retry_utils
+from content_generator import ContentGenerator
+from openai_stub_server import OpenAIStubServer
+from phase_executor import CONTINUE, Phase, PhaseExecutor
+from rate_limiter import RequestScheduler
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with OpenAIStubServer(words=50) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        yield server
+
+
+@pytest.fixture
+def short_window(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "WINDOW_SECONDS", 0.3)
+
+
+def test_retries_two_429s_honouring_retry_after(stub, monkeypatch):
+    stub.fail, stub.status, stub.retry_after = 2, 429, 0.2
+    monkeypatch.setattr(retry_utils.random, "uniform", lambda low, high: 0.0)  # Wait = Retry-After only
+    generator = ContentGenerator()
+    limit = generator.scheduler.concurrency_limit
+
+    started = time.monotonic()
+    text = generator._call_openai("hello", max_tokens=100)
+
+    assert len(stub.requests) == 3
+    assert time.monotonic() - started >= 0.4
+    assert "## Conclusion" in text
+    assert generator.total_tokens_used > 0
+    # Halved twice by the 429s, then +1 for the success
+    assert generator.scheduler.concurrency_limit == max(1, limit // 4) + 1
+
+
+def test_rpm_window_blocks_until_oldest_request_ages_out(stub, short_window, monkeypatch):
+    monkeypatch.setenv("OPENAI_RPM", "2")
+    generator = ContentGenerator()
+
+    started = time.monotonic()
+    for _ in range(3):
+        generator._call_openai("hello", max_tokens=10)
+
+    assert len(stub.requests) == 3
+    assert time.monotonic() - started >= 0.3
+
+
+def test_tpm_window_blocks_and_reconciles_actual_tokens(short_window):
+    scheduler = RequestScheduler(rpm=100, tpm=100)
+
+    ticket = scheduler.acquire(60)
+    scheduler.release(ticket, actual_tokens=10)
+    started = time.monotonic()
+    scheduler.release(scheduler.acquire(60), actual_tokens=60)  # 10 + 60 fits: no wait
+    assert time.monotonic() - started < 0.1
+
+    started = time.monotonic()
+    scheduler.release(scheduler.acquire(60))  # 70 + 60 > 100: waits for the window
+    assert time.monotonic() - started >= 0.2
+
+
+def test_abandoned_stream_releases_without_adapting(stub):
+    stub.chunk_delay = 0.01
+    generator = ContentGenerator(stream=True)
+    generator.scheduler.concurrency_limit = 2
+
+    stream = generator._stream_openai("hello", max_tokens=100)
+    assert next(stream)
+    stream.close()
+
+    assert generator.scheduler.concurrency_limit == 2
+    assert generator.scheduler._in_flight == 0
+
+    # A stream read to the end still counts as a success
+    assert "".join(generator._stream_openai("hello", max_tokens=100))
+    assert generator.scheduler.concurrency_limit == 3
+
+
+def test_phase_deadline_stops_retries(stub, monkeypatch):
+    stub.fail, stub.status, stub.retry_after = 100, 429, 0.2
+    monkeypatch.setattr(retry_utils.random, "uniform", lambda low, high: 0.0)
+    generator = ContentGenerator()
+    executor = PhaseExecutor([
+        Phase("generate", lambda ctx: {"text": generator._call_openai("hello", max_tokens=10)},
+              outputs=("text",), timeout=0.5, on_failure=CONTINUE),
+    ])
+
+    executor.run({})
+
+    # The retry that would start after the deadline is never attempted
+    result = executor.results["generate"]
+    assert result.status == "failed" and "429" in result.error
+    assert result.seconds < 0.5
+    sent = len(stub.requests)
+    time.sleep(0.5)
+    assert len(stub.requests) == sent < 5
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from content_generator import StreamingDraft
+
+
+def stream(draft: StreamingDraft, text: str, size: int = 37) -> str:
+    for i in range(0, len(text), size):
+        draft.append(text[i:i + size])
+    return draft.close()
+
+
+def test_short_closing_section_still_needs_expansion(tmp_path):
+    # The projection at "## Conclusion" (3100 + 500) clears 3500; the real post doesn't
+    text = "## Body\n\n" + "word " * 3100 + "\n\n## Conclusion\n\n" + "end " * 100
+    draft = StreamingDraft(tmp_path / "draft.md", min_words=3500)
+    stream(draft, text)
+
+    assert draft.expansion_hint is False
+    assert draft.word_count == len(text.split())
+    assert draft.word_count < 3500
+    assert draft.needs_expansion is True
+
+
+def test_long_post_needs_no_expansion(tmp_path):
+    text = "## Body\n\n" + "word " * 3400 + "\n\n## Key Takeaways\n\n" + "end " * 200
+    draft = StreamingDraft(tmp_path / "draft.md", min_words=3500)
+    content = stream(draft, text)
+
+    assert content == text
+    assert (tmp_path / "draft.md").read_text(encoding="utf-8") == text
+    assert draft.needs_expansion is False
@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from syllables import SyllableCounter
+
+EXCEPTIONS = Path(__file__).parent.parent / "config" / "syllable_exceptions.json"
+
+
+def test_shouted_words_are_counted_as_words():
+    counter = SyllableCounter.from_file(EXCEPTIONS)
+
+    assert [counter.count(w) for w in ("NOTE", "NEVER", "FREE")] == [1, 2, 1]
+    assert counter.count("NOTE") == counter.count("note")
+
+
+def test_acronyms_are_spelled_out():
+    counter = SyllableCounter.from_file(EXCEPTIONS)
+
+    assert counter.count("LLM") == 3  # No vowel group
+    assert counter.count("WWW") == 9
+    assert counter.count("TPUs") == counter.count("TPU")  # Listed in the exceptions
+    assert SyllableCounter().count("RLHF") == 4
@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from news_aggregator import NewsItem
+from topic_clusterer import TopicClusterer, related_items
+
+
+def item(title: str, summary: str, score: float) -> NewsItem:
+    return NewsItem(title=title, url=f"https://example.com/{score}", source="test", summary=summary,
+                    engagement_score=score)
+
+
+def test_dominant_story_stays_one_cluster():
+    # 6 of 10 items cover the same launch, so its terms are in over half the batch
+    story = [
+        item("Google releases Gemini 3 with a million token context", "Gemini 3 launch from Google DeepMind", 99),
+        item("Gemini 3 tops the coding benchmarks", "Google Gemini 3 benchmark results", 90),
+        item("Hands on with Google Gemini 3", "First impressions of Gemini 3 from Google", 80),
+        item("Gemini 3 pricing and API limits announced", "Google publishes Gemini 3 API pricing", 70),
+        item("What Gemini 3 means for developers", "Google Gemini 3 for developers", 60),
+        item("Google Gemini 3 system card published", "Safety evaluation of Gemini 3 by Google", 50),
+    ]
+    others = [
+        item("Nvidia reports record data center revenue", "Quarterly earnings beat estimates", 45),
+        item("EU AI Act enforcement begins in August", "Regulators publish compliance guidance", 40),
+        item("Rust 2.0 roadmap published", "Language team outlines the next edition", 35),
+        item("Open source speech model tops leaderboard", "Whisper alternative with streaming", 30),
+    ]
+    topics = {"clusters": TopicClusterer().cluster(story + others)}
+
+    assert len({i.cluster_id for i in story}) == 1
+    assert story[0].cluster_id not in {i.cluster_id for i in others}
+    assert related_items(topics, story[0]) == story[1:5]